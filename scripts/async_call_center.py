@@ -0,0 +1,326 @@
+"""
+Asenkron Çağrı Akışı
+SesliCagriMerkezi görüşme akışının asyncio sürümü. Müşteri konuşması ve
+temsilci sesi async kaynak / çıkış arayüzleriyle soyutlanır; gTTS ve
+speech_recognition gibi bloklayan çağrılar sınırlı iş parçacığı havuzlarında,
+sınıflandırma ise paylaşılan TopluSiniflandirici'de çalışır. Müşteri rehberi,
+fatura analizi ve görüşme geçmişi de diske dokunabildiği için `veri`
+havuzunda çalışır. Böylece tek bir
+olay döngüsü çoğu zamanını beklemede geçiren çok sayıda görüşmeyi yürütebilir.
+
+Kullanım:
+    python async_call_center.py [oturum_sayisi] [mikrofon_index ...]
+"""
+
+import asyncio
+import sys
+import threading
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+try:
+    from config import ASYNC_CONFIG, KATEGORILER
+except ImportError:
+    ASYNC_CONFIG = {'tts_isci_sayisi': 8, 'stt_isci_sayisi': 8, 'veri_isci_sayisi': 4}
+    KATEGORILER = {}
+
+try:
+    from voice_config import ses_yoneticisi
+except ImportError:
+    ses_yoneticisi = None
+
+from intent_router import yonlendirici
+from tts_cache import on_isitmayi_baslat
+from voice_call_center import (SesKanali, SesliCagriMerkezi, gecmis_yoneticisi, logger, ses_isitici,
+                               sesi_uret_ve_oynat, siniflandirici_olustur)
+
+_havuzlar: Dict[str, ThreadPoolExecutor] = {}
+_havuz_kilidi = threading.Lock()
+
+
+def _havuz(ad: str) -> ThreadPoolExecutor:
+    with _havuz_kilidi:
+        havuz = _havuzlar.get(ad)
+        if havuz is None:
+            havuz = _havuzlar[ad] = ThreadPoolExecutor(max_workers=ASYNC_CONFIG[f'{ad}_isci_sayisi'],
+                                                       thread_name_prefix=f"async-{ad}")
+        return havuz
+
+
+async def havuzda_calistir(ad: str, fonksiyon, *args):
+    """Bloklayan çağrıyı adı verilen sınırlı havuzda (tts / stt / veri) çalıştır ve sonucunu bekle"""
+    return await asyncio.get_running_loop().run_in_executor(_havuz(ad), fonksiyon, *args)
+
+
+def havuzlari_kapat(bekle: bool = True):
+    """Açılmış iş parçacığı havuzlarını kapat"""
+    with _havuz_kilidi:
+        havuzlar = list(_havuzlar.values())
+        _havuzlar.clear()
+    for havuz in havuzlar:
+        havuz.shutdown(wait=bekle)
+
+
+class AsyncSesKaynagi(ABC):
+    """Müşterinin bir konuşma sırasını metin olarak veren async kaynak"""
+    # Müşteri hattı kapattıysa akış görüşmeyi sonlandırır
+    kapandi = False
+
+    @abstractmethod
+    async def konusma_al(self) -> Optional[str]:
+        """Bir konuşma sırasını dinle; anlaşılamazsa None döndür"""
+
+    async def kapat(self):
+        """Görüşme bitince kaynağın tuttuğu mikrofon vb. kaynakları bırak"""
+        pass
+
+
+class AsyncSesCikisi(ABC):
+    """Temsilci metnini müşteriye ileten async çıkış"""
+
+    @abstractmethod
+    async def seslendir(self, metin: str):
+        """Metni seslendir; oynatma bitince döner"""
+
+
+class MikrofonKaynagi(AsyncSesKaynagi):
+    """Mikrofondan dinleyip profilin ses tanıma motoruyla tanıyan kaynak"""
+
+    def __init__(self, ses_ayarlari: Dict):
+        self._kanal = SesKanali(ses_ayarlari)
+
+    @property
+    def kapandi(self) -> bool:
+        return self._kanal.kapandi
+
+    async def konusma_al(self) -> Optional[str]:
+        try:
+            return await havuzda_calistir("stt", self._kanal.konusma_al)
+        except Exception as e:
+            logger.error(f"Ses kaydı hatası: {e}")
+            return None
+
+    async def kapat(self):
+        await havuzda_calistir("stt", self._kanal.kapat)
+
+
+class ProfilSesCikisi(AsyncSesCikisi):
+    """Metni ses profiline göre sentezleyip çalan çıkış"""
+
+    def __init__(self, ses_ayarlari: Dict, ui=None):
+        self.ses_ayarlari = ses_ayarlari
+        self.ui = ui
+        on_isitmayi_baslat(ses_ayarlari, ses_isitici(ses_ayarlari))
+
+    async def seslendir(self, metin: str):
+        await havuzda_calistir("tts", sesi_uret_ve_oynat, metin, self.ses_ayarlari, self.ui)
+
+
+class AsyncCagriMerkezi(SesliCagriMerkezi):
+    """Görüşme akışının asyncio sürümü
+
+    Yanıt üreticileri (yanit_*), yönlendirme tablosu ve geçmiş kaydı SesliCagriMerkezi
+    ile ortaktır; yalnızca müşteriyle etkileşen ve diske dokunan adımlar coroutine'dir.
+    """
+
+    def __init__(self, kaynak: AsyncSesKaynagi, cikis: AsyncSesCikisi, siniflandirici=None, ui=None,
+                 gecmis=None):
+        # Mikrofon ve tanıyıcı kaynak nesnesinde tutulduğu için üst sınıfın ses kurulumu atlanır
+        self.ui = ui
+        self.gecmis = gecmis if gecmis is not None else gecmis_yoneticisi
+        self.kaynak = kaynak
+        self.cikis = cikis
+        self.aktif_gorusme_id = None
+        self.sonlandir = threading.Event()
+        self.son_hata = None
+        self.kategoriler = KATEGORILER
+        self.siniflandirici = siniflandirici if siniflandirici is not None else siniflandirici_olustur()
+
+    async def seslendir(self, metin):
+        if self.ui:
+            self.ui.add_message("Temsilci", metin, "assistant")
+        await havuzda_calistir("veri", self._gecmise_mesaj_ekle, "Temsilci", metin)
+        await self.cikis.seslendir(metin)
+
+    async def mikrofondan_konusma_al(self, tekrar_sayisi=3):
+        for deneme in range(tekrar_sayisi):
+            text = await self.kaynak.konusma_al()
+            if text:
+                if self.ui:
+                    self.ui.add_message("Müşteri", text, "customer")
+                await havuzda_calistir("veri", self._gecmise_mesaj_ekle, "Müşteri", text)
+                return text
+            logger.warning(f"Deneme {deneme + 1}/{tekrar_sayisi}: konuşma alınamadı")
+            if self.kaynak.kapandi:
+                break
+        print('Üzgünüm, sizi anlayamadım. Görüşme sonlandırılıyor.')
+        return None
+
+    async def tespit_et_berturk(self, metin):
+        # Sınıflandırma servisinin Future'ı olay döngüsünü bloklamadan beklenir
+        predicted, _ = await asyncio.wrap_future(self.siniflandirici.gonder(metin))
+        return predicted
+
+    async def sim_kart_sifre_cevapla(self, kullanici_verisi):
+        tc = kullanici_verisi.get("tc", "")
+        sim_sifre = kullanici_verisi.get("sim_sifre", "")
+        await self.seslendir("Lütfen TC kimlik numaranızın son iki hanesini söyleyin.")
+        tc_son_iki = ''.join(filter(str.isdigit, await self.mikrofondan_konusma_al() or ""))
+        if tc and tc_son_iki == tc[-2:]:
+            return f"Sim kart şifreniz: {sim_sifre}"
+        return "TC kimlik numarası doğrulanamadı. Güvenlik nedeniyle şifre verilemiyor."
+
+    async def yanit_sim_kart_sifre(self, kullanici):
+        return await self.sim_kart_sifre_cevapla(kullanici)
+
+    async def talep_yaniti(self, kategori, sikayet, kullanici_verisi):
+        yonlendirme = yonlendirici.cozumle(kategori, sikayet)
+        if yonlendirme.isleyici is None:
+            return yonlendirme.istem, False
+        isleyici = getattr(self, yonlendirme.isleyici)
+        if asyncio.iscoroutinefunction(isleyici):
+            # Müşteriyle etkileşen işleyiciler (sim kart doğrulama) bu sınıfta coroutine'dir
+            yanit = await isleyici(kullanici_verisi, *yonlendirme.argumanlar)
+        else:
+            # Fatura analizi gibi işleyiciler SQLite okuyabilir
+            yanit = await havuzda_calistir("veri", isleyici, kullanici_verisi, *yonlendirme.argumanlar)
+        return yanit, self.cozuldu_mu(yanit)
+
+    async def kullanici_verisi_getir(self, telefon):
+        # Rehber, dosya değiştiyse JSON dizinini yeniden yükleyebilir
+        return await havuzda_calistir("veri", super().kullanici_verisi_getir, telefon)
+
+    async def sonlandirma_istendi_mi(self):
+        if not self.sonlandir.is_set() and not self.kaynak.kapandi:
+            return False
+        await havuzda_calistir("veri", self._gorusmeyi_bitir, "sonlandirildi", "devam_ediyor")
+        await self.seslendir("Görüşme sonlandırılıyor. Teşekkür eder İyi günler dileriz.")
+        return True
+
+    async def cagri_merkezi_baslat(self):
+        self.son_hata = None
+        try:
+            if self.ui:
+                self.ui.start_call()
+                self.ui.add_message("Sistem", "Çağrı merkezi başlatıldı", "system")
+
+            await self.seslendir("Merhaba, Trivox Çağrı Hizmetlerine hoş geldiniz. Sizi Tanımak adına telefon numaranızı alabilir miyim?")
+            telefon = await self.mikrofondan_konusma_al()
+            if not telefon:
+                await self.seslendir("Telefon numarası alınamadı. Lütfen tekrar deneyin.")
+                return
+            telefon = self.telefon_temizle(telefon)
+            await self.seslendir("Bir saniye bekletiyorum...")
+            kullanici_verisi = await self.kullanici_verisi_getir(telefon)
+            while not kullanici_verisi:
+                if await self.sonlandirma_istendi_mi():
+                    return
+                await self.seslendir("Numaranız sistemde bulunamadı. Lütfen tekrar telefon numaranızı söyleyin.")
+                telefon = self.telefon_temizle(await self.mikrofondan_konusma_al())
+                await self.seslendir("Bir saniye bekletiyorum...")
+                kullanici_verisi = await self.kullanici_verisi_getir(telefon)
+            await self.seslendir(f"Sayın {kullanici_verisi.get('ad', '')}")
+
+            await havuzda_calistir("veri", self._gorusmeyi_baslat, telefon, kullanici_verisi)
+            await self.sikayet_ve_destek_akisi(telefon, kullanici_verisi)
+        except asyncio.CancelledError:
+            await havuzda_calistir("veri", self._gorusmeyi_bitir, "sonlandirildi", "devam_ediyor")
+            raise
+        except Exception as e:
+            self.son_hata = e
+            print(f"Hata: {str(e)}")
+            await self.seslendir("Üzgünüm, bir hata oluştu.")
+        finally:
+            await self.kaynak.kapat()
+
+    async def sikayet_ve_destek_akisi(self, telefon, kullanici_verisi):
+        while True:
+            if await self.sonlandirma_istendi_mi():
+                return
+            await self.seslendir("Size nasıl yardımcı olabilirim?")
+            sikayet = await self.mikrofondan_konusma_al()
+            if not sikayet:
+                await self.seslendir("Üzgünüm, sizi anlayamadım. Lütfen hangi konuda yardım almak istediğinizi tekrar söyler misiniz?")
+                continue
+            kategori = await self.tespit_et_berturk(sikayet)
+            await havuzda_calistir("veri", self._kategoriyi_kaydet, kategori)
+
+            yanit, cozuldu = await self.talep_yaniti(kategori, sikayet, kullanici_verisi)
+            await self.seslendir(yanit)
+            if not cozuldu:
+                continue
+
+            # Evet/Hayır cevabı alana kadar tekrar sor
+            while True:
+                if await self.sonlandirma_istendi_mi():
+                    return
+                await self.seslendir("Farklı bir konuda destek ister misiniz?")
+                cevap = await self.mikrofondan_konusma_al()
+                if not cevap:
+                    await self.seslendir("Cevabınız anlaşılamadı. Lütfen evet veya hayır olarak cevap verin.")
+                    continue
+                karar = self.evet_hayir(cevap)
+                if karar is True:
+                    break
+                elif karar is False:
+                    await havuzda_calistir("veri", self._gorusmeyi_bitir)
+                    await self.seslendir("Görüşme sonlandırılıyor. Teşekkür eder İyi günler dileriz.")
+                    return
+                await self.seslendir("Lütfen evet veya hayır olarak cevap verin.")
+
+            await self.seslendir("Bu numara için mi devam edelim?")
+            numara_cevap = await self.mikrofondan_konusma_al()
+            if self.evet_hayir(numara_cevap) is True:
+                continue
+            await self.seslendir("Lütfen yeni telefon numarasını söyleyin.")
+            yeni_telefon = self.telefon_temizle(await self.mikrofondan_konusma_al())
+            await self.seslendir("Bir saniye bekletiyorum...")
+            yeni_kullanici_verisi = await self.kullanici_verisi_getir(yeni_telefon)
+            if not yeni_kullanici_verisi:
+                await self.seslendir("Numara sistemde bulunamadı. Görüşme sonlandırılıyor.")
+                return
+            telefon = yeni_telefon
+            kullanici_verisi = yeni_kullanici_verisi
+
+
+async def gorusmeleri_yurut(merkezler: List[AsyncCagriMerkezi]) -> List:
+    """Görüşmeleri aynı olay döngüsünde eşzamanlı yürüt; hatalar sonuç listesinde döner"""
+    return await asyncio.gather(*(merkez.cagri_merkezi_baslat() for merkez in merkezler),
+                                return_exceptions=True)
+
+
+def main():
+    """Ana fonksiyon"""
+    try:
+        oturum_sayisi = int(sys.argv[1]) if len(sys.argv) > 1 else 1
+        mikrofonlar = [int(x) for x in sys.argv[2:]]
+    except ValueError:
+        print("❌ Oturum sayısı ve mikrofon indeksleri tam sayı olmalı!")
+        print(__doc__)
+        return
+
+    siniflandirici = siniflandirici_olustur()
+    if siniflandirici is None:
+        print("❌ Sınıflandırma servisi başlatılamadı")
+        return
+
+    merkezler = []
+    for i in range(oturum_sayisi):
+        ses_ayarlari = ses_yoneticisi.profil_yukle("varsayilan") if ses_yoneticisi else {}
+        if i < len(mikrofonlar):
+            ses_ayarlari["mikrofon_index"] = mikrofonlar[i]
+        merkezler.append(AsyncCagriMerkezi(MikrofonKaynagi(ses_ayarlari), ProfilSesCikisi(ses_ayarlari),
+                                           siniflandirici=siniflandirici))
+
+    try:
+        asyncio.run(gorusmeleri_yurut(merkezler))
+    except KeyboardInterrupt:
+        print("\n⏹️ Görüşmeler sonlandırılıyor...")
+    finally:
+        havuzlari_kapat(bekle=False)
+        siniflandirici.kapat()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,368 @@
+"""
+Toplu Fatura Analizi
+Tüm müşterilerin son 4 aylık kullanımını NumPy ile vektörel olarak analiz
+eder: paket aşımı, çift fatura kesimi ve açıklanamayan fark her ay için
+işaretlenir, en güncel ayın sonucu numaraya göre SQLite'a yazılır. Canlı
+görüşmede fatura itirazı yalnızca bu kaydın okunmasıyla yanıtlanır; kayıt
+yoksa ya da müşterinin son ayına ait değilse aynı analiz tek müşteri için
+çalıştırılır.
+
+Kullanım:
+    python bill_analysis.py toplu [json_dosyasi] [db_dosyasi]
+    python bill_analysis.py bul <numara>
+    python bill_analysis.py ozet
+"""
+
+import sqlite3
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional
+
+import numpy as np
+
+from customer_directory import e164_normalize
+from customer_store import json_dizisi_akisi
+
+try:
+    from config import FATURA_ANALIZI_CONFIG, KULLANICI_FATURALAR_FILE
+except ImportError:
+    KULLANICI_FATURALAR_FILE = Path(__file__).resolve().parent.parent / "data" / "kullanici_faturalar.json"
+    FATURA_ANALIZI_CONFIG = {'db_dosyasi': KULLANICI_FATURALAR_FILE.with_name("fatura_analizleri.db"),
+                             'toplu_boyutu': 10000}
+
+AY_SAYISI = 4
+
+# Ay bazında analiz sonucu
+EKSIK_VERI = -1
+NORMAL = 0
+ASIM_FAZLA_FATURA = 1     # Paket aşımı kaynaklı fazla fatura
+CIFT_FATURA = 2           # Aşım yok, tutar paket fiyatının ~2 katı
+ACIKLANAMAYAN_FARK = 3    # Aşım yok, nedeni belirsiz ek ücret
+ASIM_ARTIS_YOK = 4        # Aşım var ama fatura artmamış
+
+DURUM_ADLARI = {
+    EKSIK_VERI: "eksik_veri", NORMAL: "normal", ASIM_FAZLA_FATURA: "asim_fazla_fatura",
+    CIFT_FATURA: "cift_fatura", ACIKLANAMAYAN_FARK: "aciklanamayan_fark", ASIM_ARTIS_YOK: "asim_artis_yok"
+}
+
+SEMA = """
+CREATE TABLE IF NOT EXISTS fatura_analizleri (
+    numara TEXT PRIMARY KEY,
+    ay TEXT,
+    durum INTEGER NOT NULL,
+    odeme REAL,
+    paket_fiyat REAL,
+    fark REAL,
+    dk_asim INTEGER,
+    sms_asim INTEGER,
+    data_asim_mb INTEGER,
+    yurtdisi_dk INTEGER,
+    kampanya INTEGER,
+    muhtemel_cift INTEGER,
+    ay_durumlari TEXT,
+    analiz_zamani REAL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_fatura_analizleri_durum ON fatura_analizleri(durum);
+"""
+
+SUTUNLAR = ("numara", "ay", "durum", "odeme", "paket_fiyat", "fark", "dk_asim", "sms_asim", "data_asim_mb",
+            "yurtdisi_dk", "kampanya", "muhtemel_cift", "ay_durumlari", "analiz_zamani")
+
+
+def _sayi(deger) -> float:
+    try:
+        return float(deger or 0)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _paket_fiyati(paket: Dict) -> float:
+    return _sayi(paket.get("fiyatı") or paket.get("fiyati") or paket.get("fiyat"))
+
+
+def _fiyat_metni(fiyat: float) -> str:
+    return f"{fiyat:.2f}".rstrip("0").rstrip(".")
+
+
+def _dizilere_cevir(kullanicilar: List[Dict]) -> Dict[str, np.ndarray]:
+    """Müşteri kayıtlarını sayısal dizilere çevir; aylar (N, 4) matriste sağa yaslanır"""
+    n = len(kullanicilar)
+    paket_sutunlari = {ad: np.zeros(n) for ad in ("paket_fiyat", "dk_limit", "sms_limit", "data_degeri")}
+    kampanya = np.zeros(n, dtype=bool)
+    ay_sutunlari = {ad: np.zeros((n, AY_SAYISI)) for ad in ("odeme", "dk", "sms", "data_mb", "yurtdisi")}
+    gecerli = np.zeros((n, AY_SAYISI), dtype=bool)
+
+    for i, kullanici in enumerate(kullanicilar):
+        paket = kullanici.get("numaraya_tanimli_paket") or {}
+        aylar = (kullanici.get("son_4_aylik_kullanim") or [])[-AY_SAYISI:]
+        if not paket or not aylar:
+            continue
+        paket_sutunlari["paket_fiyat"][i] = _paket_fiyati(paket)
+        paket_sutunlari["dk_limit"][i] = _sayi(paket.get("dakika"))
+        paket_sutunlari["sms_limit"][i] = _sayi(paket.get("sms"))
+        paket_sutunlari["data_degeri"][i] = _sayi(paket.get("data_gb"))
+        kampanya_bilgisi = kullanici.get("aktif_kampanya") or {}
+        kampanya[i] = bool(kampanya_bilgisi.get("indirimYüzdesi") or kampanya_bilgisi.get("indirimYuzdesi"))
+
+        baslangic = AY_SAYISI - len(aylar)
+        for j, ay in enumerate(aylar, start=baslangic):
+            gecerli[i, j] = True
+            ay_sutunlari["odeme"][i, j] = _sayi(ay.get("odeme_tl"))
+            ay_sutunlari["dk"][i, j] = _sayi(ay.get("konusma_dakika"))
+            ay_sutunlari["sms"][i, j] = _sayi(ay.get("sms"))
+            ay_sutunlari["data_mb"][i, j] = _sayi(ay.get("data_mb"))
+            ay_sutunlari["yurtdisi"][i, j] = _sayi(ay.get("yurt_dişi_dakika") or ay.get("yurt_disi_dakika"))
+
+    # Tam sayı alanları veri dosyasındaki gibi kesirli kısmı atılarak okunur
+    for ad in ("dk_limit", "sms_limit"):
+        paket_sutunlari[ad] = np.trunc(paket_sutunlari[ad])
+    for ad in ("dk", "sms", "data_mb", "yurtdisi"):
+        ay_sutunlari[ad] = np.trunc(ay_sutunlari[ad])
+    return {**paket_sutunlari, **ay_sutunlari, "kampanya": kampanya, "gecerli": gecerli}
+
+
+def paket_data_limiti_mb(data_degeri: np.ndarray) -> np.ndarray:
+    """'data_gb' alanını MB'a çevir
+
+    Alan veride MB cinsinden olabildiği gibi (5000=5GB), bazı kayıtlarda GB da olabilir.
+    Sezgisel dönüşüm: >=1024 ise MB varsay, aksi halde GB→MB çevir.
+    """
+    return np.where(data_degeri >= 1024, np.trunc(data_degeri), np.trunc(data_degeri * 1024))
+
+
+def dizileri_analiz_et(d: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    """Tüm müşteri-ay hücreleri için aşım miktarlarını ve durum kodunu hesapla"""
+    fiyat = d["paket_fiyat"][:, None]
+    data_limit = paket_data_limiti_mb(d["data_degeri"])[:, None]
+
+    def asim(kullanim, limit):
+        # Limiti 0 olan (tanımsız / sınırsız) kalemde aşım sayılmaz
+        return np.where(limit > 0, np.maximum(kullanim - limit, 0), 0)
+
+    dk_asim = asim(d["dk"], d["dk_limit"][:, None])
+    sms_asim = asim(d["sms"], d["sms_limit"][:, None])
+    data_asim = asim(d["data_mb"], data_limit)
+    sebep_var = (dk_asim > 0) | (sms_asim > 0) | (data_asim > 0) | (d["yurtdisi"] > 0)
+
+    fark = d["odeme"] - fiyat
+    fazla = fark > 0.01
+    # 5 TL tolerans
+    cift = (fiyat > 0) & (d["odeme"] >= 2 * fiyat - 5)
+    durum = np.select(
+        [~d["gecerli"], fazla & sebep_var, fazla & cift, fazla, sebep_var],
+        [EKSIK_VERI, ASIM_FAZLA_FATURA, CIFT_FATURA, ACIKLANAMAYAN_FARK, ASIM_ARTIS_YOK],
+        NORMAL
+    )
+    return {
+        "durum": durum,
+        "fark": fark,
+        "dk_asim": dk_asim,
+        "sms_asim": sms_asim,
+        "data_asim_mb": data_asim,
+        "muhtemel_cift": (fiyat > 0) & (d["odeme"] >= 1.8 * fiyat),
+    }
+
+
+def toplu_analiz(kullanicilar: List[Dict], zaman: Optional[float] = None) -> List[Dict]:
+    """Müşteri listesini analiz edip en güncel aya ait analiz kayıtlarını döndür"""
+    if not kullanicilar:
+        return []
+    zaman = time.time() if zaman is None else zaman
+    d = _dizilere_cevir(kullanicilar)
+    sonuc = dizileri_analiz_et(d)
+    son = AY_SAYISI - 1
+
+    kayitlar = []
+    for i, kullanici in enumerate(kullanicilar):
+        aylar = kullanici.get("son_4_aylik_kullanim") or []
+        kayitlar.append({
+            "numara": e164_normalize(kullanici.get("numara")),
+            "ay": aylar[-1].get("ay", "Bilinmiyor") if aylar else None,
+            "durum": int(sonuc["durum"][i, son]),
+            "odeme": float(d["odeme"][i, son]),
+            "paket_fiyat": float(d["paket_fiyat"][i]),
+            "fark": float(sonuc["fark"][i, son]),
+            "dk_asim": int(sonuc["dk_asim"][i, son]),
+            "sms_asim": int(sonuc["sms_asim"][i, son]),
+            "data_asim_mb": int(sonuc["data_asim_mb"][i, son]),
+            "yurtdisi_dk": int(d["yurtdisi"][i, son]),
+            "kampanya": bool(d["kampanya"][i]),
+            "muhtemel_cift": bool(sonuc["muhtemel_cift"][i, son]),
+            # Eski aylar dahil ay ay durum kodları (eksik aylar -1)
+            "ay_durumlari": ",".join(str(int(x)) for x in sonuc["durum"][i]),
+            "analiz_zamani": zaman
+        })
+    return kayitlar
+
+
+def analiz_metni(kayit: Dict) -> str:
+    """Analiz kaydını müşteriye okunacak metne çevir"""
+    durum = kayit["durum"]
+    if durum == EKSIK_VERI:
+        return "Kullanım ve paket bilgileri eksik."
+
+    ay = kayit["ay"]
+    sebepler = []
+    if kayit["dk_asim"]:
+        sebepler.append(f"dakika aşımı (+{kayit['dk_asim']} dk)")
+    if kayit["sms_asim"]:
+        sebepler.append(f"SMS aşımı (+{kayit['sms_asim']} SMS)")
+    if kayit["data_asim_mb"]:
+        sebepler.append(f"internet aşımı (+{kayit['data_asim_mb']} MB)")
+    if kayit["yurtdisi_dk"]:
+        sebepler.append(f"yurt dışı arama ({kayit['yurtdisi_dk']} dk)")
+
+    fark = kayit["fark"]
+    if durum == ASIM_FAZLA_FATURA:
+        sonuc = f"{ay} ayında {', '.join(sebepler)} nedeniyle yaklaşık +{fark:.2f} TL fazla fatura."
+    elif durum == CIFT_FATURA:
+        sonuc = (f"{ay} ayında çift fatura kesimi tespit edildi. Ödenen tutar ({kayit['odeme']:.2f} TL) ödenecek "
+                 f"tutarın ({_fiyat_metni(kayit['paket_fiyat'])} TL) 2 katıdır. Aynı dönemde iki kez "
+                 f"faturalandırma yapılmış.")
+    elif durum == ACIKLANAMAYAN_FARK:
+        muhtemel = []
+        if kayit["kampanya"]:
+            muhtemel.append("kampanya/indirim değişikliği")
+        if kayit["muhtemel_cift"]:
+            muhtemel.append("muhtemel çifte kesim")
+        muhtemel.append("ek servis veya mobil ödeme")
+        sonuc = (f"{ay} ayında paket aşımı görünmüyor; yaklaşık +{fark:.2f} TL ek ücret. "
+                 f"Muhtemel sebep: {', '.join(muhtemel)}.")
+    elif durum == ASIM_ARTIS_YOK:
+        sonuc = f"{ay} ayında {', '.join(sebepler)} tespit edildi; fatura tutarında artış görünmüyor."
+    else:
+        sonuc = f"{ay} ayında faturanız normal limitler içinde."
+    return "Fatura analiz sonucu:\n" + sonuc
+
+
+class FaturaAnalizDeposu:
+    """Numara indeksli fatura analizi sonuçları"""
+
+    def __init__(self, db_dosyasi: Optional[Path] = None):
+        self.db_dosyasi = Path(db_dosyasi or FATURA_ANALIZI_CONFIG['db_dosyasi'])
+        self.db_dosyasi.parent.mkdir(parents=True, exist_ok=True)
+        self._baglanti = sqlite3.connect(str(self.db_dosyasi), check_same_thread=False)
+        self._baglanti.row_factory = sqlite3.Row
+        self._baglanti.executescript(SEMA)
+        self._kilit = threading.Lock()
+
+    def yaz(self, kayitlar: Iterable[Dict]):
+        """Kayıtları numaraya göre ekle / güncelle"""
+        satirlar = [tuple(kayit[s] for s in SUTUNLAR) for kayit in kayitlar if kayit["numara"]]
+        sorgu = f"INSERT OR REPLACE INTO fatura_analizleri VALUES ({', '.join('?' * len(SUTUNLAR))})"
+        with self._kilit, self._baglanti:
+            self._baglanti.executemany(sorgu, satirlar)
+
+    def getir(self, telefon) -> Optional[Dict]:
+        """Numaranın analiz kaydını birincil anahtar indeksiyle getir"""
+        numara = e164_normalize(telefon)
+        if numara is None:
+            return None
+        with self._kilit:
+            satir = self._baglanti.execute("SELECT * FROM fatura_analizleri WHERE numara = ?", (numara,)).fetchone()
+        return dict(satir) if satir else None
+
+    def ozet(self) -> Dict[str, int]:
+        """Durum koduna göre müşteri sayıları"""
+        with self._kilit:
+            satirlar = self._baglanti.execute("SELECT durum, COUNT(*) FROM fatura_analizleri GROUP BY durum").fetchall()
+        return {DURUM_ADLARI.get(durum, str(durum)): sayi for durum, sayi in satirlar}
+
+    def kapat(self):
+        self._baglanti.close()
+
+
+def _parcalar(kaynak: Iterator[Dict], boyut: int) -> Iterator[List[Dict]]:
+    parca = []
+    for kayit in kaynak:
+        parca.append(kayit)
+        if len(parca) >= boyut:
+            yield parca
+            parca = []
+    if parca:
+        yield parca
+
+
+def gece_analizi(json_dosyasi: Path = KULLANICI_FATURALAR_FILE,
+                 db_dosyasi: Path = FATURA_ANALIZI_CONFIG['db_dosyasi'],
+                 toplu_boyutu: int = FATURA_ANALIZI_CONFIG['toplu_boyutu']) -> Dict:
+    """Müşteri dosyasını parça parça okuyup tüm müşterileri analiz et ve sonuçları yaz"""
+    baslangic = time.perf_counter()
+    zaman = time.time()
+    depo = FaturaAnalizDeposu(db_dosyasi)
+    toplam = 0
+    try:
+        for parca in _parcalar(json_dizisi_akisi(Path(json_dosyasi)), toplu_boyutu):
+            kayitlar = toplu_analiz(parca, zaman)
+            depo.yaz(kayitlar)
+            toplam += len(kayitlar)
+        ozet = depo.ozet()
+    finally:
+        depo.kapat()
+    return {"musteri_sayisi": toplam, "sure_sn": time.perf_counter() - baslangic, "durumlar": ozet}
+
+
+_depo: Optional[FaturaAnalizDeposu] = None
+_depo_kilidi = threading.Lock()
+
+
+def _depo_getir() -> Optional[FaturaAnalizDeposu]:
+    global _depo
+    if _depo is None:
+        with _depo_kilidi:
+            # Gece analizi hiç çalışmadıysa boş veritabanı oluşturma
+            if _depo is None and Path(FATURA_ANALIZI_CONFIG['db_dosyasi']).exists():
+                _depo = FaturaAnalizDeposu()
+    return _depo
+
+
+def fatura_analizi_yaniti(kullanici: Dict) -> str:
+    """Canlı görüşme için fatura analizi metni; önce gece analizinin kaydına bakılır"""
+    aylar = kullanici.get("son_4_aylik_kullanim") or []
+    depo = _depo_getir()
+    if depo is not None and aylar:
+        try:
+            kayit = depo.getir(kullanici.get("numara"))
+        except sqlite3.Error as e:
+            print(f"Fatura analizi okunamadı: {e}")
+            kayit = None
+        # Kayıt yalnızca müşterinin şu anki son ayı ve tutarıyla üretildiyse geçerli
+        son_ay = aylar[-1]
+        if (kayit and kayit["ay"] == son_ay.get("ay", "Bilinmiyor")
+                and abs(kayit["odeme"] - _sayi(son_ay.get("odeme_tl"))) < 0.005):
+            return analiz_metni(kayit)
+    return analiz_metni(toplu_analiz([kullanici])[0])
+
+
+def main():
+    """Ana fonksiyon"""
+    if len(sys.argv) < 2:
+        print(__doc__)
+        return
+
+    komut = sys.argv[1].lower()
+    if komut == "toplu":
+        json_dosyasi = Path(sys.argv[2]) if len(sys.argv) > 2 else KULLANICI_FATURALAR_FILE
+        db_dosyasi = Path(sys.argv[3]) if len(sys.argv) > 3 else FATURA_ANALIZI_CONFIG['db_dosyasi']
+        sonuc = gece_analizi(json_dosyasi, db_dosyasi)
+        print(f"✅ {sonuc['musteri_sayisi']} müşteri {sonuc['sure_sn']:.2f} sn'de analiz edildi → {db_dosyasi}")
+        print(f"📊 {sonuc['durumlar']}")
+    elif komut == "bul":
+        if len(sys.argv) < 3:
+            print("❌ Numara belirtilmedi!")
+            return
+        depo = _depo_getir()
+        kayit = depo.getir(sys.argv[2]) if depo else None
+        print(analiz_metni(kayit) if kayit else "❌ Analiz kaydı bulunamadı")
+    elif komut == "ozet":
+        depo = _depo_getir()
+        print(f"📊 {depo.ozet()}" if depo else "❌ Gece analizi henüz çalıştırılmadı")
+    else:
+        print(f"❌ Bilinmeyen komut: {komut}")
+        print(__doc__)
+
+
+if __name__ == "__main__":
+    main()
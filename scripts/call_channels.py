@@ -0,0 +1,220 @@
+"""
+Görüşme Kanalları
+SesliCagriMerkezi müşteriyle bir kanal üzerinden konuşur: kanal temsilci
+metnini iletir ve müşterinin bir konuşma sırasını metin olarak verir. Ses
+kanalı (mikrofon + hoparlör) voice_call_center.py içindedir; buradaki metin
+kanalı senaryodaki müşteri cümlelerini sırayla verir ve yanıtları bellekte
+toplar. Böylece karar akışı ses donanımı ve ağ olmadan, tam CPU hızında
+çalıştırılıp ölçülebilir. WAV kanalı ise müşteri konuşmalarını kayıtlı ses
+dosyalarından okuyup profilin ses tanıma motorundan geçirir; yerel bir motorla
+tam ses döngüsü mikrofon ve ağ olmadan, tekrarlanabilir biçimde denenebilir.
+
+Kullanım:
+    python call_channels.py <senaryo.json> [tekrar] [esanli] [ses_profili]
+
+senaryo.json: müşteri cümlesi ya da WAV dosyası listelerinden oluşan liste
+    [["05XXXXXXXXX", "faturam neden yüksek", "hayır"], ...]
+    [["kayitlar/numara.wav", "kayitlar/fatura.wav", "kayitlar/hayir.wav"], ...]
+"""
+
+import json
+import shutil
+import sys
+import tempfile
+import time
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+
+class Kanal(ABC):
+    """Görüşme kanalı arayüzü"""
+
+    def __init__(self):
+        # Müşteri hattı kapattıysa akış görüşmeyi sonlandırır
+        self.kapandi = False
+
+    @abstractmethod
+    def seslendir(self, metin: str):
+        """Temsilci metnini müşteriye ilet"""
+
+    @abstractmethod
+    def konusma_al(self, deneme: int = 1) -> Optional[str]:
+        """Müşterinin bir konuşma sırasını al; anlaşılamazsa None döndür"""
+
+    def kapat(self):
+        """Görüşme bitince kanalın tuttuğu kaynakları (mikrofon vb.) bırak"""
+        pass
+
+
+class MetinKanali(Kanal):
+    """Senaryodaki müşteri cümlelerini veren, yanıtları bellekte toplayan kanal
+
+    Senaryo bittiğinde kanal kapanır; akış bunu müşterinin hattı kapatması
+    olarak ele alır.
+    """
+
+    def __init__(self, musteri_cumleleri: Iterable[str]):
+        super().__init__()
+        self._cumleler = iter(musteri_cumleleri)
+        # (konuşan, metin) sırasıyla tüm görüşme
+        self.kayit: List[Tuple[str, str]] = []
+
+    @property
+    def temsilci_yanitlari(self) -> List[str]:
+        return [metin for konusan, metin in self.kayit if konusan == "Temsilci"]
+
+    def seslendir(self, metin: str):
+        self.kayit.append(("Temsilci", metin))
+
+    def konusma_al(self, deneme: int = 1) -> Optional[str]:
+        metin = next(self._cumleler, None)
+        if metin is None:
+            self.kapandi = True
+            return None
+        self.kayit.append(("Müşteri", metin))
+        return metin
+
+
+class WavKanali(MetinKanali):
+    """Müşteri konuşmalarını sırayla kayıtlı ses dosyalarından okuyup tanıyan kanal
+
+    Dosyalar `ses_tanima_servisi` motoruyla tanınır; tanınan metin kayda
+    müşteri konuşması olarak eklenir, anlaşılamayan dosya None döndürür.
+    Akış tekrar sorduğunda (deneme > 1) sıradaki dosyaya geçilmez, tanınamayan
+    dosya yeniden okunur; böylece senaryo adımlarıyla konuşma sıraları kaymaz.
+    """
+
+    def __init__(self, wav_dosyalari: Iterable[str], ses_ayarlari: Optional[Dict] = None, tanici=None):
+        super().__init__(wav_dosyalari)
+        from stt_engines import tanici_getir
+        self.ses_ayarlari = ses_ayarlari or {}
+        self.tanici = tanici or tanici_getir(self.ses_ayarlari.get("ses_tanima_servisi"))
+        self.dil = self.ses_ayarlari.get("ses_tanima_dili", "tr-TR")
+        # Son tanınamayan dosya; tekrar denemesinde yeniden okunur
+        self._taninamayan = None
+
+    def konusma_al(self, deneme: int = 1) -> Optional[str]:
+        import speech_recognition as sr
+        from stt_engines import wav_oku
+
+        if deneme > 1 and self._taninamayan is not None:
+            dosya = self._taninamayan
+        else:
+            dosya = next(self._cumleler, None)
+        self._taninamayan = None
+        if dosya is None:
+            self.kapandi = True
+            return None
+        try:
+            metin = self.tanici.tani(wav_oku(Path(dosya)), self.dil)
+        except sr.UnknownValueError:
+            self._taninamayan = dosya
+            return None
+        except (sr.RequestError, OSError, ValueError) as e:
+            print(f"Kayıt tanınamadı ({dosya}): {e}")
+            self._taninamayan = dosya
+            return None
+        self.kayit.append(("Müşteri", metin))
+        return metin
+
+
+def senaryo_calistir(musteri_cumleleri: Iterable[str], siniflandirici=None,
+                     kanal_olustur: Callable[[List[str]], Kanal] = MetinKanali, gecmis=None) -> MetinKanali:
+    """Senaryoyu gerçek görüşme akışından geçir; yanıtları içeren kanalı döndür
+
+    `gecmis` verilmezse görüşme global geçmiş yöneticisine kaydedilir.
+    """
+    from voice_call_center import SesliCagriMerkezi
+
+    kanal = kanal_olustur(musteri_cumleleri)
+    merkez = SesliCagriMerkezi(siniflandirici=siniflandirici, ses_ayarlari={}, kanal=kanal, gecmis=gecmis)
+    merkez.cagri_merkezi_baslat()
+    return kanal
+
+
+def yuk_testi(senaryolar: List[List[str]], tekrar: int = 1, esanli: int = 1, siniflandirici=None,
+              kanal_olustur: Callable[[List[str]], Kanal] = MetinKanali, gecmis=None) -> Dict:
+    """Senaryoları `esanli` oturumla `tekrar` kez çalıştırıp akış hızını ölç
+
+    Sentetik görüşmeler gerçek geçmişe karışmasın diye `gecmis` verilmezse
+    geçici dizinde ayrı bir geçmiş yöneticisi açılır ve test sonunda silinir.
+    """
+    from call_sessions import OturumYoneticisi
+
+    gecici_dizin = None
+    if gecmis is None:
+        from conversation_history import GelismisGecmisGorusmeler
+        gecici_dizin = Path(tempfile.mkdtemp(prefix="yuk_testi_"))
+        gecmis = GelismisGecmisGorusmeler(str(gecici_dizin / "conversation_history.json"))
+
+    try:
+        yonetici = OturumYoneticisi(max_oturum=esanli, siniflandirici=siniflandirici)
+        kanallar = []
+        baslangic = time.perf_counter()
+        for _ in range(tekrar):
+            for senaryo in senaryolar:
+                kanal = kanal_olustur(senaryo)
+                kanallar.append(kanal)
+                yonetici.oturum_ac(kanal=kanal, gecmis=gecmis)
+        yonetici.bekle()
+        sure = time.perf_counter() - baslangic
+        istatistik = yonetici.istatistikler()
+        yonetici.kapat()
+    finally:
+        if gecici_dizin is not None:
+            gecmis.kapat()
+            shutil.rmtree(gecici_dizin, ignore_errors=True)
+
+    tur_sayisi = sum(len(kanal.kayit) for kanal in kanallar)
+    return {
+        "gorusme_sayisi": len(kanallar),
+        "tur_sayisi": tur_sayisi,
+        "sure_sn": sure,
+        "gorusme_per_sn": len(kanallar) / sure if sure else 0.0,
+        "tur_per_sn": tur_sayisi / sure if sure else 0.0,
+        "durumlar": istatistik["durumlar"]
+    }
+
+
+def main():
+    """Ana fonksiyon"""
+    if len(sys.argv) < 2:
+        print(__doc__)
+        return
+
+    senaryo_dosyasi = Path(sys.argv[1])
+    try:
+        with open(senaryo_dosyasi, "r", encoding="utf-8") as f:
+            senaryolar = json.load(f)
+        tekrar = int(sys.argv[2]) if len(sys.argv) > 2 else 1
+        esanli = int(sys.argv[3]) if len(sys.argv) > 3 else 1
+    except (OSError, ValueError) as e:
+        print(f"❌ Senaryo okunamadı: {e}")
+        return
+
+    kanal_olustur = MetinKanali
+    if senaryolar and all(str(adim).lower().endswith(".wav") for senaryo in senaryolar for adim in senaryo):
+        from voice_config import ses_yoneticisi
+        ses_ayarlari = ses_yoneticisi.profil_yukle(sys.argv[4] if len(sys.argv) > 4 else "varsayilan")
+        # Göreli dosya yolları senaryo dosyasının bulunduğu dizine göre çözülür
+        senaryolar = [[str(senaryo_dosyasi.parent / adim) for adim in senaryo] for senaryo in senaryolar]
+        kanal_olustur = lambda dosyalar: WavKanali(dosyalar, ses_ayarlari)
+
+    if tekrar == 1 and esanli == 1 and len(senaryolar) == 1:
+        for konusan, metin in senaryo_calistir(senaryolar[0], kanal_olustur=kanal_olustur).kayit:
+            print(f"{konusan}: {metin}")
+        return
+
+    try:
+        sonuc = yuk_testi(senaryolar, tekrar=tekrar, esanli=esanli, kanal_olustur=kanal_olustur)
+    except RuntimeError as e:
+        print(f"❌ {e}")
+        return
+    print(f"📞 {sonuc['gorusme_sayisi']} görüşme, {sonuc['tur_sayisi']} tur - {sonuc['sure_sn']:.2f} sn")
+    print(f"⚡ {sonuc['gorusme_per_sn']:.1f} görüşme/sn, {sonuc['tur_per_sn']:.1f} tur/sn")
+    print(f"📊 Durumlar: {sonuc['durumlar']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,239 @@
+"""
+Çoklu Oturum Çağrı Motoru
+Tek süreçte birden çok bağımsız SesliCagriMerkezi görüşmesini yürütür.
+Sınıflandırma servisi, müşteri rehberi ve görüşme geçmişi tüm oturumlar
+arasında paylaşılır; görüşme id'si, tanıyıcı ve mikrofon gibi görüşmeye
+özgü durum her oturumun kendi nesnesinde tutulur.
+
+Kullanım:
+    python call_sessions.py <oturum_sayisi> [mikrofon_index ...]
+"""
+
+import sys
+import threading
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+try:
+    from config import OTURUM_CONFIG
+except ImportError:
+    OTURUM_CONFIG = {'max_oturum': 8}
+
+try:
+    from voice_config import ses_yoneticisi
+except ImportError:
+    ses_yoneticisi = None
+
+from voice_call_center import SesliCagriMerkezi, siniflandirici_olustur
+
+
+@dataclass
+class CagriOturumu:
+    """Tek bir görüşmenin oturum kaydı"""
+    oturum_id: str
+    merkez: Any  # SesliCagriMerkezi
+    durum: str = "bekliyor"  # bekliyor, calisiyor, tamamlandi, iptal, hata
+    acilis: datetime = field(default_factory=datetime.now)
+    baslangic: Optional[datetime] = None
+    bitis: Optional[datetime] = None
+    hata: Optional[str] = None
+    future: Optional[Future] = field(default=None, repr=False)
+
+    @property
+    def gorusme_id(self) -> Optional[str]:
+        return self.merkez.aktif_gorusme_id
+
+    def ozet(self) -> Dict:
+        """Oturumun durum özetini getir"""
+        return {
+            "oturum_id": self.oturum_id,
+            "gorusme_id": self.gorusme_id,
+            "durum": self.durum,
+            "acilis": self.acilis.isoformat(),
+            "baslangic": self.baslangic.isoformat() if self.baslangic else None,
+            "bitis": self.bitis.isoformat() if self.bitis else None,
+            "hata": self.hata
+        }
+
+
+class OturumYoneticisi:
+    """Paylaşılan kaynaklarla N eşzamanlı görüşme oturumu yürütür
+
+    Oturumlar `max_oturum` iş parçacıklı bir havuzda çalışır; havuz doluysa
+    yeni oturumlar sırada bekler. Tüm oturumlar aynı TopluSiniflandirici'yi
+    kullandığı için eşzamanlı tahmin istekleri tek bir mikro-toplu ileri
+    geçişte birleşir.
+    """
+
+    def __init__(self, max_oturum: Optional[int] = None, siniflandirici=None,
+                 merkez_sinifi=SesliCagriMerkezi):
+        self.max_oturum = max_oturum or OTURUM_CONFIG['max_oturum']
+        self.merkez_sinifi = merkez_sinifi
+        # Dışarıdan verilen servis başka bileşenlerce de kullanılıyor olabilir; yalnızca kendi oluşturduğunu kapat
+        self._siniflandirici_sahibi = siniflandirici is None
+        self.siniflandirici = siniflandirici if siniflandirici is not None else siniflandirici_olustur()
+        if self.siniflandirici is None:
+            # Her oturum modeli yeniden yüklemeye çalışmasın
+            raise RuntimeError("Sınıflandırma servisi oluşturulamadı; BERTurk model dizinini kontrol edin.")
+
+        self._havuz = ThreadPoolExecutor(max_workers=self.max_oturum, thread_name_prefix="CagriOturumu")
+        self._oturumlar: Dict[str, CagriOturumu] = {}
+        self._kilit = threading.Lock()
+        self._calisan = 0
+        self.esanli_zirve = 0
+
+    def __len__(self) -> int:
+        return len(self._oturumlar)
+
+    def oturum_ac(self, ses_profili: str = "varsayilan", ayarlar: Optional[Dict] = None,
+                  ui=None, baslat: bool = True, **merkez_argumanlari) -> CagriOturumu:
+        """Yeni oturum oluştur; `ayarlar` profilin üzerine yazılır (ör. mikrofon_index)"""
+        ses_ayarlari = None
+        if ses_yoneticisi:
+            # Profilin kopyası: oturumlar birbirinin ve global profilin ayarlarını değiştirmez
+            ses_ayarlari = ses_yoneticisi.profil_yukle(ses_profili)
+            ses_ayarlari.update(ayarlar or {})
+
+        merkez = self.merkez_sinifi(ui=ui, ses_profili=ses_profili, siniflandirici=self.siniflandirici,
+                                    ses_ayarlari=ses_ayarlari, **merkez_argumanlari)
+        oturum = CagriOturumu(oturum_id=str(uuid.uuid4()), merkez=merkez)
+        with self._kilit:
+            self._oturumlar[oturum.oturum_id] = oturum
+        if baslat:
+            self.baslat(oturum.oturum_id)
+        return oturum
+
+    def baslat(self, oturum_id: str) -> Future:
+        """Oturumun görüşme akışını havuza gönder"""
+        oturum = self._oturumlar[oturum_id]
+        if oturum.future is None:
+            oturum.future = self._havuz.submit(self._calistir, oturum)
+        return oturum.future
+
+    def _calistir(self, oturum: CagriOturumu):
+        if oturum.merkez.sonlandir.is_set():
+            oturum.durum = "iptal"
+            return
+        with self._kilit:
+            self._calisan += 1
+            self.esanli_zirve = max(self.esanli_zirve, self._calisan)
+        oturum.durum = "calisiyor"
+        oturum.baslangic = datetime.now()
+        try:
+            oturum.merkez.cagri_merkezi_baslat()
+            # Görüşme akışı hataları kendi içinde yakalayıp müşteriye bildirir; durum kaydedilen hatadan okunur
+            son_hata = getattr(oturum.merkez, "son_hata", None)
+            if son_hata is not None:
+                oturum.durum = "hata"
+                oturum.hata = str(son_hata)
+            else:
+                oturum.durum = "iptal" if oturum.merkez.sonlandir.is_set() else "tamamlandi"
+        except Exception as e:
+            oturum.durum = "hata"
+            oturum.hata = str(e)
+            print(f"Oturum {oturum.oturum_id[:8]} hatası: {e}")
+        finally:
+            oturum.bitis = datetime.now()
+            with self._kilit:
+                self._calisan -= 1
+
+    def oturum_getir(self, oturum_id: str) -> Optional[CagriOturumu]:
+        """Id ile oturumu getir"""
+        return self._oturumlar.get(oturum_id)
+
+    def aktif_oturumlar(self) -> List[CagriOturumu]:
+        """Bekleyen ya da çalışan oturumları getir"""
+        with self._kilit:
+            return [o for o in self._oturumlar.values() if o.durum in ("bekliyor", "calisiyor")]
+
+    def oturumlari_listele(self) -> List[Dict]:
+        """Tüm oturumların özetlerini getir"""
+        with self._kilit:
+            oturumlar = list(self._oturumlar.values())
+        return [oturum.ozet() for oturum in oturumlar]
+
+    def oturum_kapat(self, oturum_id: str) -> bool:
+        """Oturumu sonlandır: sıradaysa iptal et, çalışıyorsa akışın bir sonraki adımında bitir"""
+        oturum = self._oturumlar.get(oturum_id)
+        if oturum is None:
+            return False
+        oturum.merkez.sonlandir.set()
+        if oturum.future is not None and oturum.future.cancel():
+            oturum.durum = "iptal"
+        return True
+
+    def temizle(self) -> int:
+        """Biten oturumların kayıtlarını bırak; bırakılan oturum sayısını döndür"""
+        with self._kilit:
+            bitenler = [oid for oid, o in self._oturumlar.items() if o.durum not in ("bekliyor", "calisiyor")]
+            for oid in bitenler:
+                del self._oturumlar[oid]
+        return len(bitenler)
+
+    def bekle(self, timeout: Optional[float] = None) -> bool:
+        """Başlatılmış tüm oturumlar bitene kadar bekle"""
+        with self._kilit:
+            futures = [o.future for o in self._oturumlar.values() if o.future is not None]
+        _, bitmeyenler = wait(futures, timeout=timeout)
+        return not bitmeyenler
+
+    def kapat(self, bekle: bool = True):
+        """Tüm oturumları sonlandır, havuzu ve sınıflandırma servisini kapat"""
+        for oturum_id in list(self._oturumlar):
+            self.oturum_kapat(oturum_id)
+        self._havuz.shutdown(wait=bekle)
+        if self._siniflandirici_sahibi and self.siniflandirici is not None:
+            self.siniflandirici.kapat(bekle=bekle)
+
+    def istatistikler(self) -> Dict:
+        """Oturum durum sayıları ve eşzamanlılık zirvesi"""
+        with self._kilit:
+            durumlar: Dict[str, int] = {}
+            for oturum in self._oturumlar.values():
+                durumlar[oturum.durum] = durumlar.get(oturum.durum, 0) + 1
+            return {
+                "toplam_oturum": len(self._oturumlar),
+                "calisan_oturum": self._calisan,
+                "esanli_zirve": self.esanli_zirve,
+                "max_oturum": self.max_oturum,
+                "durumlar": durumlar
+            }
+
+
+def main():
+    """Ana fonksiyon"""
+    if len(sys.argv) < 2:
+        print(__doc__)
+        return
+
+    try:
+        oturum_sayisi = int(sys.argv[1])
+        mikrofonlar = [int(x) for x in sys.argv[2:]]
+    except ValueError:
+        print("❌ Oturum sayısı ve mikrofon indeksleri tam sayı olmalı!")
+        return
+
+    try:
+        yonetici = OturumYoneticisi(max_oturum=oturum_sayisi)
+    except RuntimeError as e:
+        print(f"❌ {e}")
+        return
+    for i in range(oturum_sayisi):
+        ayarlar = {"mikrofon_index": mikrofonlar[i]} if i < len(mikrofonlar) else None
+        oturum = yonetici.oturum_ac(ayarlar=ayarlar)
+        print(f"📞 Oturum açıldı: {oturum.oturum_id[:8]}")
+
+    try:
+        yonetici.bekle()
+    except KeyboardInterrupt:
+        print("\n⏹️ Oturumlar sonlandırılıyor...")
+    finally:
+        yonetici.kapat(bekle=False)
+    print(f"📊 {yonetici.istatistikler()}")
+
+
+if __name__ == "__main__":
+    main()
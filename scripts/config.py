@@ -31,6 +31,7 @@ SIKAYETLER_TEMIZ_FILE = DATA_DIR / "sikayetler_temiz.csv"
 
 # Model yolları
 BERTURK_CAGRI_MODEL_DIR = MODELS_DIR / "berturk_cagri_model"
+BERTURK_ONNX_DIR = MODELS_DIR / "berturk_cagri_model_onnx"
 BERTURK_FINETUNED_DIR = MODELS_DIR / "berturk_finetuned"
 
 # FFmpeg ayarları
@@ -81,7 +82,9 @@ KATEGORILER = {
 SPEECH_RECOGNITION_CONFIG = {
     'language': 'tr-TR',
     'timeout': 20,
-    'phrase_time_limit': 10
+    'phrase_time_limit': 10,
+    # Çevrimdışı 'vosk' motoru için model (https://alphacephei.com/vosk/models)
+    'vosk_model_dizini': MODELS_DIR / "vosk-model-small-tr-0.3"
 }
 
 # Model ayarları
@@ -92,6 +95,90 @@ MODEL_CONFIG = {
     'num_epochs': 10
 }
 
+# Çıkarım arka ucu: torch, onnx, onnx-int8
+INFERENCE_CONFIG = {
+    'calisma_zamani': os.environ.get('CAGRI_CALISMA_ZAMANI', 'torch')
+}
+
+# Toplu sınıflandırma servisi ayarları
+SINIFLANDIRMA_CONFIG = {
+    'max_batch_size': 16,
+    'max_bekleme_ms': 10,
+    'padding_modu': 'dinamik',  # dinamik, max_length
+    'uzunluk_kovalari': [16, 32, 64]
+}
+
+# Müşteri deposu: json (bellekte indeks) veya sqlite
+MUSTERI_DEPOSU_CONFIG = {
+    'tur': os.environ.get('CAGRI_MUSTERI_DEPOSU', 'json'),
+    'sqlite_dosyasi': DATA_DIR / "musteriler.db",
+    'havuz_boyutu': 4,
+    'toplu_boyutu': 1000
+}
+
+# Tahmin önbelleği ayarları
+TAHMIN_ONBELLEGI_CONFIG = {
+    'kapasite': 10000,
+    'kalici': True,
+    'dosya': DATA_DIR / "tahmin_onbellegi.json"
+}
+
+# Görüşme geçmişi bölümleri: son N ay bellekte, eski aylar LRU önbellekte
+GECMIS_CONFIG = {
+    'yerlesik_ay_sayisi': 3,
+    'onbellek_bolum_sayisi': 4,
+    # Bellekte olmayan aylar için LRU'da tutulan arama indeksi sayısı
+    'arsiv_indeks_sayisi': 12,
+    # Saklama politikası: mesajlar N gün tam, sonra özet; kayıtlar M gün sonra arşive
+    'tam_metin_gun': 90,
+    'kayit_gun': 730,
+    'saklama_araligi_saat': 0  # 0: arka plan görevi kapalı
+}
+
+# Toplu fatura analizi: gece çalışan analiz sonuçları numaraya göre SQLite'ta tutulur
+FATURA_ANALIZI_CONFIG = {
+    'db_dosyasi': DATA_DIR / "fatura_analizleri.db",
+    'toplu_boyutu': 10000
+}
+
+# Seslendirme önbelleği: (metin, dil, ses profili) → MP3 / çözülmüş PCM; tüm katmanlar bayt sınırlı LRU
+TTS_ONBELLEGI_CONFIG = {
+    'dizin': DATA_DIR / "tts_onbellegi",
+    'bellek_mb': 32,
+    'disk_mb': 256,
+    'pcm_mb': 64,                # oynatma için çözülmüş ses (ham PCM)
+    'on_isitma': True,           # sabit istemleri başlangıçta arka planda sentezle
+    'on_isitma_isci_sayisi': 4
+}
+
+# Çok cümleli yanıtlarda cümle N çalarken cümle N+1 sentezlenir; kuyruk önde sentezlenen cümle sayısını sınırlar
+SESLENDIRME_CONFIG = {
+    'akis_modu': True,
+    'kuyruk_boyutu': 2
+}
+
+# Ortam gürültüsü: görüşme başında bir kez kalibre et, dinleme dışında tabanı izle, yalnızca sapmada güncelle
+GURULTU_KALIBRASYONU_CONFIG = {
+    'kalibrasyon_suresi': 1.0,   # görüşme başında dinlenen süre (sn)
+    'pencere_suresi': 5.0,       # gürültü tabanının hesaplandığı kayan pencere (sn)
+    'taban_yuzdeligi': 20,       # konuşma ve temsilci sesi tabanı şişirmesin diye alt yüzdelik
+    'sapma_orani': 0.5,          # taban referanstan bu oranda saparsa eşik güncellenir
+    'kontrol_araligi': 1.0,      # sapma kontrolü sıklığı (sn)
+    'min_esik': 50
+}
+
+# Çoklu oturum motoru: aynı anda yürütülebilecek görüşme sayısı
+OTURUM_CONFIG = {
+    'max_oturum': int(os.environ.get('CAGRI_MAX_OTURUM', 8))
+}
+
+# Asenkron görüşme akışı: bloklayan ses çağrıları için sınırlı iş parçacığı havuzları
+ASYNC_CONFIG = {
+    'tts_isci_sayisi': 8,   # gTTS sentezi + oynatma
+    'stt_isci_sayisi': 8,   # mikrofon dinleme + speech_recognition
+    'veri_isci_sayisi': 4   # müşteri rehberi, fatura analizi (SQLite) ve görüşme geçmişi
+}
+
 # Dosya varlık kontrolü
 def check_required_files():
     """Gerekli dosyaların varlığını kontrol eder"""
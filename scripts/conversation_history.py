@@ -17,38 +17,996 @@ Gelişmiş Geçmiş Görüşmeler Sistemi
 Detaylı çağrı kayıtları ve müşteri analizi sağlar.
 """
 
+import atexit
+import copy
+import gzip
 import json
 import os
+import sys
+import threading
+from collections import OrderedDict
 from datetime import datetime, timedelta
+from itertools import islice
 from pathlib import Path
 import uuid
-from typing import Dict, List, Optional, Any
+from typing import Dict, Iterator, List, Optional, Any, Set, Tuple
+
+from search_index import AramaIndeksi
+
+try:
+    from config import GECMIS_CONFIG
+except ImportError:
+    GECMIS_CONFIG = {'yerlesik_ay_sayisi': 3, 'onbellek_bolum_sayisi': 4, 'arsiv_indeks_sayisi': 12,
+                     'tam_metin_gun': 90, 'kayit_gun': 730, 'saklama_araligi_saat': 0}
+
+INDEKS_SURUMU = 1
+
+# Müşteri profillerinde son N günün günlük çağrı sayıları tutulur
+PROFIL_GUN_PENCERESI = 30
 
 class GelismisGecmisGorusmeler:
-    def __init__(self, data_file: str = "data/conversation_history.json"):
+    """Görüşme geçmişi yöneticisi
+    
+    Her değişiklik bir olay (basladi, mesaj, kategori, bitti, guncellendi,
+    silindi) olarak bellekte uygulanır ve JSONL günlüğüne tek satır eklenir.
+    Açılışta anlık görüntü yüklenip günlük yeniden oynatılır; günlük
+    `sikistirma_esigi` olaya ulaşınca anlık görüntüye sıkıştırılır.
+    
+    `yazma_modu="arka_plan"` iken olaylar bellekte biriktirilir ve arka plan
+    iş parçacığı bunları `yazma_araligi` saniyede bir ya da `kirli_esigi`
+    olay birikince topluca diske yazar; çağrı akışı diski hiç beklemez.
+    `yazma_modu="senkron"` iken her olay anında yazılır.
+    
+    Anlık görüntü, görüşmelerin başlangıç ayına göre aylık bölümlere
+    (`conversation_history/2025-01.json`) ve müşteri geçmişi ile
+    istatistikleri tutan `indeks.json` dosyasına ayrılır. Bellekte yalnızca
+    son `yerlesik_ay_sayisi` ayın bölümleri ve indeks tutulur; daha eski
+    bölümler gerektiğinde yüklenir ve en fazla `onbellek_bolum_sayisi`
+    tanesi LRU olarak bellekte kalır. Arama için kurulan eski ay indekslerinden
+    de en fazla `arsiv_indeks_sayisi` tanesi LRU olarak tutulur. Görüşme id →
+    ay eşlemesi indeksle birlikte yazılmaz; her sıkıştırmada yalnızca değişen
+    kayıtlar `gorusme_aylari.jsonl` yan dosyasına eklenir.
+    
+    Saklama politikası (`saklama_politikasi_uygula`) eski görüşmelerin
+    mesajlarını özetle değiştirir, çok eski görüşmeleri siler; çıkarılan
+    veri `conversation_history/arsiv/` altında sıkıştırılmış JSONL olarak
+    saklanır. `saklama_araligi_saat` > 0 ise arka planda periyodik çalışır.
+    """
+    
+    def __init__(self, data_file: str = "data/conversation_history.json", sikistirma_esigi: int = 1000,
+                 yazma_modu: str = "arka_plan", yazma_araligi: float = 1.0, kirli_esigi: int = 50,
+                 yerlesik_ay_sayisi: int = GECMIS_CONFIG['yerlesik_ay_sayisi'],
+                 onbellek_bolum_sayisi: int = GECMIS_CONFIG['onbellek_bolum_sayisi'],
+                 arsiv_indeks_sayisi: int = GECMIS_CONFIG.get('arsiv_indeks_sayisi', 12),
+                 saklama_araligi_saat: float = GECMIS_CONFIG['saklama_araligi_saat']):
         self.data_file = Path(data_file)
         self.data_file.parent.mkdir(parents=True, exist_ok=True)
-        self.gorusmeler = self._load_data()
-        self._istatistikleri_guncelle()
+        self.gunluk_dosyasi = self.data_file.with_suffix(".journal.jsonl")
+        self.bolum_dizini = self.data_file.with_suffix("")
+        self.indeks_dosyasi = self.bolum_dizini / "indeks.json"
+        self.aylar_dosyasi = self.bolum_dizini / "gorusme_aylari.jsonl"
+        self.arsiv_dizini = self.bolum_dizini / "arsiv"
+        self.sikistirma_esigi = sikistirma_esigi
+        self.yazma_modu = yazma_modu
+        self.yazma_araligi = yazma_araligi
+        self.kirli_esigi = kirli_esigi
+        self.yerlesik_ay_sayisi = yerlesik_ay_sayisi
+        self.onbellek_bolum_sayisi = onbellek_bolum_sayisi
+        self.arsiv_indeks_sayisi = arsiv_indeks_sayisi
+        
+        # Bellekteki veri ve bekleyen olaylar _kilit ile, dosyalar _dosya_kilidi ile korunur
+        self._kilit = threading.RLock()
+        self._dosya_kilidi = threading.Lock()
+        # Yakalamadan günlük kırpmaya kadar tek sıkıştırma çalışır
+        self._sikistirma_kilidi = threading.Lock()
+        self._yazici_uyandir = threading.Condition(self._kilit)
+        self._bekleyen_satirlar: List[str] = []
+        self._kapatiliyor = False
+        
+        # Bölümler: ay ("YYYY-AA") → görüşme listesi
+        self._bolumler: Dict[str, List[Dict]] = {}
+        self._onbellek: "OrderedDict[str, None]" = OrderedDict()
+        self._kirli_bolumler: Set[str] = set()
+        self._yazilan_bolumler: Set[str] = set()
+        # Bellekte olmayan bölümlerin arama indeksleri (LRU): ay → (dosya mtime, indeks)
+        self._arsiv_indeksleri: "OrderedDict[str, Tuple[int, AramaIndeksi]]" = OrderedDict()
+        # Görüşme id → bölüm ayı; bellekte olmayan görüşme tek bölüm okunarak bulunur.
+        # İndeksle birlikte yazılmaz: son sıkıştırmadan beri değişenler yan dosyaya eklenir
+        self._gorusme_aylari: Dict[str, str] = {}
+        self._ay_degisiklikleri: Dict[str, Optional[str]] = {}
+        self._aylar_satir_sayisi = 0
+        
+        self._olay_no = 0
+        self._sikistirmadan_beri = 0
+        self.bolum_dizini.mkdir(parents=True, exist_ok=True)
+        self._yarim_sikistirmayi_tamamla()
+        if not self.indeks_dosyasi.exists() and self.data_file.exists():
+            self._eski_dosyadan_tasi()
+        self.indeks = self._load_data()
+        self._olay_no = self.indeks["son_olay_no"]
+        self._aylar: Set[str] = {p.name[:-len(".json")] for p in self.bolum_dizini.glob("????-??.json")}
+        if self._profiller_eksik:
+            self._profilleri_olustur()
+        self._gorusme_aylarini_yukle()
+        self._indeksleri_kur()
+        self._yerlesik = self._yerlesik_aylar()
+        for ay in sorted(self._yerlesik & self._aylar):
+            self._bolum_getir(ay)
+        self._gunlugu_oynat()
+        self._gunluk = open(self.gunluk_dosyasi, 'a', encoding='utf-8')
+        
+        self._yazici = None
+        if self.yazma_modu == "arka_plan":
+            self._yazici = threading.Thread(target=self._yazici_dongusu, name="GecmisYazici", daemon=True)
+            self._yazici.start()
+        
+        self._saklama_durdur = threading.Event()
+        self._saklama = None
+        if saklama_araligi_saat > 0:
+            self._saklama = threading.Thread(target=self._saklama_dongusu, args=(saklama_araligi_saat * 3600,),
+                                             name="GecmisSaklama", daemon=True)
+            self._saklama.start()
+        atexit.register(self.kapat)
+    
+    @staticmethod
+    def _bos_istatistikler() -> Dict:
+        """Boş genel istatistik / durum sayısı / günlük kova üçlüsü"""
+        return {
+            "kategori_istatistikleri": {
+                "kategori_sayilari": {},
+                "kategori_sureleri": {},
+                "toplam_gorusme": 0,
+                "aktif_gorusme": 0,
+                "tamamlanan_gorusme": 0,
+            },
+            "durum_sayilari": {},
+            "gun_kovalari": {},
+        }
+    
+    @classmethod
+    def _bos_indeks(cls) -> Dict:
+        """Boş müşteri geçmişi / istatistik indeksi"""
+        return {
+            "surum": INDEKS_SURUMU,
+            "son_olay_no": 0,
+            "musteri_gecmis": {},
+            # Telefon → ilk/son çağrı, kategori dağılımı, süre ve son günlerin çağrı sayıları
+            "musteri_profilleri": {},
+            **cls._bos_istatistikler(),
+            # Saklama politikasıyla silinen görüşmelerin istatistik katkısı
+            "arsiv_istatistikleri": cls._bos_istatistikler(),
+        }
     
     def _load_data(self) -> Dict:
-        """Veri dosyasını yükle"""
-        if self.data_file.exists():
+        """İndeks dosyasını yükle"""
+        indeks = self._bos_indeks()
+        self._profiller_eksik = False
+        if self.indeks_dosyasi.exists():
             try:
-                with open(self.data_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
+                with open(self.indeks_dosyasi, 'r', encoding='utf-8') as f:
+                    yuklenen = json.load(f)
+                # Profillerden önce yazılmış indeks: profiller bölümlerden bir kez kurulur
+                self._profiller_eksik = "musteri_profilleri" not in yuklenen
+                indeks.update(yuklenen)
             except Exception as e:
                 print(f"Geçmiş görüşmeler yüklenirken hata: {e}")
-                return {"gorusmeler": [], "musteri_gecmis": {}, "kategori_istatistikleri": {}}
-        return {"gorusmeler": [], "musteri_gecmis": {}, "kategori_istatistikleri": {}}
+        return indeks
     
-    def _save_data(self):
-        """Veriyi dosyaya kaydet"""
+    def _bolum_dosyasi(self, ay: str) -> Path:
+        return self.bolum_dizini / f"{ay}.json"
+    
+    def _save_data(self, indeks_metni: str, bolum_metinleri: Dict[str, str]) -> bool:
+        """İndeksi ve değişen bölümleri iki aşamada atomik olarak kaydet
+        
+        Önce tüm bölümler `.json.tmp` olarak yazılır, ardından indeks
+        `indeks.json.tmp` adıyla yerine konur. Bu dosyanın varlığı tüm geçici
+        dosyaların tamamlandığını gösterir; yarıda kalan kayıt açılışta
+        tamamlanır ya da geri alınır.
+        """
         try:
-            with open(self.data_file, 'w', encoding='utf-8') as f:
-                json.dump(self.gorusmeler, f, ensure_ascii=False, indent=2)
+            for ay, metin in bolum_metinleri.items():
+                with open(self._bolum_dosyasi(ay).with_suffix(".json.tmp"), 'w', encoding='utf-8') as f:
+                    f.write(metin)
+            yaziliyor = self.indeks_dosyasi.with_suffix(".json.yaziliyor")
+            with open(yaziliyor, 'w', encoding='utf-8') as f:
+                f.write(indeks_metni)
+            os.replace(yaziliyor, self.indeks_dosyasi.with_suffix(".json.tmp"))
+            self._yarim_sikistirmayi_tamamla()
+            return True
         except Exception as e:
             print(f"Geçmiş görüşmeler kaydedilirken hata: {e}")
+            return False
+    
+    def _yarim_sikistirmayi_tamamla(self):
+        """Geçici bölüm dosyalarını indeks hazırsa yerine koy, değilse sil"""
+        gecici_indeks = self.indeks_dosyasi.with_suffix(".json.tmp")
+        bolum_gecicileri = [p for p in self.bolum_dizini.glob("????-??.json.tmp")]
+        if gecici_indeks.exists():
+            for gecici in bolum_gecicileri:
+                os.replace(gecici, gecici.with_suffix(""))
+            os.replace(gecici_indeks, self.indeks_dosyasi)
+        else:
+            for gecici in bolum_gecicileri:
+                gecici.unlink()
+    
+    def _eski_dosyadan_tasi(self):
+        """Tek dosyalık eski anlık görüntüyü aylık bölümlere taşı"""
+        try:
+            with open(self.data_file, 'r', encoding='utf-8') as f:
+                eski = json.load(f)
+        except Exception as e:
+            print(f"Geçmiş görüşmeler yüklenirken hata: {e}")
+            return
+        
+        bolumler: Dict[str, List[Dict]] = {}
+        gorusme_aylari: Dict[str, str] = {}
+        indeks = self._bos_indeks()
+        indeks["son_olay_no"] = eski.get("son_olay_no", 0)
+        indeks["musteri_gecmis"] = eski.get("musteri_gecmis", {})
+        for gorusme in eski.get("gorusmeler", []):
+            bolumler.setdefault(gorusme["baslangic_zamani"][:7], []).append(gorusme)
+            gorusme_aylari[gorusme["id"]] = gorusme["baslangic_zamani"][:7]
+            self._katki_uygula(indeks, gorusme, 1)
+        
+        if self._aylar_dosyasini_yaz(gorusme_aylari) and self._save_data(
+            json.dumps(indeks, ensure_ascii=False, indent=2),
+            {ay: json.dumps({"ay": ay, "gorusmeler": liste}, ensure_ascii=False, indent=2)
+             for ay, liste in bolumler.items()}
+        ):
+            print(f"📦 Görüşme geçmişi {len(bolumler)} aylık bölüme taşındı: {self.bolum_dizini}")
+    
+    def _gunlugu_oynat(self):
+        """Anlık görüntüden sonraki günlük olaylarını yeniden uygula"""
+        if not self.gunluk_dosyasi.exists():
+            return
+        olaylar = []
+        with open(self.gunluk_dosyasi, 'r', encoding='utf-8') as f:
+            for satir in f:
+                try:
+                    olaylar.append(json.loads(satir))
+                except json.JSONDecodeError:
+                    # Yarım yazılmış son satır
+                    continue
+        # Başarısız sıkıştırmanın geri yazdığı olaylar daha yenilerinden sonra gelebilir
+        for olay in sorted(olaylar, key=lambda o: o.get("no", 0)):
+            if olay.get("no", 0) <= self._olay_no:
+                continue
+            self._olay_uygula(olay)
+            self._olay_no = olay["no"]
+            self._sikistirmadan_beri += 1
+    
+    def _olay_kaydet(self, olay: Dict):
+        """Olayı bellekte uygula ve günlüğe ekle (ya da yazma kuyruğuna koy)"""
+        with self._kilit:
+            self._olay_no += 1
+            olay["no"] = self._olay_no
+            self._olay_uygula(olay)
+            self._bekleyen_satirlar.append(json.dumps(olay, ensure_ascii=False))
+            self._sikistirmadan_beri += 1
+            
+            if self.yazma_modu != "arka_plan":
+                self.diske_yaz()
+            elif len(self._bekleyen_satirlar) >= self.kirli_esigi:
+                self._yazici_uyandir.notify()
+    
+    def diske_yaz(self):
+        """Bekleyen olayları günlüğe yaz; eşik aşıldıysa sıkıştır"""
+        # Kilit altında yalnızca eşik kontrol edilir; sıkıştırma diske yazarken kilidi tutmamalı
+        with self._kilit:
+            sikistirilacak = self._sikistirmadan_beri >= self.sikistirma_esigi
+        # Başka bir sıkıştırma sürüyorsa beklenmez, olaylar günlüğe yazılır
+        if sikistirilacak and self.sikistir(bekle=False):
+            return
+        with self._kilit:
+            satirlar, self._bekleyen_satirlar = self._bekleyen_satirlar, []
+        self._gunluge_yaz(satirlar)
+    
+    def _gunluge_yaz(self, satirlar: List[str]):
+        if not satirlar:
+            return
+        with self._dosya_kilidi:
+            try:
+                self._gunluk.write("\n".join(satirlar) + "\n")
+                self._gunluk.flush()
+            except Exception as e:
+                print(f"Görüşme günlüğüne yazılırken hata: {e}")
+    
+    def sikistir(self, bekle: bool = True) -> bool:
+        """Değişen bölümleri ve indeksi anlık görüntüye yaz, günlüğü boşalt
+        
+        Sıkıştırmalar (yazıcı ve saklama iş parçacığı) birbirini bekler; eski
+        anlık görüntü yenisinin üzerine yazılamaz. `bekle` kapalıysa ve başka
+        bir sıkıştırma sürüyorsa hemen False döner.
+        """
+        if not self._sikistirma_kilidi.acquire(blocking=bekle):
+            return False
+        try:
+            self._sikistir()
+        finally:
+            self._sikistirma_kilidi.release()
+        return True
+    
+    def _sikistir(self):
+        with self._kilit:
+            son_olay_no = self._olay_no
+            self.indeks["son_olay_no"] = son_olay_no
+            # Serileştirme kilit altında, disk yazımı kilit dışında yapılır
+            metin = json.dumps(self.indeks, ensure_ascii=False, indent=2)
+            # id → ay eşlemesinden yalnızca değişenler alınır; yan dosya çok büyüdüyse tamamı yeniden yazılır
+            ay_degisiklikleri, self._ay_degisiklikleri = self._ay_degisiklikleri, {}
+            yeniden_yaz = self._aylar_satir_sayisi + len(ay_degisiklikleri) > 2 * len(self._gorusme_aylari) + 1000
+            tum_aylar = dict(self._gorusme_aylari) if yeniden_yaz else None
+            bolum_metinleri = {
+                ay: json.dumps({"ay": ay, "gorusmeler": self._bolumler[ay]}, ensure_ascii=False, indent=2)
+                for ay in self._kirli_bolumler if ay in self._bolumler
+            }
+            # Yazılana kadar bu bölümler bellekten çıkarılmamalı
+            self._yazilan_bolumler |= bolum_metinleri.keys()
+            self._kirli_bolumler = set()
+            satirlar, self._bekleyen_satirlar = self._bekleyen_satirlar, []
+            self._sikistirmadan_beri = 0
+        with self._dosya_kilidi:
+            # Eşleme indeksten önce yazılır; indeks yazılamazsa fazladan satırlar günlük oynatılınca tutarlı kalır
+            if tum_aylar is not None:
+                basarili = self._aylar_dosyasini_yaz(tum_aylar)
+            else:
+                basarili = self._aylar_dosyasina_ekle(ay_degisiklikleri)
+            basarili = basarili and self._save_data(metin, bolum_metinleri)
+            if basarili:
+                self._gunlugu_kirp(son_olay_no)
+        with self._kilit:
+            self._yazilan_bolumler -= bolum_metinleri.keys()
+            if not basarili:
+                # Anlık görüntü yazılamadı: bölümler kirli kalır, olaylar günlükte korunur
+                self._kirli_bolumler |= bolum_metinleri.keys()
+                for gorusme_id, ay in ay_degisiklikleri.items():
+                    self._ay_degisiklikleri.setdefault(gorusme_id, ay)
+            else:
+                self._pencereyi_kaydir()
+        if not basarili:
+            self._gunluge_yaz(satirlar)
+    
+    def _gunlugu_kirp(self, son_olay_no: int):
+        """Anlık görüntüye giren olayları günlükten at (_dosya_kilidi altında çağrılır)
+        
+        Olaylar yakalandıktan sonra yazıcının günlüğe eklediği daha yeni
+        satırlar anlık görüntüde olmadığı için korunur.
+        """
+        try:
+            self._gunluk.flush()
+            kalan = []
+            with open(self.gunluk_dosyasi, 'r', encoding='utf-8') as f:
+                for satir in f:
+                    try:
+                        if json.loads(satir).get("no", 0) > son_olay_no:
+                            kalan.append(satir)
+                    except json.JSONDecodeError:
+                        continue
+            self._gunluk.seek(0)
+            self._gunluk.truncate()
+            if kalan:
+                self._gunluk.write("".join(kalan))
+                self._gunluk.flush()
+        except Exception as e:
+            print(f"Görüşme günlüğü kırpılırken hata: {e}")
+    
+    def _yazici_dongusu(self):
+        while True:
+            with self._kilit:
+                if not self._kapatiliyor and len(self._bekleyen_satirlar) < self.kirli_esigi:
+                    self._yazici_uyandir.wait(self.yazma_araligi)
+                if self._kapatiliyor:
+                    return
+            self.diske_yaz()
+    
+    def kapat(self):
+        """Arka plan yazıcısını durdur, bekleyen olayları yaz ve günlüğü kapat"""
+        with self._kilit:
+            if self._kapatiliyor:
+                return
+            self._kapatiliyor = True
+            self._yazici_uyandir.notify()
+        self._saklama_durdur.set()
+        if self._yazici is not None:
+            self._yazici.join()
+        if self._saklama is not None:
+            self._saklama.join()
+        self.diske_yaz()
+        with self._dosya_kilidi:
+            if not self._gunluk.closed:
+                self._gunluk.close()
+    
+    def _yerlesik_aylar(self) -> Set[str]:
+        """Bellekte sürekli tutulacak son ayları hesapla"""
+        bugun = datetime.now()
+        yil, ay = bugun.year, bugun.month
+        aylar = set()
+        for _ in range(max(1, self.yerlesik_ay_sayisi)):
+            aylar.add(f"{yil:04d}-{ay:02d}")
+            ay -= 1
+            if ay == 0:
+                yil, ay = yil - 1, 12
+        return aylar
+    
+    def _pencereyi_kaydir(self):
+        """Yerleşik pencereden çıkan ayları LRU önbelleğe devret"""
+        yeni = self._yerlesik_aylar()
+        for ay in sorted(self._yerlesik - yeni):
+            if ay in self._bolumler:
+                self._onbellek[ay] = None
+        self._yerlesik = yeni
+        self._onbellegi_kirp()
+    
+    def _bolum_oku(self, ay: str) -> List[Dict]:
+        """Bölüm dosyasını önbelleğe almadan oku"""
+        try:
+            with open(self._bolum_dosyasi(ay), 'r', encoding='utf-8') as f:
+                return json.load(f).get("gorusmeler", [])
+        except Exception as e:
+            print(f"Görüşme bölümü {ay} yüklenirken hata: {e}")
+            return []
+    
+    def _bolum_getir(self, ay: str, olustur: bool = False, veri: Optional[List[Dict]] = None) -> Optional[List[Dict]]:
+        """Bölümü bellekten getir; yoksa diskten yükleyip indeksle"""
+        bolum = self._bolumler.get(ay)
+        if bolum is not None:
+            if ay in self._onbellek:
+                self._onbellek.move_to_end(ay)
+            return bolum
+        
+        if ay in self._aylar:
+            bolum = veri if veri is not None else self._bolum_oku(ay)
+        elif olustur:
+            bolum = []
+            self._aylar.add(ay)
+        else:
+            return None
+        
+        self._bolumler[ay] = bolum
+        for gorusme in bolum:
+            self._indekse_ekle(gorusme)
+            self._arama_indeksi.gorusme_ekle(gorusme)
+        if ay not in self._yerlesik:
+            self._onbellek[ay] = None
+            self._onbellegi_kirp()
+        return bolum
+    
+    def _onbellegi_kirp(self):
+        """Önbellekteki eski bölümleri sınırı aşınca en az kullanılandan başlayarak bellekten çıkar"""
+        fazla = len(self._onbellek) - self.onbellek_bolum_sayisi
+        # En son kullanılan bölüm, yüklendiği çağrı onu kullanabilsin diye çıkarılmaz
+        for ay in list(self._onbellek)[:-1]:
+            if fazla <= 0:
+                break
+            # Diske yazılmamış değişiklik taşıyan bölüm çıkarılmaz
+            if ay in self._kirli_bolumler or ay in self._yazilan_bolumler:
+                continue
+            del self._onbellek[ay]
+            for gorusme in self._bolumler.pop(ay):
+                self._indeksten_cikar(gorusme)
+                self._arama_indeksi.gorusme_cikar(gorusme["id"])
+            fazla -= 1
+    
+    def _yeniden_eskiye(self, aylar: List[str]) -> Iterator[Dict]:
+        """Verilen aylardaki görüşmeleri (gerekirse yükleyerek) en yeniden eskiye dolaş"""
+        for ay in sorted(aylar, reverse=True):
+            bolum = self._bolum_getir(ay)
+            if bolum:
+                yield from sorted(bolum, key=lambda x: x["baslangic_zamani"], reverse=True)
+    
+    def _indeksleri_kur(self):
+        """id → görüşme, telefon → görüşme id'leri ve arama indekslerini boş olarak kur
+        
+        İndeksler yalnızca bellekteki bölümleri kapsar; bölüm yüklenince
+        eklenir, bellekten çıkınca silinir.
+        """
+        self._id_indeksi: Dict[str, Dict] = {}
+        self._telefon_indeksi: Dict[str, List[str]] = {}
+        self._arama_indeksi = AramaIndeksi()
+    
+    def _indekse_ekle(self, gorusme: Dict):
+        self._id_indeksi[gorusme["id"]] = gorusme
+        self._telefon_indeksi.setdefault(gorusme["telefon"], []).append(gorusme["id"])
+    
+    def _indeksten_cikar(self, gorusme: Dict):
+        self._id_indeksi.pop(gorusme["id"], None)
+        idler = self._telefon_indeksi.get(gorusme["telefon"])
+        if idler:
+            idler.remove(gorusme["id"])
+            if not idler:
+                del self._telefon_indeksi[gorusme["telefon"]]
+    
+    def _gorusme_bul(self, gorusme_id: str) -> Optional[Dict]:
+        if not gorusme_id:
+            return None
+        gorusme = self._id_indeksi.get(gorusme_id)
+        if gorusme is not None:
+            return gorusme
+        # Bellekte olmayan eski görüşme (düzenleme / silme gibi nadir durumlar): yalnızca kendi bölümü yüklenir
+        ay = self._gorusme_aylari.get(gorusme_id)
+        if ay is None or ay in self._bolumler:
+            return None
+        self._bolum_getir(ay)
+        return self._id_indeksi.get(gorusme_id)
+    
+    def _telefon_gorusmeleri(self, telefon: str) -> List[Dict]:
+        return [self._id_indeksi[gorusme_id] for gorusme_id in self._telefon_indeksi.get(telefon, [])]
+    
+    def _musteri_gorusmeleri(self, telefon: str, limit: Optional[int] = None) -> List[Dict]:
+        """Müşterinin görüşmelerini en yeniden eskiye, gereken eski bölümleri yükleyerek getir"""
+        profil = self.indeks["musteri_profilleri"].get(telefon)
+        if profil:
+            ilk, son = profil["ilk_gorusme"][:7], profil["son_gorusme"][:7]
+            aylar = [ay for ay in self._aylar if ilk <= ay <= son]
+        else:
+            aylar = list(self._bolumler)
+        
+        sonuclar = []
+        for ay in sorted(aylar, reverse=True):
+            self._bolum_getir(ay)
+            ay_gorusmeleri = [g for g in self._telefon_gorusmeleri(telefon) if g["baslangic_zamani"].startswith(ay)]
+            sonuclar.extend(sorted(ay_gorusmeleri, key=lambda x: x["baslangic_zamani"], reverse=True))
+            if limit is not None and len(sonuclar) >= limit:
+                break
+        return sonuclar[:limit]
+    
+    def gorusme_getir(self, gorusme_id: str) -> Optional[Dict]:
+        """Görüşmeyi id ile getir"""
+        with self._kilit:
+            return self._gorusme_bul(gorusme_id)
+    
+    @staticmethod
+    def _katki_uygula(indeks: Dict, gorusme: Dict, isaret: int):
+        """Görüşmenin istatistiklere katkısını ekle (+1) ya da çıkar (-1)"""
+        istatistik = indeks["kategori_istatistikleri"]
+        durum_sayilari = indeks["durum_sayilari"]
+        gun_kovalari = indeks["gun_kovalari"]
+        # İndeks JSON'a yazıldığı için None kategori anahtar olarak kullanılmaz
+        kategori = gorusme.get("kategori") or "Bilinmiyor"
+        sure = gorusme.get("sure", 0) or 0
+        
+        kategori_sayilari = istatistik["kategori_sayilari"]
+        kategori_sureleri = istatistik["kategori_sureleri"]
+        kategori_sayilari[kategori] = kategori_sayilari.get(kategori, 0) + isaret
+        kategori_sureleri[kategori] = kategori_sureleri.get(kategori, 0) + isaret * sure
+        if kategori_sayilari[kategori] <= 0:
+            del kategori_sayilari[kategori]
+            del kategori_sureleri[kategori]
+        
+        durum = gorusme["durum"]
+        durum_sayilari[durum] = durum_sayilari.get(durum, 0) + isaret
+        istatistik["toplam_gorusme"] += isaret
+        istatistik["aktif_gorusme"] = durum_sayilari.get("aktif", 0)
+        istatistik["tamamlanan_gorusme"] = durum_sayilari.get("tamamlandi", 0)
+        
+        # baslangic_zamani ISO biçiminde olduğu için ilk 10 karakter tarihtir
+        gun = gorusme["baslangic_zamani"][:10]
+        kova = gun_kovalari.setdefault(gun, {"gorusme": 0, "sure": 0, "cozulme": 0, "kategoriler": {}})
+        kova["gorusme"] += isaret
+        kova["sure"] += isaret * sure
+        if gorusme.get("cozulme_durumu") == "cozuldu":
+            kova["cozulme"] += isaret
+        if gorusme.get("kategori"):
+            kova["kategoriler"][kategori] = kova["kategoriler"].get(kategori, 0) + isaret
+            if kova["kategoriler"][kategori] <= 0:
+                del kova["kategoriler"][kategori]
+        if kova["gorusme"] <= 0:
+            del gun_kovalari[gun]
+        
+        profiller = indeks.get("musteri_profilleri")
+        if profiller is not None:
+            GelismisGecmisGorusmeler._profil_katkisi(profiller, gorusme, isaret, kategori, sure)
+    
+    @staticmethod
+    def _profil_katkisi(profiller: Dict, gorusme: Dict, isaret: int, kategori: str, sure: float):
+        """Görüşmenin müşteri profiline katkısını ekle ya da çıkar
+        
+        İlk / son çağrı, müşteri geçmişindeki gibi görülen en eski / en yeni
+        çağrıdır; silme ile geri alınmaz. Günlük kovalar yalnızca son
+        PROFIL_GUN_PENCERESI gün için tutulur.
+        """
+        telefon = gorusme["telefon"]
+        baslangic = gorusme["baslangic_zamani"]
+        profil = profiller.get(telefon)
+        if profil is None:
+            if isaret < 0:
+                return
+            profil = profiller[telefon] = {
+                "ilk_gorusme": baslangic,
+                "son_gorusme": baslangic,
+                "toplam_gorusme": 0,
+                "toplam_sure": 0,
+                "kategori_sayilari": {},
+                "kategori_sureleri": {},
+                "gun_kovalari": {},
+            }
+        
+        profil["toplam_gorusme"] += isaret
+        profil["toplam_sure"] += isaret * sure
+        if profil["toplam_gorusme"] <= 0:
+            del profiller[telefon]
+            return
+        
+        kategori_sayilari = profil["kategori_sayilari"]
+        kategori_sureleri = profil["kategori_sureleri"]
+        kategori_sayilari[kategori] = kategori_sayilari.get(kategori, 0) + isaret
+        kategori_sureleri[kategori] = kategori_sureleri.get(kategori, 0) + isaret * sure
+        if kategori_sayilari[kategori] <= 0:
+            del kategori_sayilari[kategori]
+            del kategori_sureleri[kategori]
+        
+        if isaret > 0:
+            profil["ilk_gorusme"] = min(profil["ilk_gorusme"], baslangic)
+            profil["son_gorusme"] = max(profil["son_gorusme"], baslangic)
+        
+        sinir = (datetime.now().date() - timedelta(days=PROFIL_GUN_PENCERESI)).isoformat()
+        kovalar = profil["gun_kovalari"]
+        gun = baslangic[:10]
+        if gun >= sinir:
+            kovalar[gun] = kovalar.get(gun, 0) + isaret
+            if kovalar[gun] <= 0:
+                del kovalar[gun]
+        if isaret > 0:
+            # Pencereden çıkan günleri at
+            for eski_gun in [g for g in kovalar if g < sinir]:
+                del kovalar[eski_gun]
+    
+    def _profilleri_olustur(self):
+        """Müşteri profillerini diskteki bölümlerden sıfırdan kur"""
+        hedef = {"musteri_profilleri": {}}
+        for ay in sorted(self._aylar):
+            for gorusme in self._bolum_oku(ay):
+                self._profil_katkisi(hedef["musteri_profilleri"], gorusme, 1,
+                                     gorusme.get("kategori") or "Bilinmiyor", gorusme.get("sure", 0) or 0)
+        self.indeks["musteri_profilleri"] = hedef["musteri_profilleri"]
+    
+    def _gorusme_aylarini_yukle(self):
+        """Görüşme id → ay eşlemesini yan dosyadan yükle; dosya yoksa bir kez kur"""
+        # Eşlemeyi indeksin içinde tutan eski sürüm: bir sonraki sıkıştırmada indeksten düşer
+        eski = self.indeks.pop("gorusme_aylari", None)
+        if not self.aylar_dosyasi.exists():
+            if eski is None:
+                eski = {gorusme["id"]: ay for ay in sorted(self._aylar) for gorusme in self._bolum_oku(ay)}
+            self._aylar_dosyasini_yaz(eski)
+            self._gorusme_aylari = dict(eski)
+            return
+        self._aylar_satir_sayisi = 0
+        with open(self.aylar_dosyasi, 'r', encoding='utf-8') as f:
+            for satir in f:
+                try:
+                    kayit = json.loads(satir)
+                except json.JSONDecodeError:
+                    # Yarım yazılmış son satır
+                    continue
+                self._aylar_satir_sayisi += 1
+                if kayit["ay"] is None:
+                    self._gorusme_aylari.pop(kayit["id"], None)
+                else:
+                    self._gorusme_aylari[kayit["id"]] = kayit["ay"]
+    
+    def _aylar_dosyasini_yaz(self, gorusme_aylari: Dict[str, str]) -> bool:
+        """Eşlemenin tamamını yan dosyaya atomik olarak yaz"""
+        gecici = self.aylar_dosyasi.with_suffix(".jsonl.tmp")
+        try:
+            with open(gecici, 'w', encoding='utf-8') as f:
+                for gorusme_id, ay in gorusme_aylari.items():
+                    f.write(json.dumps({"id": gorusme_id, "ay": ay}, ensure_ascii=False) + "\n")
+            os.replace(gecici, self.aylar_dosyasi)
+            self._aylar_satir_sayisi = len(gorusme_aylari)
+            return True
+        except Exception as e:
+            print(f"Görüşme ay eşlemesi yazılırken hata: {e}")
+            return False
+    
+    def _aylar_dosyasina_ekle(self, degisiklikler: Dict[str, Optional[str]]) -> bool:
+        """Son sıkıştırmadan beri değişen eşlemeleri yan dosyaya ekle (silinen: ay None)"""
+        if not degisiklikler:
+            return True
+        try:
+            with open(self.aylar_dosyasi, 'a', encoding='utf-8') as f:
+                f.write("".join(json.dumps({"id": gorusme_id, "ay": ay}, ensure_ascii=False) + "\n"
+                                for gorusme_id, ay in degisiklikler.items()))
+            self._aylar_satir_sayisi += len(degisiklikler)
+            return True
+        except Exception as e:
+            print(f"Görüşme ay eşlemesi yazılırken hata: {e}")
+            return False
+    
+    def _ay_ata(self, gorusme_id: str, ay: str):
+        self._gorusme_aylari[gorusme_id] = ay
+        self._ay_degisiklikleri[gorusme_id] = ay
+    
+    def _ay_sil(self, gorusme_id: str):
+        if self._gorusme_aylari.pop(gorusme_id, None) is not None:
+            self._ay_degisiklikleri[gorusme_id] = None
+    
+    def _istatistik_katkisi(self, gorusme: Dict, isaret: int):
+        self._katki_uygula(self.indeks, gorusme, isaret)
+    
+    def _istatistikleri_hesapla(self) -> Dict:
+        """İstatistikleri tüm bölümler üzerinden, bölümleri tek tek okuyarak sıfırdan hesapla"""
+        # Silinen görüşmeler bölümlerde olmadığı için arşivlenmiş katkıdan başlanır
+        hedef = copy.deepcopy(self.indeks["arsiv_istatistikleri"])
+        for ay in sorted(self._aylar):
+            bolum = self._bolumler.get(ay)
+            if bolum is None:
+                bolum = self._bolum_oku(ay)
+            for gorusme in bolum:
+                self._katki_uygula(hedef, gorusme, 1)
+        return hedef
+    
+    def istatistik_tutarliligi_kontrol(self, duzelt: bool = True, tolerans: float = 1e-6) -> List[str]:
+        """Artımlı istatistikleri sıfırdan hesaplananla karşılaştır; farkları döndür
+        
+        Süreler ondalıklı toplandığı için `tolerans` kadar fark yok sayılır.
+        `duzelt` açıksa fark bulunduğunda istatistikler yeniden kurulur.
+        """
+        def esit(a, b) -> bool:
+            if isinstance(a, dict) and isinstance(b, dict):
+                return a.keys() == b.keys() and all(esit(a[k], b[k]) for k in a)
+            if isinstance(a, (int, float)) and isinstance(b, (int, float)):
+                return abs(a - b) <= tolerans
+            return a == b
+        
+        with self._kilit:
+            hedef = self._istatistikleri_hesapla()
+            istatistik = hedef["kategori_istatistikleri"]
+            farklar = [
+                anahtar for anahtar in istatistik
+                if not esit(istatistik[anahtar], self.indeks["kategori_istatistikleri"].get(anahtar))
+            ]
+            if not esit(hedef["durum_sayilari"], self.indeks["durum_sayilari"]):
+                farklar.append("durum_sayilari")
+            kovalar = hedef["gun_kovalari"]
+            farklar += [f"gun:{gun}" for gun in kovalar.keys() | self.indeks["gun_kovalari"].keys()
+                        if not esit(kovalar.get(gun), self.indeks["gun_kovalari"].get(gun))]
+            if farklar and duzelt:
+                for anahtar in ("kategori_istatistikleri", "durum_sayilari", "gun_kovalari"):
+                    self.indeks[anahtar] = hedef[anahtar]
+        return farklar
+    
+    @staticmethod
+    def _ozetle(gorusme: Dict):
+        """Görüşmenin mesajlarını kısa bir özetle değiştir (yerinde)"""
+        mesajlar = gorusme.get("mesajlar", [])
+        musteri_mesajlari = [m for m in mesajlar if m.get("gonderen") == "Müşteri"]
+        gorusme["ozet"] = {
+            "mesaj_sayisi": len(mesajlar),
+            "musteri_mesaj_sayisi": len(musteri_mesajlari),
+            "ilk_musteri_mesaji": musteri_mesajlari[0]["mesaj"][:200] if musteri_mesajlari else "",
+            "son_mesaj_zamani": mesajlar[-1].get("zaman") if mesajlar else None,
+        }
+        gorusme["mesajlar"] = []
+    
+    def saklama_politikasi_uygula(self, tam_metin_gun: Optional[int] = None, kayit_gun: Optional[int] = None,
+                                  simdi: Optional[datetime] = None, kuru: bool = False) -> Dict:
+        """Saklama politikasını uygula ve kazanılan alanı raporla
+        
+        `tam_metin_gun` günden eski görüşmelerin mesajları arşive yazılıp
+        özetle değiştirilir; `kayit_gun` günden eski görüşmeler tamamen
+        arşive taşınır. Aktif görüşmelere dokunulmaz. Müşteri geçmişi ve genel
+        istatistikler korunur. `kuru` açıksa hiçbir şey yazılmaz, yalnızca
+        ne kazanılacağı hesaplanır.
+        """
+        tam_metin_gun = GECMIS_CONFIG['tam_metin_gun'] if tam_metin_gun is None else tam_metin_gun
+        kayit_gun = GECMIS_CONFIG['kayit_gun'] if kayit_gun is None else kayit_gun
+        simdi = simdi or datetime.now()
+        ozet_siniri = (simdi - timedelta(days=tam_metin_gun)).isoformat()
+        silme_siniri = (simdi - timedelta(days=kayit_gun)).isoformat()
+        
+        rapor = {"ozetlenen": 0, "silinen": 0, "kazanilan_bayt": 0, "arsiv_bayt": 0, "bolumler": []}
+        with self._kilit:
+            aylar = sorted(ay for ay in self._aylar if ay <= ozet_siniri[:7])
+        for ay in aylar:
+            if self._saklama_durdur.is_set() and not kuru:
+                break
+            self._bolumu_sakla(ay, ozet_siniri, silme_siniri, simdi, kuru, rapor)
+        return rapor
+    
+    def _bolumu_sakla(self, ay: str, ozet_siniri: str, silme_siniri: str, simdi: datetime, kuru: bool, rapor: Dict):
+        dosya = self._bolum_dosyasi(ay)
+        onceki_boyut = dosya.stat().st_size if dosya.exists() else 0
+        
+        with self._kilit:
+            bolum = self._bolumler.get(ay)
+            if bolum is None:
+                bolum = self._bolum_oku(ay)
+            silinecek, ozetlenecek = set(), set()
+            arsiv_satirlari = []
+            for gorusme in bolum:
+                if gorusme["durum"] == "aktif" or gorusme["baslangic_zamani"] >= ozet_siniri:
+                    continue
+                if gorusme["baslangic_zamani"] < silme_siniri:
+                    islem = "silindi"
+                    silinecek.add(gorusme["id"])
+                elif not gorusme.get("ozet"):
+                    islem = "ozetlendi"
+                    ozetlenecek.add(gorusme["id"])
+                else:
+                    continue
+                arsiv_satirlari.append(json.dumps(
+                    {"islem": islem, "zaman": simdi.isoformat(), "gorusme": gorusme}, ensure_ascii=False
+                ))
+            if not arsiv_satirlari:
+                return
+            
+            if kuru:
+                kalan = []
+                for gorusme in bolum:
+                    if gorusme["id"] in silinecek:
+                        continue
+                    if gorusme["id"] in ozetlenecek:
+                        gorusme = copy.deepcopy(gorusme)
+                        self._ozetle(gorusme)
+                    kalan.append(gorusme)
+                sonraki_boyut = len(json.dumps({"ay": ay, "gorusmeler": kalan}, ensure_ascii=False, indent=2).encode("utf-8"))
+        
+        if not kuru:
+            # Önce arşiv yazılır; yarıda kalırsa bir sonraki çalıştırma aynı kayıtları yeniden arşivler
+            self.arsiv_dizini.mkdir(parents=True, exist_ok=True)
+            arsiv = self.arsiv_dizini / f"{ay}.jsonl.gz"
+            arsiv_onceki = arsiv.stat().st_size if arsiv.exists() else 0
+            with gzip.open(arsiv, "at", encoding="utf-8") as f:
+                f.write("\n".join(arsiv_satirlari) + "\n")
+            rapor["arsiv_bayt"] += arsiv.stat().st_size - arsiv_onceki
+            
+            with self._kilit:
+                # Yüklenirken önbellekten düşmesin diye bölüm önce kirli işaretlenir
+                self._kirli_bolumler.add(ay)
+                bolum = self._bolum_getir(ay)
+                kalan = []
+                for gorusme in bolum:
+                    if gorusme["id"] in silinecek:
+                        self._indeksten_cikar(gorusme)
+                        self._arama_indeksi.gorusme_cikar(gorusme["id"])
+                        # Genel istatistik değişmez; katkı arşiv istatistiklerine devredilir
+                        self._katki_uygula(self.indeks["arsiv_istatistikleri"], gorusme, 1)
+                        self._ay_sil(gorusme["id"])
+                        continue
+                    if gorusme["id"] in ozetlenecek:
+                        self._ozetle(gorusme)
+                        self._arama_indeksi.gorusme_ekle(gorusme)
+                    kalan.append(gorusme)
+                bolum[:] = kalan
+            self.sikistir()
+            self._bos_bolumu_kaldir(ay)
+            sonraki_boyut = dosya.stat().st_size if dosya.exists() else 0
+        
+        rapor["ozetlenen"] += len(ozetlenecek)
+        rapor["silinen"] += len(silinecek)
+        rapor["kazanilan_bayt"] += onceki_boyut - sonraki_boyut
+        rapor["bolumler"].append(ay)
+    
+    def _bos_bolumu_kaldir(self, ay: str):
+        """Tamamen boşalmış eski bölümün dosyasını sil"""
+        with self._kilit:
+            bolum = self._bolumler.get(ay)
+            if bolum or ay in self._yerlesik or ay in self._kirli_bolumler or ay in self._yazilan_bolumler:
+                return
+            with self._dosya_kilidi:
+                self._bolum_dosyasi(ay).unlink(missing_ok=True)
+            self._aylar.discard(ay)
+            self._arsiv_indeksleri.pop(ay, None)
+            self._bolumler.pop(ay, None)
+            self._onbellek.pop(ay, None)
+    
+    def _saklama_dongusu(self, aralik: float):
+        while not self._saklama_durdur.wait(aralik):
+            try:
+                rapor = self.saklama_politikasi_uygula()
+                if rapor["bolumler"]:
+                    print(f"♻️ Saklama politikası: {rapor['ozetlenen']} özetlendi, {rapor['silinen']} silindi, "
+                          f"{rapor['kazanilan_bayt'] / 1024:.1f} KB kazanıldı")
+            except Exception as e:
+                print(f"Saklama politikası uygulanırken hata: {e}")
+    
+    def _olay_uygula(self, olay: Dict):
+        """Tek bir olayı bellekteki veriye uygula"""
+        tur = olay["tur"]
+        if tur == "basladi":
+            yeni_gorusme = olay["gorusme"]
+            telefon = yeni_gorusme["telefon"]
+            ay = yeni_gorusme["baslangic_zamani"][:7]
+            # Yüklenirken önbellekten düşmesin diye bölüm önce kirli işaretlenir
+            self._kirli_bolumler.add(ay)
+            self._bolum_getir(ay, olustur=True).append(yeni_gorusme)
+            self._ay_ata(yeni_gorusme["id"], ay)
+            self._indekse_ekle(yeni_gorusme)
+            self._arama_indeksi.gorusme_ekle(yeni_gorusme)
+            self._istatistik_katkisi(yeni_gorusme, 1)
+            
+            # Müşteri geçmişini güncelle
+            if telefon not in self.indeks["musteri_gecmis"]:
+                self.indeks["musteri_gecmis"][telefon] = {
+                    "musteri_adi": yeni_gorusme["musteri_adi"],
+                    "ilk_gorusme": yeni_gorusme["baslangic_zamani"],
+                    "son_gorusme": yeni_gorusme["baslangic_zamani"],
+                    "toplam_gorusme": 0,
+                    "toplam_sure": 0,
+                    "kategoriler": {},
+                    "sorun_gecmisi": [],
+                }
+            
+            musteri_data = self.indeks["musteri_gecmis"][telefon]
+            musteri_data["toplam_gorusme"] += 1
+            musteri_data["son_gorusme"] = yeni_gorusme["baslangic_zamani"]
+            return
+        
+        gorusme = self._gorusme_bul(olay["id"])
+        if gorusme is None:
+            return
+        ay = gorusme["baslangic_zamani"][:7]
+        self._kirli_bolumler.add(ay)
+        
+        # Mesaj dışındaki olaylar istatistik alanlarını değiştirebilir:
+        # eski katkı çıkarılır, olay uygulanır, yeni katkı eklenir
+        if tur != "mesaj":
+            self._istatistik_katkisi(gorusme, -1)
+        
+        if tur == "mesaj":
+            mesaj_data = olay["mesaj"]
+            gorusme["mesajlar"].append(mesaj_data)
+            self._arama_indeksi.mesaj_ekle(gorusme["id"], mesaj_data["mesaj"])
+            
+            # Kategori geçmişini güncelle
+            kategori = mesaj_data.get("kategori")
+            if kategori and kategori not in gorusme["kategori_gecmisi"]:
+                gorusme["kategori_gecmisi"].append(kategori)
+        
+        elif tur == "kategori":
+            kategori = olay["kategori"]
+            gorusme["kategori"] = kategori
+            if kategori not in gorusme["kategori_gecmisi"]:
+                gorusme["kategori_gecmisi"].append(kategori)
+            self._arama_indeksi.alanlari_guncelle(gorusme)
+        
+        elif tur == "bitti":
+            bitis_zamani = datetime.fromisoformat(olay["bitis_zamani"])
+            baslangic = datetime.fromisoformat(gorusme["baslangic_zamani"])
+            sure = (bitis_zamani - baslangic).total_seconds() / 60  # dakika
+            
+            gorusme["bitis_zamani"] = olay["bitis_zamani"]
+            gorusme["sure"] = round(sure, 2)
+            gorusme["durum"] = olay["durum"]
+            gorusme["cozulme_durumu"] = olay["cozulme_durumu"]
+            
+            # Müşteri geçmişini güncelle
+            telefon = gorusme["telefon"]
+            if telefon in self.indeks["musteri_gecmis"]:
+                musteri_data = self.indeks["musteri_gecmis"][telefon]
+                musteri_data["toplam_sure"] += sure
+                
+                # Kategori istatistiklerini güncelle
+                if gorusme["kategori"]:
+                    if gorusme["kategori"] not in musteri_data["kategoriler"]:
+                        musteri_data["kategoriler"][gorusme["kategori"]] = 0
+                    musteri_data["kategoriler"][gorusme["kategori"]] += 1
+        
+        elif tur == "guncellendi":
+            # id / telefon değişebileceği için indeks kaydı yenilenir
+            self._indeksten_cikar(gorusme)
+            self._arama_indeksi.gorusme_cikar(gorusme["id"])
+            self._ay_sil(gorusme["id"])
+            gorusme.update(olay["alanlar"])
+            yeni_ay = gorusme["baslangic_zamani"][:7]
+            self._ay_ata(gorusme["id"], yeni_ay)
+            if yeni_ay != ay:
+                # Başlangıç zamanı başka aya taşındıysa görüşme o bölüme geçer
+                self._bolumler[ay].remove(gorusme)
+                self._kirli_bolumler.add(yeni_ay)
+                self._bolum_getir(yeni_ay, olustur=True).append(gorusme)
+            self._indekse_ekle(gorusme)
+            self._arama_indeksi.gorusme_ekle(gorusme)
+        
+        elif tur == "silindi":
+            self._ay_sil(gorusme["id"])
+            self._indeksten_cikar(gorusme)
+            self._arama_indeksi.gorusme_cikar(gorusme["id"])
+            self._bolumler[ay].remove(gorusme)
+            return
+        
+        if tur != "mesaj":
+            self._istatistik_katkisi(gorusme, 1)
     
     def yeni_gorusme_baslat(self, telefon: str, musteri_adi: str, kategori: Optional[str] = None) -> str:
         """Yeni görüşme başlat"""
@@ -66,259 +1024,241 @@ class GelismisGecmisGorusmeler:
             "kategori": kategori,
             "mesajlar": [],
             "kategori_gecmisi": [],
-
+            
             "cozulme_durumu": "devam_ediyor",
             "oncelik": "normal",
             "etiketler": [],
             "notlar": ""
         }
         
-        self.gorusmeler["gorusmeler"].append(yeni_gorusme)
-        
-        # Müşteri geçmişini güncelle
-        if telefon not in self.gorusmeler["musteri_gecmis"]:
-            self.gorusmeler["musteri_gecmis"][telefon] = {
-                "musteri_adi": musteri_adi,
-                "ilk_gorusme": baslangic_zamani.isoformat(),
-                "son_gorusme": baslangic_zamani.isoformat(),
-                "toplam_gorusme": 0,
-                "toplam_sure": 0,
-                "kategoriler": {},
-                "sorun_gecmisi": [],
-
-
-            }
-        
-        musteri_data = self.gorusmeler["musteri_gecmis"][telefon]
-        musteri_data["toplam_gorusme"] += 1
-        musteri_data["son_gorusme"] = baslangic_zamani.isoformat()
-        
-        self._save_data()
+        self._olay_kaydet({"tur": "basladi", "gorusme": yeni_gorusme})
         return gorusme_id
     
     def gorusme_bitir(self, gorusme_id: str, durum: str = "tamamlandi", cozulme_durumu: str = "cozuldu"):
         """Görüşmeyi bitir"""
-        for gorusme in self.gorusmeler["gorusmeler"]:
-            if gorusme["id"] == gorusme_id:
-                bitis_zamani = datetime.now()
-                baslangic = datetime.fromisoformat(gorusme["baslangic_zamani"])
-                sure = (bitis_zamani - baslangic).total_seconds() / 60  # dakika
-                
-                gorusme["bitis_zamani"] = bitis_zamani.isoformat()
-                gorusme["sure"] = round(sure, 2)
-                gorusme["durum"] = durum
-
-                gorusme["cozulme_durumu"] = cozulme_durumu
-                
-                # Müşteri geçmişini güncelle
-                telefon = gorusme["telefon"]
-                if telefon in self.gorusmeler["musteri_gecmis"]:
-                    musteri_data = self.gorusmeler["musteri_gecmis"][telefon]
-                    musteri_data["toplam_sure"] += sure
-                    
-                    # Kategori istatistiklerini güncelle
-                    if gorusme["kategori"]:
-                        if gorusme["kategori"] not in musteri_data["kategoriler"]:
-                            musteri_data["kategoriler"][gorusme["kategori"]] = 0
-                        musteri_data["kategoriler"][gorusme["kategori"]] += 1
-                    
-
-                    
-                break
-        
-        self._istatistikleri_guncelle()
-        self._save_data()
+        with self._kilit:
+            if self._gorusme_bul(gorusme_id) is not None:
+                self._olay_kaydet({
+                    "tur": "bitti",
+                    "id": gorusme_id,
+                    "bitis_zamani": datetime.now().isoformat(),
+                    "durum": durum,
+                    "cozulme_durumu": cozulme_durumu
+                })
     
     def mesaj_ekle(self, gorusme_id: str, gonderen: str, mesaj: str, kategori: Optional[str] = None):
         """Mesaj ekle"""
-        for gorusme in self.gorusmeler["gorusmeler"]:
-            if gorusme["id"] == gorusme_id:
-                mesaj_data = {
+        with self._kilit:
+            if self._gorusme_bul(gorusme_id) is None:
+                return
+            self._olay_kaydet({
+                "tur": "mesaj",
+                "id": gorusme_id,
+                "mesaj": {
                     "zaman": datetime.now().isoformat(),
                     "gonderen": gonderen,
                     "mesaj": mesaj,
                     "kategori": kategori
                 }
-                gorusme["mesajlar"].append(mesaj_data)
-                
-                # Kategori geçmişini güncelle
-                if kategori and kategori not in gorusme["kategori_gecmisi"]:
-                    gorusme["kategori_gecmisi"].append(kategori)
-                
-                break
-        
-        self._save_data()
+            })
     
     def kategori_guncelle(self, gorusme_id: str, kategori: str):
         """Görüşme kategorisini güncelle"""
-        for gorusme in self.gorusmeler["gorusmeler"]:
-            if gorusme["id"] == gorusme_id:
-                gorusme["kategori"] = kategori
-                if kategori not in gorusme["kategori_gecmisi"]:
-                    gorusme["kategori_gecmisi"].append(kategori)
-                break
-        
-        self._save_data()
+        with self._kilit:
+            if self._gorusme_bul(gorusme_id) is None:
+                return
+            self._olay_kaydet({"tur": "kategori", "id": gorusme_id, "kategori": kategori})
     
     def musteri_gecmis_getir(self, telefon: str) -> Optional[Dict]:
         """Müşteri geçmişini getir"""
-        return self.gorusmeler["musteri_gecmis"].get(telefon)
+        return self.indeks["musteri_gecmis"].get(telefon)
     
     def musteri_gorusmeleri_getir(self, telefon: str, limit: int = 10) -> List[Dict]:
         """Müşterinin geçmiş görüşmelerini getir"""
-        musteri_gorusmeleri = [g for g in self.gorusmeler["gorusmeler"] if g["telefon"] == telefon]
-        musteri_gorusmeleri.sort(key=lambda x: x["baslangic_zamani"], reverse=True)
-        return musteri_gorusmeleri[:limit]
+        with self._kilit:
+            return self._musteri_gorusmeleri(telefon, limit)
     
     def musteri_kategori_analizi(self, telefon: str) -> Dict:
         """Müşteri kategori analizi"""
-        musteri_gorusmeleri = [g for g in self.gorusmeler["gorusmeler"] if g["telefon"] == telefon]
-        
-        kategori_sayilari = {}
-        kategori_sureleri = {}
-        
-        for gorusme in musteri_gorusmeleri:
-            kategori = gorusme.get("kategori", "Bilinmiyor")
-            sure = gorusme.get("sure", 0)
-            
-            if kategori not in kategori_sayilari:
-                kategori_sayilari[kategori] = 0
-                kategori_sureleri[kategori] = 0
-            
-            kategori_sayilari[kategori] += 1
-            kategori_sureleri[kategori] += sure
+        with self._kilit:
+            profil = self.indeks["musteri_profilleri"].get(telefon)
+            kategori_sayilari = dict(profil["kategori_sayilari"]) if profil else {}
+            kategori_sureleri = dict(profil["kategori_sureleri"]) if profil else {}
         
         return {
             "kategori_sayilari": kategori_sayilari,
             "kategori_sureleri": kategori_sureleri,
             "en_cok_gorusulen_kategori": max(kategori_sayilari.items(), key=lambda x: x[1])[0] if kategori_sayilari else "Yok",
-            "toplam_gorusme": len(musteri_gorusmeleri)
-        }
-    
-    def _istatistikleri_guncelle(self):
-        """Genel istatistikleri güncelle"""
-        gorusmeler = self.gorusmeler["gorusmeler"]
-        
-        # Kategori istatistikleri
-        kategori_sayilari = {}
-        kategori_sureleri = {}
-        
-        for gorusme in gorusmeler:
-            kategori = gorusme.get("kategori", "Bilinmiyor")
-            sure = gorusme.get("sure", 0)
-            
-            if kategori not in kategori_sayilari:
-                kategori_sayilari[kategori] = 0
-                kategori_sureleri[kategori] = 0
-            
-            kategori_sayilari[kategori] += 1
-            kategori_sureleri[kategori] += sure
-        
-        self.gorusmeler["kategori_istatistikleri"] = {
-            "kategori_sayilari": kategori_sayilari,
-            "kategori_sureleri": kategori_sureleri,
-            "toplam_gorusme": len(gorusmeler),
-            "aktif_gorusme": len([g for g in gorusmeler if g["durum"] == "aktif"]),
-            "tamamlanan_gorusme": len([g for g in gorusmeler if g["durum"] == "tamamlandi"]),
-
+            "toplam_gorusme": profil["toplam_gorusme"] if profil else 0
         }
     
     def istatistikleri_getir(self) -> Dict:
         """Genel istatistikleri getir"""
-        self._istatistikleri_guncelle()
-        return self.gorusmeler["kategori_istatistikleri"]
+        with self._kilit:
+            # Artımlı güncellenen sözlüklerin kopyası, okuyucu dolaşırken değişmesin
+            istatistik = dict(self.indeks["kategori_istatistikleri"])
+            istatistik["kategori_sayilari"] = dict(istatistik["kategori_sayilari"])
+            istatistik["kategori_sureleri"] = dict(istatistik["kategori_sureleri"])
+        return istatistik
     
     def son_gorusmeler_getir(self, limit: int = 20) -> List[Dict]:
         """Son görüşmeleri getir"""
-        gorusmeler = sorted(self.gorusmeler["gorusmeler"], 
-                           key=lambda x: x["baslangic_zamani"], reverse=True)
-        return gorusmeler[:limit]
+        with self._kilit:
+            gorusmeler = []
+            for gorusme in self._yeniden_eskiye(list(self._aylar)):
+                if len(gorusmeler) >= limit:
+                    break
+                gorusmeler.append(gorusme)
+            return gorusmeler
     
-    def gorusme_ara(self, arama_terimi: str) -> List[Dict]:
-        """Görüşme ara"""
-        sonuclar = []
-        arama_terimi = arama_terimi.lower()
+    def _arsiv_arama_indeksi(self, ay: str) -> Optional[AramaIndeksi]:
+        """Bellekte olmayan bölümün arama indeksini getir; dosya değiştiyse yeniden kur
         
-        for gorusme in self.gorusmeler["gorusmeler"]:
-            # Müşteri adı, telefon, kategori veya mesajlarda ara
-            kategori = gorusme.get("kategori", "")
-            kategori_str = str(kategori).lower() if kategori else ""
-            
-            if (arama_terimi in gorusme["musteri_adi"].lower() or
-                arama_terimi in gorusme["telefon"] or
-                arama_terimi in kategori_str or
-                any(arama_terimi in mesaj["mesaj"].lower() for mesaj in gorusme["mesajlar"])):
-                sonuclar.append(gorusme)
+        İndeks yalnızca token ağırlıklarını tutar, görüşmeler bellekte kalmaz.
+        En az kullanılan indeks `arsiv_indeks_sayisi` aşılınca atılır.
+        """
+        try:
+            mtime = self._bolum_dosyasi(ay).stat().st_mtime_ns
+        except OSError:
+            return None
+        with self._kilit:
+            kayit = self._arsiv_indeksleri.get(ay)
+            if kayit is not None and kayit[0] == mtime:
+                self._arsiv_indeksleri.move_to_end(ay)
+                return kayit[1]
+        indeks = AramaIndeksi()
+        for gorusme in self._bolum_oku(ay):
+            indeks.gorusme_ekle(gorusme)
+        with self._kilit:
+            self._arsiv_indeksleri[ay] = (mtime, indeks)
+            self._arsiv_indeksleri.move_to_end(ay)
+            while len(self._arsiv_indeksleri) > max(0, self.arsiv_indeks_sayisi):
+                self._arsiv_indeksleri.popitem(last=False)
+        return indeks
+    
+    def gorusme_ara(self, arama_terimi: str, limit: Optional[int] = None, arsiv_dahil: bool = True) -> List[Dict]:
+        """Görüşme ara
+        
+        Müşteri adı, telefon, kategori ve mesajlar ters indeksten önek
+        eşleşmesiyle aranır; sonuçlar puana, eşitlikte yeniliğe göre sıralanır.
+        
+        Boş arama görüşmeleri en yeniden eskiye döndürür. `limit` verilmezse
+        yalnızca bellekteki bölümler listelenir; verilirse eski bölümler sınır
+        dolana kadar sırayla yüklenir.
+        
+        Bellekte olmayan bölümler de aylık arama indeksleriyle aranır; yalnızca
+        eşleşme içeren bölümler yüklenir. `arsiv_dahil` kapalıysa yalnızca
+        bellekteki bölümlerde aranır.
+        """
+        with self._kilit:
+            if not arama_terimi or not arama_terimi.strip():
+                aylar = list(self._aylar) if arsiv_dahil and limit is not None else list(self._bolumler)
+                return list(islice(self._yeniden_eskiye(aylar), limit))
+            eslesmeler = self._arama_indeksi.ara(arama_terimi)
+            sonuclar = [(puan, self._id_indeksi[gorusme_id]) for gorusme_id, puan in eslesmeler]
+            arsiv_aylari = sorted(self._aylar - self._bolumler.keys(), reverse=True) if arsiv_dahil else []
+        
+        # Disk okumaları kilit dışında yapılır; eşleşen bölüm önbelleğe yüklenir
+        for ay in arsiv_aylari:
+            indeks = self._arsiv_arama_indeksi(ay)
+            ay_eslesmeleri = indeks.ara(arama_terimi) if indeks is not None else []
+            if not ay_eslesmeleri:
+                continue
+            veri = self._bolum_oku(ay)
+            with self._kilit:
+                bolum = {gorusme["id"]: gorusme for gorusme in self._bolum_getir(ay, veri=veri) or []}
+            sonuclar.extend((puan, bolum[gorusme_id]) for gorusme_id, puan in ay_eslesmeleri if gorusme_id in bolum)
         
-        return sonuclar
+        sonuclar.sort(key=lambda x: (x[0], x[1]["baslangic_zamani"]), reverse=True)
+        return [gorusme for _, gorusme in sonuclar[:limit]]
     
     def gorusme_sil(self, gorusme_id: str) -> bool:
         """Görüşme sil"""
-        for i, gorusme in enumerate(self.gorusmeler["gorusmeler"]):
-            if gorusme["id"] == gorusme_id:
-                del self.gorusmeler["gorusmeler"][i]
-                self._istatistikleri_guncelle()
-                self._save_data()
-                return True
-        return False
+        with self._kilit:
+            if self._gorusme_bul(gorusme_id) is None:
+                return False
+            self._olay_kaydet({"tur": "silindi", "id": gorusme_id})
+            return True
     
     def gorusme_guncelle(self, gorusme_id: str, **kwargs) -> bool:
         """Görüşme güncelle"""
-        for gorusme in self.gorusmeler["gorusmeler"]:
-            if gorusme["id"] == gorusme_id:
-                gorusme.update(kwargs)
-                self._save_data()
-                return True
-        return False
+        with self._kilit:
+            if self._gorusme_bul(gorusme_id) is None:
+                return False
+            self._olay_kaydet({"tur": "guncellendi", "id": gorusme_id, "alanlar": kwargs})
+            return True
     
     def gunluk_istatistikler(self) -> Dict:
         """Günlük istatistikler"""
-        bugun = datetime.now().date()
-        bugun_gorusmeleri = []
-        
-        for gorusme in self.gorusmeler["gorusmeler"]:
-            gorusme_tarihi = datetime.fromisoformat(gorusme["baslangic_zamani"]).date()
-            if gorusme_tarihi == bugun:
-                bugun_gorusmeleri.append(gorusme)
-        
-        return {
-            "bugun_gorusme": len(bugun_gorusmeleri),
-            "bugun_sure": sum(g.get("sure", 0) for g in bugun_gorusmeleri),
-            "bugun_kategoriler": {},
-            "bugun_cozulme": len([g for g in bugun_gorusmeleri if g["cozulme_durumu"] == "cozuldu"])
-        }
+        bugun = datetime.now().date().isoformat()
+        with self._kilit:
+            kova = self.indeks["gun_kovalari"].get(bugun, {"gorusme": 0, "sure": 0, "cozulme": 0, "kategoriler": {}})
+            return {
+                "bugun_gorusme": kova["gorusme"],
+                "bugun_sure": kova["sure"],
+                "bugun_kategoriler": dict(kova["kategoriler"]),
+                "bugun_cozulme": kova["cozulme"]
+            }
     
     def musteri_analizi(self, telefon: str) -> Dict:
-        """Detaylı müşteri analizi"""
-        musteri_gorusmeleri = [g for g in self.gorusmeler["gorusmeler"] if g["telefon"] == telefon]
-        
-        if not musteri_gorusmeleri:
-            return {}
+        """Detaylı müşteri analizi
         
-        # Zaman analizi
-        son_gorusme = max(musteri_gorusmeleri, key=lambda x: x["baslangic_zamani"])
-        ilk_gorusme = min(musteri_gorusmeleri, key=lambda x: x["baslangic_zamani"])
-        
-        son_gorusme_tarihi = datetime.fromisoformat(son_gorusme["baslangic_zamani"])
-        ilk_gorusme_tarihi = datetime.fromisoformat(ilk_gorusme["baslangic_zamani"])
+        Görüşmeler taranmaz; müşteri profilindeki artımlı toplamlardan üretilir.
+        """
+        with self._kilit:
+            profil = self.indeks["musteri_profilleri"].get(telefon)
+            if not profil:
+                return {}
+            toplam_gorusme = profil["toplam_gorusme"]
+            toplam_sure = profil["toplam_sure"]
+            ilk_gorusme, son_gorusme = profil["ilk_gorusme"], profil["son_gorusme"]
+            sinir = (datetime.now().date() - timedelta(days=PROFIL_GUN_PENCERESI)).isoformat()
+            son_30_gun = sum(sayi for gun, sayi in profil["gun_kovalari"].items() if gun >= sinir)
         
         # Kategori analizi
         kategori_analizi = self.musteri_kategori_analizi(telefon)
-        
+        ilk_gorusme_tarihi = datetime.fromisoformat(ilk_gorusme)
         
         return {
-            "toplam_gorusme": len(musteri_gorusmeleri),
-            "ilk_gorusme": ilk_gorusme_tarihi.isoformat(),
-            "son_gorusme": son_gorusme_tarihi.isoformat(),
+            "toplam_gorusme": toplam_gorusme,
+            "ilk_gorusme": ilk_gorusme,
+            "son_gorusme": son_gorusme,
             "musteri_yasi_gun": (datetime.now() - ilk_gorusme_tarihi).days,
-            "ortalama_gorusme_suresi": sum(g.get("sure", 0) for g in musteri_gorusmeleri) / len(musteri_gorusmeleri),
-            "toplam_gorusme_suresi": sum(g.get("sure", 0) for g in musteri_gorusmeleri),
+            "ortalama_gorusme_suresi": toplam_sure / toplam_gorusme,
+            "toplam_gorusme_suresi": toplam_sure,
             "kategori_analizi": kategori_analizi,
-
-
-            "son_30_gun_gorusme": len([g for g in musteri_gorusmeleri 
-                                      if (datetime.now() - datetime.fromisoformat(g["baslangic_zamani"])).days <= 30])
+            "son_30_gun_gorusme": son_30_gun
         }
 
 # Global instance
 gecmis_yoneticisi = GelismisGecmisGorusmeler()
+
+
+def main():
+    """Saklama politikası komut satırı
+
+    Kullanım:
+        python conversation_history.py saklama [tam_metin_gun] [kayit_gun]
+        python conversation_history.py saklama_kuru [tam_metin_gun] [kayit_gun]
+    """
+    if len(sys.argv) < 2 or sys.argv[1] not in ("saklama", "saklama_kuru"):
+        print(main.__doc__)
+        return
+
+    tam_metin_gun = int(sys.argv[2]) if len(sys.argv) > 2 else None
+    kayit_gun = int(sys.argv[3]) if len(sys.argv) > 3 else None
+    kuru = sys.argv[1] == "saklama_kuru"
+
+    rapor = gecmis_yoneticisi.saklama_politikasi_uygula(tam_metin_gun, kayit_gun, kuru=kuru)
+    print(f"{'🔍 Kuru çalıştırma' if kuru else '♻️ Saklama politikası uygulandı'}: "
+          f"{len(rapor['bolumler'])} bölüm")
+    print(f"📝 Özetlenen görüşme: {rapor['ozetlenen']}")
+    print(f"🗑️ Silinen görüşme: {rapor['silinen']}")
+    print(f"💾 Kazanılan alan: {rapor['kazanilan_bayt'] / 1024:.1f} KB")
+    if not kuru:
+        print(f"📦 Arşive yazılan: {rapor['arsiv_bayt'] / 1024:.1f} KB ({gecmis_yoneticisi.arsiv_dizini})")
+    gecmis_yoneticisi.kapat()
+
+
+if __name__ == "__main__":
+    main()
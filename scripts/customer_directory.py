@@ -0,0 +1,122 @@
+"""
+Müşteri Rehberi
+kullanici_faturalar.json dosyasını bir kez yükler ve müşterileri E.164
+(+90XXXXXXXXXX) numarasına göre hash indeksinde tutar. Dosyanın mtime'ı
+değiştiğinde JSON tek parça olduğu için dosyanın tamamı yeniden okunur ve
+indeks baştan kurulur; yeniden yükleme artımlı değildir. Kayıtlar eski
+indeksle karşılaştırılır, yalnızca değişmeyen kayıt nesneleri korunur.
+"""
+
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+try:
+    from config import KULLANICI_FATURALAR_FILE, MUSTERI_DEPOSU_CONFIG
+except ImportError:
+    KULLANICI_FATURALAR_FILE = Path(__file__).resolve().parent.parent / "data" / "kullanici_faturalar.json"
+    MUSTERI_DEPOSU_CONFIG = {'tur': 'json'}
+
+
+def e164_normalize(telefon) -> Optional[str]:
+    """Telefon numarasını +90XXXXXXXXXX biçimine getir"""
+    if not telefon:
+        return None
+    rakamlar = ''.join(filter(str.isdigit, str(telefon)))
+    if len(rakamlar) < 10:
+        return None
+    return '+90' + rakamlar[-10:]
+
+
+class MusteriRehberi:
+    """E.164 numara indeksli müşteri rehberi"""
+
+    def __init__(self, dosya: Path = KULLANICI_FATURALAR_FILE, kontrol_araligi: float = 1.0):
+        self.dosya = Path(dosya)
+        # mtime kontrolü en fazla bu aralıkla (saniye) yapılır
+        self.kontrol_araligi = kontrol_araligi
+
+        self._indeks: Dict[str, Dict] = {}
+        self._mtime: Optional[float] = None
+        self._son_kontrol = 0.0
+        self._kilit = threading.Lock()
+        self.yeniden_yukle()
+
+    def __len__(self) -> int:
+        return len(self._indeks)
+
+    def bul(self, telefon) -> Optional[Dict]:
+        """Numaraya ait müşteri kaydını O(1) getir"""
+        self._guncellik_kontrol()
+        anahtar = e164_normalize(telefon)
+        if anahtar is None:
+            return None
+        return self._indeks.get(anahtar)
+
+    def yeniden_yukle(self, zorla: bool = False) -> Dict:
+        """Dosya değiştiyse tamamını yeniden okuyup indeksi kur; eklenen/güncellenen/silinen sayılarını döndür"""
+        with self._kilit:
+            self._son_kontrol = time.monotonic()
+            try:
+                mtime = self.dosya.stat().st_mtime
+            except OSError as e:
+                print(f"Müşteri dosyası okunamadı: {e}")
+                return {"eklenen": 0, "guncellenen": 0, "silinen": 0}
+            if not zorla and mtime == self._mtime:
+                return {"eklenen": 0, "guncellenen": 0, "silinen": 0}
+
+            try:
+                with open(self.dosya, "r", encoding="utf-8") as f:
+                    veriler = json.load(f)
+            except Exception as e:
+                print(f"Müşteri dosyası yüklenirken hata: {e}")
+                return {"eklenen": 0, "guncellenen": 0, "silinen": 0}
+
+            yeni_indeks = {}
+            eklenen = guncellenen = 0
+            for kullanici in veriler:
+                anahtar = e164_normalize(kullanici.get("numara"))
+                if anahtar is None:
+                    continue
+                eski = self._indeks.get(anahtar)
+                if eski is None:
+                    eklenen += 1
+                elif eski != kullanici:
+                    guncellenen += 1
+                else:
+                    # Değişmeyen kaydın mevcut nesnesini koru
+                    kullanici = eski
+                yeni_indeks[anahtar] = kullanici
+
+            silinen = len(self._indeks.keys() - yeni_indeks.keys())
+            # Okuyucular kilitsiz okuduğu için sözlük tek adımda değiştirilir
+            self._indeks = yeni_indeks
+            self._mtime = mtime
+            return {"eklenen": eklenen, "guncellenen": guncellenen, "silinen": silinen}
+
+    def _guncellik_kontrol(self):
+        if time.monotonic() - self._son_kontrol < self.kontrol_araligi:
+            return
+        try:
+            mtime = self.dosya.stat().st_mtime
+        except OSError:
+            return
+        if mtime != self._mtime:
+            self.yeniden_yukle()
+        else:
+            self._son_kontrol = time.monotonic()
+
+
+def musteri_deposu_olustur(tur: Optional[str] = None):
+    """Yapılandırmaya göre müşteri deposunu oluştur (json / sqlite)"""
+    tur = tur or MUSTERI_DEPOSU_CONFIG['tur']
+    if tur == "sqlite":
+        from customer_store import SqliteMusteriDeposu
+        return SqliteMusteriDeposu()
+    return MusteriRehberi()
+
+
+# Global instance
+musteri_rehberi = musteri_deposu_olustur()
@@ -0,0 +1,243 @@
+"""
+SQLite Müşteri Deposu
+kullanici_faturalar.json kayıtlarını indeksli bir SQLite dosyasına akış
+halinde aktarır ve numara ile indeks üzerinden sorgulama sağlar.
+
+Kullanım:
+    python customer_store.py ice_aktar [json_dosyasi] [db_dosyasi]
+    python customer_store.py bul <numara>
+"""
+
+import json
+import os
+import queue
+import sqlite3
+import sys
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+from customer_directory import e164_normalize
+
+try:
+    from config import KULLANICI_FATURALAR_FILE, MUSTERI_DEPOSU_CONFIG
+except ImportError:
+    KULLANICI_FATURALAR_FILE = Path(__file__).resolve().parent.parent / "data" / "kullanici_faturalar.json"
+    MUSTERI_DEPOSU_CONFIG = {'tur': 'json', 'sqlite_dosyasi': KULLANICI_FATURALAR_FILE.with_name("musteriler.db"),
+                             'havuz_boyutu': 4, 'toplu_boyutu': 1000}
+
+SEMA = """
+CREATE TABLE IF NOT EXISTS musteriler (
+    numara TEXT PRIMARY KEY,
+    tc TEXT,
+    ad TEXT,
+    veri TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_musteriler_tc ON musteriler(tc);
+CREATE TABLE IF NOT EXISTS aylik_kullanim (
+    numara TEXT NOT NULL,
+    sira INTEGER NOT NULL,
+    ay TEXT,
+    konusma_dakika INTEGER,
+    sms INTEGER,
+    data_mb INTEGER,
+    odeme_tl REAL,
+    veri TEXT NOT NULL,
+    PRIMARY KEY (numara, sira)
+) WITHOUT ROWID;
+"""
+
+MUSTERI_SORGUSU = "SELECT veri FROM musteriler WHERE numara = ?"
+KULLANIM_SORGUSU = "SELECT veri FROM aylik_kullanim WHERE numara = ? ORDER BY sira"
+
+
+def json_dizisi_akisi(dosya: Path, parca_boyutu: int = 1 << 16) -> Iterator[Dict]:
+    """Büyük bir JSON dizisini tamamını belleğe almadan eleman eleman oku"""
+    cozucu = json.JSONDecoder()
+    tampon = ""
+    dizi_basladi = False
+    with open(dosya, "r", encoding="utf-8") as f:
+        while True:
+            parca = f.read(parca_boyutu)
+            tampon += parca
+            konum = 0
+            while True:
+                # Boşlukları, virgülleri ve dizi açılışını atla
+                while konum < len(tampon) and (tampon[konum].isspace() or tampon[konum] == ","
+                                               or (not dizi_basladi and tampon[konum] == "[")):
+                    if tampon[konum] == "[":
+                        dizi_basladi = True
+                    konum += 1
+                if konum < len(tampon) and tampon[konum] == "]":
+                    return
+                if konum >= len(tampon):
+                    break
+                try:
+                    eleman, son = cozucu.raw_decode(tampon, konum)
+                except json.JSONDecodeError:
+                    if not parca:
+                        raise
+                    break  # Eleman yarım kaldı, yeni parça bekle
+                yield eleman
+                konum = son
+            tampon = tampon[konum:]
+            if not parca:
+                return
+
+
+def _musteri_satiri(kullanici: Dict, numara: str) -> tuple:
+    veri = {k: v for k, v in kullanici.items() if k != "son_4_aylik_kullanim"}
+    return (numara, kullanici.get("tc"), kullanici.get("ad"), json.dumps(veri, ensure_ascii=False))
+
+
+def _kullanim_satirlari(kullanici: Dict, numara: str) -> List[tuple]:
+    satirlar = []
+    for sira, ay in enumerate(kullanici.get("son_4_aylik_kullanim", [])):
+        satirlar.append((
+            numara, sira, ay.get("ay"),
+            ay.get("konusma_dakika"), ay.get("sms"), ay.get("data_mb"), ay.get("odeme_tl"),
+            json.dumps(ay, ensure_ascii=False)
+        ))
+    return satirlar
+
+
+def _dosyalari_sil(db_dosyasi: Path):
+    for ek in ("", "-journal", "-wal", "-shm"):
+        try:
+            Path(f"{db_dosyasi}{ek}").unlink()
+        except FileNotFoundError:
+            pass
+
+
+def ice_aktar(json_dosyasi: Path = KULLANICI_FATURALAR_FILE,
+              db_dosyasi: Path = MUSTERI_DEPOSU_CONFIG['sqlite_dosyasi'],
+              toplu_boyutu: int = MUSTERI_DEPOSU_CONFIG['toplu_boyutu']) -> int:
+    """JSON müşteri dosyasını toplu INSERT'lerle SQLite'a aktar; aktarılan müşteri sayısını döndür
+
+    Veritabanı geçici dosyada kurulur ve yalnızca aktarım başarıyla bitince
+    yerine taşınır; yarım kalan aktarım mevcut veritabanını bozmaz. Aynı
+    numaraya normalize olan kayıtlarda sonuncusu geçerlidir.
+    """
+    db_dosyasi = Path(db_dosyasi)
+    db_dosyasi.parent.mkdir(parents=True, exist_ok=True)
+    gecici = db_dosyasi.with_name(db_dosyasi.name + ".tmp")
+    _dosyalari_sil(gecici)
+    baglanti = sqlite3.connect(str(gecici))
+    try:
+        # Geçici dosya başarısızlıkta silindiği için kurulum sırasında günlük tutulmaz
+        baglanti.execute("PRAGMA journal_mode=OFF")
+        baglanti.execute("PRAGMA synchronous=OFF")
+        baglanti.executescript(SEMA)
+
+        # numara -> (müşteri satırı, kullanım satırları); toplu içinde aynı numara tekrar ederse sonuncusu kalır
+        toplu: Dict[str, tuple] = {}
+
+        def bosalt():
+            with baglanti:
+                baglanti.executemany("INSERT OR REPLACE INTO musteriler VALUES (?, ?, ?, ?)",
+                                     [musteri for musteri, _ in toplu.values()])
+                baglanti.executemany("DELETE FROM aylik_kullanim WHERE numara = ?", [(numara,) for numara in toplu])
+                baglanti.executemany("INSERT INTO aylik_kullanim VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                                     [satir for _, kullanim in toplu.values() for satir in kullanim])
+            toplu.clear()
+
+        for kullanici in json_dizisi_akisi(Path(json_dosyasi)):
+            numara = e164_normalize(kullanici.get("numara"))
+            if numara is None:
+                continue
+            toplu.pop(numara, None)
+            toplu[numara] = (_musteri_satiri(kullanici, numara), _kullanim_satirlari(kullanici, numara))
+            if len(toplu) >= toplu_boyutu:
+                bosalt()
+        if toplu:
+            bosalt()
+
+        baglanti.execute("ANALYZE")
+        toplam = baglanti.execute("SELECT COUNT(*) FROM musteriler").fetchone()[0]
+        baglanti.execute("PRAGMA journal_mode=WAL")
+        baglanti.close()
+        os.replace(gecici, db_dosyasi)
+        return toplam
+    except BaseException:
+        baglanti.close()
+        _dosyalari_sil(gecici)
+        raise
+
+
+class SqliteMusteriDeposu:
+    """SQLite üzerinde indeksli müşteri sorgulama
+
+    Sorgular küçük bir bağlantı havuzundan servis edilir; her bağlantı kendi
+    hazırlanmış ifade önbelleğini (prepared statement) tutar.
+    """
+
+    def __init__(self, db_dosyasi: Path = MUSTERI_DEPOSU_CONFIG['sqlite_dosyasi'],
+                 havuz_boyutu: int = MUSTERI_DEPOSU_CONFIG['havuz_boyutu']):
+        self.db_dosyasi = Path(db_dosyasi)
+        if not self.db_dosyasi.exists():
+            print(f"Uyarı: Müşteri veritabanı bulunamadı, {KULLANICI_FATURALAR_FILE} içe aktarılıyor...")
+            ice_aktar(KULLANICI_FATURALAR_FILE, self.db_dosyasi)
+
+        self._havuz = queue.Queue()
+        for _ in range(havuz_boyutu):
+            baglanti = sqlite3.connect(str(self.db_dosyasi), check_same_thread=False, cached_statements=16)
+            self._havuz.put(baglanti)
+
+    @contextmanager
+    def _baglanti(self):
+        baglanti = self._havuz.get()
+        try:
+            yield baglanti
+        finally:
+            self._havuz.put(baglanti)
+
+    def __len__(self) -> int:
+        with self._baglanti() as baglanti:
+            return baglanti.execute("SELECT COUNT(*) FROM musteriler").fetchone()[0]
+
+    def bul(self, telefon) -> Optional[Dict]:
+        """Numaraya ait müşteri kaydını birincil anahtar indeksiyle getir"""
+        anahtar = e164_normalize(telefon)
+        if anahtar is None:
+            return None
+        with self._baglanti() as baglanti:
+            satir = baglanti.execute(MUSTERI_SORGUSU, (anahtar,)).fetchone()
+            if satir is None:
+                return None
+            kullanici = json.loads(satir[0])
+            kullanici["son_4_aylik_kullanim"] = [
+                json.loads(ay) for (ay,) in baglanti.execute(KULLANIM_SORGUSU, (anahtar,))
+            ]
+        return kullanici
+
+    def kapat(self):
+        """Havuzdaki bağlantıları kapat"""
+        while not self._havuz.empty():
+            self._havuz.get_nowait().close()
+
+
+def main():
+    """Ana fonksiyon"""
+    if len(sys.argv) < 2:
+        print(__doc__)
+        return
+
+    komut = sys.argv[1].lower()
+    if komut == "ice_aktar":
+        json_dosyasi = Path(sys.argv[2]) if len(sys.argv) > 2 else KULLANICI_FATURALAR_FILE
+        db_dosyasi = Path(sys.argv[3]) if len(sys.argv) > 3 else MUSTERI_DEPOSU_CONFIG['sqlite_dosyasi']
+        toplam = ice_aktar(json_dosyasi, db_dosyasi)
+        print(f"✅ {toplam} müşteri {db_dosyasi} dosyasına aktarıldı")
+    elif komut == "bul":
+        if len(sys.argv) < 3:
+            print("❌ Numara belirtilmedi!")
+            return
+        kullanici = SqliteMusteriDeposu().bul(sys.argv[2])
+        print(json.dumps(kullanici, ensure_ascii=False, indent=2) if kullanici else "❌ Müşteri bulunamadı")
+    else:
+        print(f"❌ Bilinmeyen komut: {komut}")
+        print(__doc__)
+
+
+if __name__ == "__main__":
+    main()
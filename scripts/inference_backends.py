@@ -0,0 +1,223 @@
+"""
+BERTurk Çıkarım Arka Uçları
+Sınıflandırıcı için PyTorch, ONNX Runtime ve int8 kuantize ONNX çalışma
+zamanlarını, ONNX dışa aktarma adımını ve etiket uyumu kontrolünü içerir.
+
+Kullanım:
+    python inference_backends.py disa_aktar
+    python inference_backends.py parite [onnx|onnx-int8]
+"""
+
+import hashlib
+import json
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+try:
+    from config import BERTURK_CAGRI_MODEL_DIR, BERTURK_ONNX_DIR, INFERENCE_CONFIG, MODEL_CONFIG, TRAIN_BERTURK_FILE
+except ImportError:
+    PROJECT_ROOT = Path(__file__).resolve().parent.parent
+    BERTURK_CAGRI_MODEL_DIR = PROJECT_ROOT / "models" / "berturk_cagri_model"
+    BERTURK_ONNX_DIR = PROJECT_ROOT / "models" / "berturk_cagri_model_onnx"
+    TRAIN_BERTURK_FILE = PROJECT_ROOT / "data" / "train_berturk.jsonl"
+    INFERENCE_CONFIG = {'calisma_zamani': 'torch'}
+    MODEL_CONFIG = {'max_length': 64}
+
+from intent_classifier import kodla
+
+try:
+    import onnxruntime as ort
+except ImportError:
+    ort = None
+
+ONNX_DOSYASI = "model.onnx"
+ONNX_INT8_DOSYASI = "model.int8.onnx"
+GIRDI_ADLARI = ["input_ids", "attention_mask", "token_type_ids"]
+
+
+class TorchCalistirici:
+    """Eager PyTorch fp32 çalışma zamanı"""
+    ad = "torch"
+    tensor_tipi = "pt"
+
+    def __init__(self, model_dir: Path = BERTURK_CAGRI_MODEL_DIR):
+        import torch
+        from transformers import BertForSequenceClassification
+        self._torch = torch
+        # Çıktıyı belirleyen dosyalar (önbellek imzası için)
+        self.model_dosyalari = sorted(p for desen in ("*.safetensors", "*.bin", "config.json")
+                                      for p in Path(model_dir).glob(desen))
+        self.model = BertForSequenceClassification.from_pretrained(str(model_dir))
+        self.model.eval()  # Değerlendirme moduna al
+
+    def logits(self, inputs) -> np.ndarray:
+        """Tokenize edilmiş girdiler için logit matrisini döndür"""
+        with self._torch.no_grad():
+            return self.model(**inputs).logits.numpy()
+
+
+class OnnxCalistirici:
+    """ONNX Runtime CPU çalışma zamanı (fp32 veya int8)"""
+    tensor_tipi = "np"
+
+    def __init__(self, model_dir: Path = BERTURK_ONNX_DIR, int8: bool = False):
+        if ort is None:
+            raise ImportError("onnxruntime kurulu değil. 'pip install onnxruntime' ile kurun.")
+        self.ad = "onnx-int8" if int8 else "onnx"
+        model_yolu = Path(model_dir) / (ONNX_INT8_DOSYASI if int8 else ONNX_DOSYASI)
+        if not model_yolu.exists():
+            raise FileNotFoundError(f"ONNX modeli bulunamadı: {model_yolu}. Önce 'disa_aktar' adımını çalıştırın.")
+        self.model_dosyalari = [model_yolu]
+        self.session = ort.InferenceSession(str(model_yolu), providers=["CPUExecutionProvider"])
+        self._girdi_adlari = {girdi.name for girdi in self.session.get_inputs()}
+
+    def logits(self, inputs) -> np.ndarray:
+        """Tokenize edilmiş girdiler için logit matrisini döndür"""
+        feed = {ad: np.asarray(deger, dtype=np.int64) for ad, deger in inputs.items() if ad in self._girdi_adlari}
+        return self.session.run(["logits"], feed)[0]
+
+
+CALISMA_ZAMANLARI = ("torch", "onnx", "onnx-int8")
+
+
+def calistirici_olustur(calisma_zamani: Optional[str] = None, model_dir: Path = BERTURK_CAGRI_MODEL_DIR,
+                        onnx_dir: Path = BERTURK_ONNX_DIR):
+    """Ada göre çıkarım arka ucunu oluştur (torch / onnx / onnx-int8)"""
+    calisma_zamani = calisma_zamani or INFERENCE_CONFIG['calisma_zamani']
+    if calisma_zamani == "torch":
+        return TorchCalistirici(model_dir)
+    if calisma_zamani == "onnx":
+        return OnnxCalistirici(onnx_dir, int8=False)
+    if calisma_zamani == "onnx-int8":
+        return OnnxCalistirici(onnx_dir, int8=True)
+    raise ValueError(f"Bilinmeyen çalışma zamanı: {calisma_zamani}. Seçenekler: {', '.join(CALISMA_ZAMANLARI)}")
+
+
+def model_imzasi(calistirici, model_dir: Path = BERTURK_CAGRI_MODEL_DIR) -> str:
+    """Arka uç adı, model dosyalarının boyut / değişiklik zamanı ve etiket kümesinden imza üret
+
+    Model yeniden eğitildiğinde ya da değiştirildiğinde imza değişir; eski
+    modelle üretilmiş kalıcı tahminler yüklenmez.
+    """
+    ozet = hashlib.sha256()
+    config_dosyasi = Path(model_dir) / "config.json"
+    for dosya in sorted(set(getattr(calistirici, "model_dosyalari", [])) | {config_dosyasi}):
+        try:
+            bilgi = Path(dosya).stat()
+        except OSError:
+            continue
+        ozet.update(f"{Path(dosya).name}:{bilgi.st_size}:{bilgi.st_mtime_ns};".encode("utf-8"))
+    try:
+        with open(config_dosyasi, "r", encoding="utf-8") as f:
+            etiketler = json.load(f).get("id2label", {})
+    except (OSError, ValueError):
+        etiketler = {}
+    ozet.update(json.dumps(etiketler, sort_keys=True, ensure_ascii=False).encode("utf-8"))
+    return f"{calistirici.ad}:{ozet.hexdigest()[:16]}"
+
+
+def onnx_disa_aktar(model_dir: Path = BERTURK_CAGRI_MODEL_DIR, cikti_dir: Path = BERTURK_ONNX_DIR) -> Tuple[Path, Path]:
+    """Modeli ONNX'e aktar ve dinamik int8 kuantize kopyasını yaz"""
+    import torch
+    from transformers import BertForSequenceClassification, BertTokenizer
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    model = BertForSequenceClassification.from_pretrained(str(model_dir))
+    model.eval()
+    tokenizer = BertTokenizer.from_pretrained(str(model_dir))
+
+    cikti_dir = Path(cikti_dir)
+    cikti_dir.mkdir(parents=True, exist_ok=True)
+    onnx_yolu = cikti_dir / ONNX_DOSYASI
+    int8_yolu = cikti_dir / ONNX_INT8_DOSYASI
+
+    ornek = tokenizer(["faturama itiraz etmek istiyorum"], return_tensors="pt")
+    dinamik_eksenler = {ad: {0: "batch", 1: "sequence"} for ad in GIRDI_ADLARI}
+    dinamik_eksenler["logits"] = {0: "batch"}
+
+    with torch.no_grad():
+        torch.onnx.export(
+            model,
+            tuple(ornek[ad] for ad in GIRDI_ADLARI),
+            str(onnx_yolu),
+            input_names=GIRDI_ADLARI,
+            output_names=["logits"],
+            dynamic_axes=dinamik_eksenler,
+            opset_version=14
+        )
+    quantize_dynamic(str(onnx_yolu), str(int8_yolu), weight_type=QuantType.QInt8)
+    return onnx_yolu, int8_yolu
+
+
+def egitim_metinlerini_yukle(veri_dosyasi: Path = TRAIN_BERTURK_FILE) -> List[str]:
+    """JSONL eğitim dosyasından cümleleri oku"""
+    metinler = []
+    with open(veri_dosyasi, "r", encoding="utf-8") as f:
+        for satir in f:
+            if satir.strip():
+                # Bazı satırlarda ayraç olarak bölünmez boşluk (\xa0) bulunuyor
+                metinler.append(json.loads(satir.replace("\xa0", " "))["text"])
+    return metinler
+
+
+def _etiketler(calistirici, tokenizer, metinler: List[str]) -> List[int]:
+    inputs = kodla(tokenizer, metinler, MODEL_CONFIG['max_length'], calistirici.tensor_tipi)
+    return np.asarray(calistirici.logits(inputs)).argmax(axis=1).tolist()
+
+
+def parite_kontrolu(calisma_zamani: str = "onnx-int8", veri_dosyasi: Path = TRAIN_BERTURK_FILE,
+                    model_dir: Path = BERTURK_CAGRI_MODEL_DIR, toplu_boyutu: int = 32) -> Dict:
+    """Seçilen arka ucun etiketlerini PyTorch referansıyla karşılaştır"""
+    from transformers import BertTokenizer
+
+    tokenizer = BertTokenizer.from_pretrained(str(model_dir))
+    referans = TorchCalistirici(model_dir)
+    aday = calistirici_olustur(calisma_zamani, model_dir)
+
+    metinler = egitim_metinlerini_yukle(veri_dosyasi)
+
+    uyusmayanlar = []
+    for i in range(0, len(metinler), toplu_boyutu):
+        parca = metinler[i:i + toplu_boyutu]
+        for metin, ref, tahmin in zip(parca, _etiketler(referans, tokenizer, parca), _etiketler(aday, tokenizer, parca)):
+            if ref != tahmin:
+                uyusmayanlar.append({"metin": metin, "torch": ref, calisma_zamani: tahmin})
+
+    return {
+        "calisma_zamani": calisma_zamani,
+        "ornek_sayisi": len(metinler),
+        "uyusan": len(metinler) - len(uyusmayanlar),
+        "uyum_orani": (len(metinler) - len(uyusmayanlar)) / len(metinler) if metinler else 1.0,
+        "uyusmayanlar": uyusmayanlar
+    }
+
+
+def main():
+    """Ana fonksiyon"""
+    if len(sys.argv) < 2:
+        print(__doc__)
+        return
+
+    komut = sys.argv[1].lower()
+    if komut == "disa_aktar":
+        onnx_yolu, int8_yolu = onnx_disa_aktar()
+        print(f"✅ ONNX modeli yazıldı: {onnx_yolu}")
+        print(f"✅ int8 kuantize model yazıldı: {int8_yolu}")
+    elif komut == "parite":
+        calisma_zamani = sys.argv[2] if len(sys.argv) > 2 else "onnx-int8"
+        sonuc = parite_kontrolu(calisma_zamani)
+        durum = "✅" if sonuc["uyum_orani"] >= 0.99 else "❌"
+        print(f"{durum} {calisma_zamani} etiket uyumu: {sonuc['uyusan']}/{sonuc['ornek_sayisi']} "
+              f"(%{sonuc['uyum_orani'] * 100:.2f})")
+        for ornek in sonuc["uyusmayanlar"][:10]:
+            print(f"   - {ornek}")
+    else:
+        print(f"❌ Bilinmeyen komut: {komut}")
+        print(__doc__)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Sınıflandırıcı Çıkarım Benchmark'ı
+train_berturk.jsonl üzerinde `max_length` ve `dinamik` (kovalı) padding
+modlarını toplu sınıflandırma servisi üzerinden karşılaştırır.
+
+Kullanım:
+    python inference_benchmark.py [torch|onnx|onnx-int8] [tekrar_sayisi]
+"""
+
+import json
+import sys
+import time
+from datetime import datetime
+from typing import Dict, List
+
+from transformers import BertTokenizer
+
+from config import BERTURK_CAGRI_MODEL_DIR, INFERENCE_CONFIG, PROJECT_ROOT
+from inference_backends import calistirici_olustur, egitim_metinlerini_yukle
+from intent_classifier import PADDING_MODLARI, TopluSiniflandirici
+
+
+def mod_olc(calistirici, tokenizer, metinler: List[str], padding_modu: str, tekrar_sayisi: int) -> Dict:
+    """Tek padding modu için verim ve doldurma istatistiklerini ölç"""
+    siniflandirici = TopluSiniflandirici(calistirici, tokenizer, padding_modu=padding_modu)
+    try:
+        # Isınma turu
+        for future in [siniflandirici.gonder(metin) for metin in metinler[:32]]:
+            future.result()
+
+        sureler = []
+        etiketler = []
+        for _ in range(tekrar_sayisi):
+            baslangic = time.perf_counter()
+            futures = [siniflandirici.gonder(metin) for metin in metinler]
+            etiketler = [future.result()[0] for future in futures]
+            sureler.append(time.perf_counter() - baslangic)
+
+        istatistik = siniflandirici.istatistikler()
+    finally:
+        siniflandirici.kapat()
+
+    ortalama = sum(sureler) / len(sureler)
+    return {
+        "padding_modu": padding_modu,
+        "ornek_sayisi": len(metinler),
+        "ortalama_sure_s": ortalama,
+        "en_iyi_sure_s": min(sureler),
+        "siniflandirma_per_saniye": len(metinler) / ortalama,
+        "ortalama_toplu_boyutu": istatistik["ortalama_toplu_boyutu"],
+        "dolgu_orani": istatistik["dolgu_orani"],
+        "etiketler": etiketler
+    }
+
+
+def benchmark_calistir(calisma_zamani: str = None, tekrar_sayisi: int = 3) -> Dict:
+    """Her iki padding modunu ölç ve etiket uyumunu raporla"""
+    calistirici = calistirici_olustur(calisma_zamani, model_dir=BERTURK_CAGRI_MODEL_DIR)
+    tokenizer = BertTokenizer.from_pretrained(str(BERTURK_CAGRI_MODEL_DIR))
+    metinler = egitim_metinlerini_yukle()
+
+    sonuclar = {mod: mod_olc(calistirici, tokenizer, metinler, mod, tekrar_sayisi) for mod in PADDING_MODLARI}
+    uyusan = sum(a == b for a, b in zip(sonuclar["max_length"].pop("etiketler"),
+                                         sonuclar["dinamik"].pop("etiketler")))
+
+    return {
+        "tarih": datetime.now().isoformat(),
+        "calisma_zamani": calisma_zamani or INFERENCE_CONFIG['calisma_zamani'],
+        "tekrar_sayisi": tekrar_sayisi,
+        "modlar": sonuclar,
+        "hizlanma": sonuclar["max_length"]["ortalama_sure_s"] / sonuclar["dinamik"]["ortalama_sure_s"],
+        "etiket_uyumu": uyusan / len(metinler)
+    }
+
+
+def main():
+    """Ana fonksiyon"""
+    calisma_zamani = sys.argv[1] if len(sys.argv) > 1 else None
+    tekrar_sayisi = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+
+    rapor = benchmark_calistir(calisma_zamani, tekrar_sayisi)
+    cikti = PROJECT_ROOT / "inference_benchmark_results.json"
+    with open(cikti, "w", encoding="utf-8") as f:
+        json.dump(rapor, f, indent=2, ensure_ascii=False)
+
+    print(f"⚙️ Çalışma zamanı: {rapor['calisma_zamani']}")
+    for mod, sonuc in rapor["modlar"].items():
+        print(f"📊 {mod:>10}: {sonuc['siniflandirma_per_saniye']:.1f} sınıflandırma/s, "
+              f"dolgu oranı %{sonuc['dolgu_orani'] * 100:.1f}")
+    print(f"🚀 Hızlanma (dinamik / max_length): {rapor['hizlanma']:.2f}x")
+    print(f"✅ Etiket uyumu: %{rapor['etiket_uyumu'] * 100:.2f}")
+    print(f"💾 Sonuçlar {cikti} dosyasına kaydedildi")
+
+
+if __name__ == "__main__":
+    main()
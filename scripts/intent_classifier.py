@@ -0,0 +1,232 @@
+"""
+Toplu Niyet Sınıflandırma Servisi
+Eşzamanlı görüşmelerden gelen müşteri cümlelerini mikro-toplulara ayırır ve
+her topluyu tek bir BERTurk ileri geçişiyle sınıflandırır.
+"""
+
+import queue
+import re
+import threading
+import time
+from concurrent.futures import Future
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from prediction_cache import TahminOnbellegi
+
+try:
+    from config import MODEL_CONFIG, SINIFLANDIRMA_CONFIG
+except ImportError:
+    MODEL_CONFIG = {'max_length': 64}
+    SINIFLANDIRMA_CONFIG = {'max_batch_size': 16, 'max_bekleme_ms': 10,
+                            'padding_modu': 'dinamik', 'uzunluk_kovalari': [16, 32, 64]}
+
+PADDING_MODLARI = ("max_length", "dinamik")
+
+
+def metin_normalize(metin: str) -> str:
+    """Metni ön işle: küçük harf, strip, noktalama kaldırma"""
+    metin = metin.lower().strip()
+    return re.sub(r'[.,!?;:()\[\]{}"]', '', metin)
+
+
+def tokenize_et(tokenizer, metinler: List[str], max_length: int) -> Dict[str, List[List[int]]]:
+    """Metinleri doldurmadan, `max_length`'te keserek token listelerine çevir"""
+    return tokenizer(metinler, truncation=True, max_length=max_length)
+
+
+def doldur(tokenizer, kodlanmis: Dict[str, List[List[int]]], max_length: int, tensor_tipi: str = "pt",
+           padding_modu: str = "dinamik"):
+    """Token listelerini padding moduna göre doldurup tensöre çevir
+
+    `dinamik` modda toplu, içindeki en uzun cümleye göre doldurulur;
+    `max_length` modda her cümle `max_length` uzunluğuna tamamlanır.
+    """
+    if padding_modu not in PADDING_MODLARI:
+        raise ValueError(f"Bilinmeyen padding modu: {padding_modu}")
+    padding = 'max_length' if padding_modu == 'max_length' else 'longest'
+    return tokenizer.pad(kodlanmis, padding=padding, max_length=max_length, return_tensors=tensor_tipi)
+
+
+def kodla(tokenizer, metinler: List[str], max_length: int, tensor_tipi: str = "pt", padding_modu: str = "dinamik"):
+    """Sınıflandırıcı için ortak tokenizasyon yolu: tokenize et, sonra doldur
+
+    Toplu servis aynı iki adımı kullanır; yalnızca doldurmadan önce topluyu
+    uzunluk kovalarına ayırır.
+    """
+    return doldur(tokenizer, tokenize_et(tokenizer, metinler, max_length), max_length, tensor_tipi, padding_modu)
+
+
+class TopluSiniflandirici:
+    """Mikro-toplu BERTurk sınıflandırma servisi
+
+    Çıkarım, `calistirici` ile verilen arka uçta (torch / onnx / onnx-int8)
+    yapılır. Her çağrı `gonder` ile bir Future alır; arka plandaki işçi kuyruktaki
+    istekleri `max_batch_size` dolana ya da `max_bekleme_ms` geçene kadar
+    biriktirir ve Future'ları (etiket, güven) ile sonuçlandırır.
+
+    `dinamik` padding modunda toplu, token uzunluğuna göre kovalara ayrılır ve
+    her kova kendi en uzun cümlesine göre doldurularak ayrı çalıştırılır.
+
+    Metinler `metin_normalize` ile normalize edilir; `onbellek` verilirse
+    aynı normalize metin için ileri geçiş yapılmadan önbellekten yanıt verilir.
+    """
+
+    def __init__(self, calistirici, tokenizer, max_batch_size: Optional[int] = None,
+                 max_bekleme_ms: Optional[float] = None, max_length: Optional[int] = None,
+                 padding_modu: Optional[str] = None, uzunluk_kovalari: Optional[List[int]] = None,
+                 onbellek: Optional[TahminOnbellegi] = None):
+        self.calistirici = calistirici
+        self.tokenizer = tokenizer
+        self.max_batch_size = max_batch_size or SINIFLANDIRMA_CONFIG['max_batch_size']
+        self.max_bekleme_ms = (max_bekleme_ms if max_bekleme_ms is not None
+                               else SINIFLANDIRMA_CONFIG['max_bekleme_ms'])
+        self.max_length = max_length or MODEL_CONFIG['max_length']
+        self.padding_modu = padding_modu or SINIFLANDIRMA_CONFIG.get('padding_modu', 'dinamik')
+        if self.padding_modu not in PADDING_MODLARI:
+            raise ValueError(f"Bilinmeyen padding modu: {self.padding_modu}")
+        self.uzunluk_kovalari = sorted(uzunluk_kovalari or SINIFLANDIRMA_CONFIG.get('uzunluk_kovalari', [self.max_length]))
+        self.onbellek = onbellek
+
+        self._kuyruk = queue.Queue()
+        self._kapatildi = False
+        # Kapatma bayrağı ile kuyruğa ekleme aynı kilit altında; durdurma işaretinden sonra istek kuyruğa giremez
+        self._kapatma_kilidi = threading.Lock()
+        self._sayac_kilidi = threading.Lock()
+        self._toplam_istek = 0
+        self._toplam_toplu = 0
+        self._toplam_token = 0
+        self._toplam_dolgu_token = 0
+
+        self._isci = threading.Thread(target=self._calisma_dongusu, name="TopluSiniflandirici", daemon=True)
+        self._isci.start()
+
+    def gonder(self, metin: str) -> Future:
+        """Metni sınıflandırma kuyruğuna ekle, sonucu Future olarak döndür"""
+        if self._kapatildi:
+            raise RuntimeError("Sınıflandırma servisi kapatıldı")
+        future = Future()
+        anahtar = metin_normalize(metin)
+        if self.onbellek is not None:
+            kayit = self.onbellek.getir(anahtar)
+            if kayit is not None:
+                future.set_result((kayit[0], kayit[1]))
+                return future
+        with self._kapatma_kilidi:
+            if self._kapatildi:
+                raise RuntimeError("Sınıflandırma servisi kapatıldı")
+            self._kuyruk.put((anahtar, future))
+        return future
+
+    def siniflandir(self, metin: str, timeout: Optional[float] = None) -> Tuple[int, float]:
+        """Metni sınıflandır ve (etiket, güven yüzdesi) döndür"""
+        return self.gonder(metin).result(timeout=timeout)
+
+    def kapat(self, bekle: bool = True):
+        """Kuyruktaki istekleri bitirip işçiyi durdur, önbelleği kaydet"""
+        with self._kapatma_kilidi:
+            if self._kapatildi:
+                return
+            self._kapatildi = True
+            self._kuyruk.put(None)
+        if bekle:
+            self._isci.join()
+        if self.onbellek is not None:
+            self.onbellek.kaydet()
+
+    def istatistikler(self) -> Dict:
+        """İstek, toplu ve doldurma sayılarını getir"""
+        with self._sayac_kilidi:
+            return {
+                "toplam_istek": self._toplam_istek,
+                "toplam_toplu": self._toplam_toplu,
+                "ortalama_toplu_boyutu": self._toplam_istek / self._toplam_toplu if self._toplam_toplu else 0.0,
+                "toplam_token": self._toplam_token,
+                "toplam_dolgu_token": self._toplam_dolgu_token,
+                "dolgu_orani": self._toplam_dolgu_token / (self._toplam_token + self._toplam_dolgu_token)
+                               if self._toplam_token else 0.0
+            }
+
+    def _topla(self) -> Tuple[List, bool]:
+        """Kuyruktan bir mikro-toplu topla; (toplu, durdur) döndür"""
+        ilk = self._kuyruk.get()
+        if ilk is None:
+            return [], True
+
+        toplu = [ilk]
+        son_tarih = time.monotonic() + self.max_bekleme_ms / 1000
+        while len(toplu) < self.max_batch_size:
+            kalan = son_tarih - time.monotonic()
+            if kalan <= 0:
+                break
+            try:
+                oge = self._kuyruk.get(timeout=kalan)
+            except queue.Empty:
+                break
+            if oge is None:
+                return toplu, True
+            toplu.append(oge)
+        return toplu, False
+
+    def _calisma_dongusu(self):
+        durdur = False
+        while not durdur:
+            toplu, durdur = self._topla()
+            # İptal edilmiş istekleri ayıkla
+            toplu = [(metin, future) for metin, future in toplu if future.set_running_or_notify_cancel()]
+            if not toplu:
+                continue
+
+            try:
+                sonuclar = self._toplu_calistir([metin for metin, _ in toplu])
+            except Exception as e:
+                for _, future in toplu:
+                    future.set_exception(e)
+                continue
+
+            for (anahtar, future), (tahmin, guven, logits) in zip(toplu, sonuclar):
+                if self.onbellek is not None:
+                    self.onbellek.ekle(anahtar, tahmin, guven, logits)
+                future.set_result((tahmin, guven))
+
+            with self._sayac_kilidi:
+                self._toplam_istek += len(toplu)
+                self._toplam_toplu += 1
+
+    def _kovalara_ayir(self, input_ids: List[List[int]]) -> List[List[int]]:
+        """Toplu içindeki indeksleri token uzunluğu kovalarına ayır"""
+        if self.padding_modu == 'max_length':
+            return [list(range(len(input_ids)))]
+        kovalar = {}
+        for i, ids in enumerate(input_ids):
+            sinir = next((s for s in self.uzunluk_kovalari if len(ids) <= s), self.max_length)
+            kovalar.setdefault(sinir, []).append(i)
+        return [kovalar[sinir] for sinir in sorted(kovalar)]
+
+    def _toplu_calistir(self, metinler: List[str]) -> List[Tuple[int, float, List[float]]]:
+        """Topluyu tokenize et ve her uzunluk kovası için bir ileri geçiş yap"""
+        kodlanmis = tokenize_et(self.tokenizer, metinler, self.max_length)
+        sonuclar = [None] * len(metinler)
+        gercek_token = sum(len(ids) for ids in kodlanmis['input_ids'])
+        dolu_slot = 0
+
+        for kova in self._kovalara_ayir(kodlanmis['input_ids']):
+            parca = {ad: [degerler[i] for i in kova] for ad, degerler in kodlanmis.items()}
+            inputs = doldur(self.tokenizer, parca, self.max_length, self.calistirici.tensor_tipi, self.padding_modu)
+            dolu_slot += len(kova) * inputs['input_ids'].shape[1]
+
+            logits = np.asarray(self.calistirici.logits(inputs), dtype=np.float32)
+            olasiliklar = _softmax(logits)
+            for j, tahmin in enumerate(logits.argmax(axis=1).tolist()):
+                sonuclar[kova[j]] = (tahmin, float(olasiliklar[j, tahmin]) * 100, logits[j].tolist())
+
+        with self._sayac_kilidi:
+            self._toplam_token += gercek_token
+            self._toplam_dolgu_token += dolu_slot - gercek_token
+        return sonuclar
+
+
+def _softmax(logits: np.ndarray) -> np.ndarray:
+    uslu = np.exp(logits - logits.max(axis=1, keepdims=True))
+    return uslu / uslu.sum(axis=1, keepdims=True)
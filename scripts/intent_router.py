@@ -0,0 +1,257 @@
+"""
+Talep Yönlendirici
+Sınıflandırıcının verdiği kategori etiketini ve müşteri cümlesini yanıt
+üreten SesliCagriMerkezi metoduna eşler. Kategori → işleyici eşlemesi ve
+alt niyet anahtar kelimeleri YONLENDIRME_TABLOSU'nda bildirilir; anahtar
+kelimeler tek bir Aho-Corasick otomatına derlenir, böylece cümle niyet
+sayısından bağımsız olarak tek geçişte taranır.
+
+Kullanım:
+    python intent_router.py benchmark [tekrar]
+"""
+
+import json
+import sys
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from search_index import turkce_kucult
+
+try:
+    from config import TRAIN_BERTURK_FILE
+except ImportError:
+    TRAIN_BERTURK_FILE = Path(__file__).resolve().parent.parent / "data" / "train_berturk.jsonl"
+
+BELIRSIZ_TALEP_ISTEMI = ("Talebiniz anlaşılamadı. Lütfen hangi konuda yardım almak istediğinizi açık bir şekilde "
+                         "belirtir misiniz? Örneğin: fatura itirazı, paket değişikliği, borç sorgulama...")
+
+# Kategori → işleyici (SesliCagriMerkezi metot adı, kullanici_verisi ve ek argümanlarla çağrılır).
+# Alt niyetli kategorilerde anahtar kelimeler liste sırasıyla önceliklidir: birden çok alt niyet
+# eşleşirse listede önce gelen seçilir. Hiçbiri eşleşmezse "anlasilamadi" istemi okunur.
+YONLENDIRME_TABLOSU: Dict[int, Any] = {
+    0: "yanit_fatura_itiraz",
+    1: {
+        "alt_niyetler": [
+            (("son ay",), "paket_son_ay_cevapla"),
+            (("son 2 ay", "2 ay"), "paket_son_iki_ay_cevapla"),
+            (("son 3 ay", "3 ay"), "paket_son_uc_ay_cevapla"),
+            (("sms",), "kalan_hak_cevapla", "sms"),
+            (("dakika",), "kalan_hak_cevapla", "dakika"),
+            (("internet",), "kalan_hak_cevapla", "internet"),
+            (("tüm hak", "hepsi", "kalan hak"), "yanit_paket_kalan_hak"),
+        ],
+        "anlasilamadi": "Paket konusundaki talebiniz anlaşılamadı. Lütfen ne yapmak istediğinizi belirtir misiniz? "
+                        "Paket değiştirmek mi, kalan haklarınızı öğrenmek mi?"
+    },
+    2: "yanit_borc_odeme",
+    3: "yanit_iptal_talebi",
+    4: "yanit_yeni_paket_kampanya",
+    5: "yanit_teknik_ariza",
+    6: "yanit_sim_kart_sifre",
+}
+
+# Evet / hayır cevabı; ikisi birden geçerse evet önceliklidir
+EVET_HAYIR_ANAHTARLARI = {"evet": True, "hayır": False, "hayir": False}
+
+
+class AnahtarKelimeOtomati:
+    """Çok anahtarlı alt dizgi araması için Aho-Corasick otomatı
+
+    Anahtarlar Türkçe kurallarıyla küçültülür; `ara` metni bir kez tarar ve
+    eşleşen her anahtar için (bitiş konumu, anahtar, değer) üretir.
+    """
+
+    def __init__(self, anahtarlar: Dict[str, Any]):
+        self._gecisler: List[Dict[str, int]] = [{}]
+        self._hata: List[int] = [0]
+        self._cikti: List[List[Tuple[str, Any]]] = [[]]
+        for anahtar, deger in anahtarlar.items():
+            self._ekle(turkce_kucult(anahtar), deger)
+        self._hata_baglarini_kur()
+
+    def _ekle(self, anahtar: str, deger: Any):
+        durum = 0
+        for karakter in anahtar:
+            sonraki = self._gecisler[durum].get(karakter)
+            if sonraki is None:
+                sonraki = len(self._gecisler)
+                self._gecisler.append({})
+                self._hata.append(0)
+                self._cikti.append([])
+                self._gecisler[durum][karakter] = sonraki
+            durum = sonraki
+        self._cikti[durum].append((anahtar, deger))
+
+    def _hata_baglarini_kur(self):
+        # Genişlik öncelikli: her durumun hata bağı, en uzun uygun son ekin durumudur
+        kuyruk = deque(self._gecisler[0].values())
+        while kuyruk:
+            durum = kuyruk.popleft()
+            for karakter, sonraki in self._gecisler[durum].items():
+                kuyruk.append(sonraki)
+                hata = self._hata[durum]
+                while hata and karakter not in self._gecisler[hata]:
+                    hata = self._hata[hata]
+                hedef = self._gecisler[hata].get(karakter, 0)
+                self._hata[sonraki] = hedef if hedef != sonraki else 0
+                # Son ekteki anahtarlar da bu durumda biter
+                self._cikti[sonraki] = self._cikti[sonraki] + self._cikti[self._hata[sonraki]]
+
+    def ara(self, metin: str) -> Iterator[Tuple[int, str, Any]]:
+        """Metindeki tüm anahtar eşleşmelerini tek geçişte üret"""
+        durum = 0
+        for konum, karakter in enumerate(turkce_kucult(metin)):
+            while durum and karakter not in self._gecisler[durum]:
+                durum = self._hata[durum]
+            durum = self._gecisler[durum].get(karakter, 0)
+            for anahtar, deger in self._cikti[durum]:
+                yield konum, anahtar, deger
+
+    def degerler(self, metin: str) -> set:
+        """Metinde geçen anahtarların değer kümesi"""
+        return {deger for _, _, deger in self.ara(metin)}
+
+
+class Yonlendirme(NamedTuple):
+    """Yönlendirme sonucu: işleyici bulunduysa adı ve ek argümanları, yoksa okunacak istem"""
+    isleyici: Optional[str]
+    argumanlar: tuple = ()
+    istem: Optional[str] = None
+
+
+class NiyetYonlendirici:
+    """Kategori ve alt niyet tablosundan derlenen talep yönlendirici"""
+
+    def __init__(self, varsayilan_istem: str = BELIRSIZ_TALEP_ISTEMI):
+        self.varsayilan_istem = varsayilan_istem
+        self._kategoriler: Dict[int, Yonlendirme] = {}
+        # Alt niyetli kategoriler: (otomat, öncelik sırasıyla yönlendirmeler, anlaşılamadı istemi)
+        self._alt_niyetler: Dict[int, Tuple[AnahtarKelimeOtomati, List[Yonlendirme], str]] = {}
+
+    @classmethod
+    def tablodan(cls, tablo: Dict[int, Any], **kwargs) -> "NiyetYonlendirici":
+        """YONLENDIRME_TABLOSU biçimindeki bildirimden yönlendirici oluştur"""
+        yonlendirici = cls(**kwargs)
+        for kategori, tanim in tablo.items():
+            if isinstance(tanim, str):
+                yonlendirici.kategori_ekle(kategori, tanim)
+            else:
+                yonlendirici.alt_niyetler_ekle(kategori, tanim["alt_niyetler"], tanim["anlasilamadi"])
+        return yonlendirici
+
+    def kategori_ekle(self, kategori: int, isleyici: str, *argumanlar):
+        """Kategoriyi doğrudan tek bir işleyiciye bağla"""
+        self._alt_niyetler.pop(kategori, None)
+        self._kategoriler[kategori] = Yonlendirme(isleyici, argumanlar)
+
+    def alt_niyetler_ekle(self, kategori: int, alt_niyetler: Iterable[tuple], anlasilamadi: str):
+        """Kategoriyi anahtar kelimeyle seçilen alt niyetlere bağla; liste sırası önceliktir"""
+        yonlendirmeler: List[Yonlendirme] = []
+        anahtarlar: Dict[str, int] = {}
+        for oncelik, (kelimeler, isleyici, *argumanlar) in enumerate(alt_niyetler):
+            yonlendirmeler.append(Yonlendirme(isleyici, tuple(argumanlar)))
+            for kelime in kelimeler:
+                # Aynı kelime birden çok alt niyette geçerse öncelikli olan kalır
+                anahtarlar.setdefault(kelime, oncelik)
+        self._kategoriler.pop(kategori, None)
+        self._alt_niyetler[kategori] = (AnahtarKelimeOtomati(anahtarlar), yonlendirmeler, anlasilamadi)
+
+    def cozumle(self, kategori: int, metin: str) -> Yonlendirme:
+        """Kategori ve müşteri cümlesi için işleyiciyi ya da netleştirme istemini döndür"""
+        yonlendirme = self._kategoriler.get(kategori)
+        if yonlendirme is not None:
+            return yonlendirme
+        alt = self._alt_niyetler.get(kategori)
+        if alt is None:
+            return Yonlendirme(None, istem=self.varsayilan_istem)
+        otomat, yonlendirmeler, anlasilamadi = alt
+        oncelikler = otomat.degerler(metin or "")
+        if not oncelikler:
+            return Yonlendirme(None, istem=anlasilamadi)
+        return yonlendirmeler[min(oncelikler)]
+
+
+def evet_hayir_coz(cevap: Optional[str]) -> Optional[bool]:
+    """Cevapta 'evet' geçiyorsa True, 'hayır' geçiyorsa False, ikisi de yoksa None"""
+    degerler = _evet_hayir_otomati.degerler(cevap or "")
+    if True in degerler:
+        return True
+    if False in degerler:
+        return False
+    return None
+
+
+def _dogrusal_cozumle(tablo: Dict[int, Any], kategori: int, metin: str) -> Yonlendirme:
+    """Karşılaştırma için her anahtar kelimeyi sırayla arayan yönlendirme"""
+    tanim = tablo.get(kategori)
+    if tanim is None:
+        return Yonlendirme(None, istem=BELIRSIZ_TALEP_ISTEMI)
+    if isinstance(tanim, str):
+        return Yonlendirme(tanim)
+    metin = turkce_kucult(metin)
+    for kelimeler, isleyici, *argumanlar in tanim["alt_niyetler"]:
+        if any(turkce_kucult(kelime) in metin for kelime in kelimeler):
+            return Yonlendirme(isleyici, tuple(argumanlar))
+    return Yonlendirme(None, istem=tanim["anlasilamadi"])
+
+
+def yonlendirme_benchmark(ornekler: List[Tuple[int, str]], tekrar: int = 100) -> Dict:
+    """Otomatlı yönlendirmeyi doğrusal anahtar kelime aramasıyla karşılaştır (çağrı başına µs)"""
+    for kategori, metin in ornekler:
+        if yonlendirici.cozumle(kategori, metin) != _dogrusal_cozumle(YONLENDIRME_TABLOSU, kategori, metin):
+            raise AssertionError(f"Yönlendirme uyuşmazlığı: {kategori} / {metin}")
+
+    sonuc = {"ornek_sayisi": len(ornekler), "tekrar": tekrar}
+    for ad, fonksiyon in (("otomat", yonlendirici.cozumle),
+                          ("dogrusal", lambda k, m: _dogrusal_cozumle(YONLENDIRME_TABLOSU, k, m)),
+                          ("evet_hayir", lambda k, m: evet_hayir_coz(m))):
+        baslangic = time.perf_counter()
+        for _ in range(tekrar):
+            for kategori, metin in ornekler:
+                fonksiyon(kategori, metin)
+        sure = time.perf_counter() - baslangic
+        sonuc[f"{ad}_us"] = sure / (tekrar * len(ornekler)) * 1e6 if ornekler else 0.0
+    return sonuc
+
+
+def _egitim_ornekleri(veri_dosyasi: Path = TRAIN_BERTURK_FILE) -> List[Tuple[int, str]]:
+    ornekler = []
+    with open(veri_dosyasi, "r", encoding="utf-8") as f:
+        for satir in f:
+            if satir.strip():
+                # Bazı satırlarda ayraç olarak bölünmez boşluk (\xa0) bulunuyor
+                kayit = json.loads(satir.replace("\xa0", " "))
+                ornekler.append((kayit["label"], kayit["text"]))
+    return ornekler
+
+
+def main():
+    """Ana fonksiyon"""
+    if len(sys.argv) < 2 or sys.argv[1].lower() != "benchmark":
+        print(__doc__)
+        return
+
+    try:
+        tekrar = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+        ornekler = _egitim_ornekleri()
+    except (OSError, ValueError) as e:
+        print(f"❌ Örnekler yüklenemedi: {e}")
+        return
+
+    sonuc = yonlendirme_benchmark(ornekler, tekrar)
+    print(f"📊 {sonuc['ornek_sayisi']} örnek x {sonuc['tekrar']} tekrar")
+    print(f"⚡ Otomat: {sonuc['otomat_us']:.2f} µs/çağrı")
+    print(f"🐢 Doğrusal: {sonuc['dogrusal_us']:.2f} µs/çağrı")
+    print(f"✅ Evet/hayır: {sonuc['evet_hayir_us']:.2f} µs/çağrı")
+
+
+_evet_hayir_otomati = AnahtarKelimeOtomati(EVET_HAYIR_ANAHTARLARI)
+
+# Global instance
+yonlendirici = NiyetYonlendirici.tablodan(YONLENDIRME_TABLOSU)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+"""
+Ortam Gürültüsü Kalibrasyonu
+recognizer.adjust_for_ambient_noise her dinlemeden önce ~1 sn mikrofonu
+dinleyip enerji eşiğini yeniden hesaplar; müşteri bu sürede konuşamaz.
+Kalibratör mikrofonu görüşme boyunca açık tutar, eşiği görüşme başında bir
+kez ölçer ve dinleme dışındaki zamanlarda gürültü tabanını arka planda izler.
+Taban referanstan belirgin biçimde saptığında eşik, zaten toplanmış
+ölçümlerden güncellenir; dinlemeden önce bekleme olmaz.
+"""
+
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+import numpy as np
+
+try:
+    from config import GURULTU_KALIBRASYONU_CONFIG
+except ImportError:
+    GURULTU_KALIBRASYONU_CONFIG = {
+        'kalibrasyon_suresi': 1.0,
+        'pencere_suresi': 5.0,
+        'taban_yuzdeligi': 20,
+        'sapma_orani': 0.5,
+        'kontrol_araligi': 1.0,
+        'min_esik': 50
+    }
+
+_ORNEK_TIPLERI = {1: np.int8, 2: np.int16, 4: np.int32}
+
+
+def parca_enerjisi(veri: bytes, ornek_genisligi: int = 2) -> float:
+    """Ses parçasının RMS enerjisi (speech_recognition'ın eşikle karşılaştırdığı ölçek)"""
+    ornekler = np.frombuffer(veri[:len(veri) - len(veri) % ornek_genisligi], dtype=_ORNEK_TIPLERI[ornek_genisligi])
+    if not ornekler.size:
+        return 0.0
+    ornekler = ornekler.astype(np.float64)
+    return float(np.sqrt(np.mean(ornekler * ornekler)))
+
+
+class GurultuKalibratoru:
+    """Görüşme başına bir kez kalibre eden, gürültü tabanını arka planda izleyen yönetici
+
+    Mikrofon ilk dinlemede açılır ve `kapat` çağrılana kadar açık kalır. İzleme
+    iş parçacığı yalnızca dinleme yapılmadığı sürece mikrofondan okur. Temsilci
+    sesi ve müşteri konuşması ölçümü şişirmesin diye taban, kayan penceredeki
+    enerjilerin alt yüzdeliğidir.
+    """
+
+    def __init__(self, microphone, recognizer, ayarlar: Optional[Dict] = None):
+        self.microphone = microphone
+        self.recognizer = recognizer
+        self.ayarlar = {**GURULTU_KALIBRASYONU_CONFIG, **(ayarlar or {})}
+
+        self._kaynak = None
+        self._enerjiler: deque = deque()
+        # İzleme, dinleme sırasında mikrofondan okumaz
+        self._kilit = threading.Lock()
+        self._dinleme_bekliyor = threading.Event()
+        self._durdur = threading.Event()
+        self._izleyici: Optional[threading.Thread] = None
+
+        self.referans_taban: Optional[float] = None
+        self.son_taban: Optional[float] = None
+        self.kalibrasyon_sayisi = 0
+
+    def _parca_oku(self) -> float:
+        veri = self._kaynak.stream.read(self._kaynak.CHUNK)
+        enerji = parca_enerjisi(veri, self._kaynak.SAMPLE_WIDTH)
+        self._enerjiler.append(enerji)
+        return enerji
+
+    def _taban(self) -> float:
+        return float(np.percentile(self._enerjiler, self.ayarlar['taban_yuzdeligi']))
+
+    def _esigi_guncelle(self, taban: float):
+        self.referans_taban = taban
+        oran = getattr(self.recognizer, "dynamic_energy_ratio", 1.5)
+        self.recognizer.energy_threshold = max(taban * oran, self.ayarlar['min_esik'])
+        self.kalibrasyon_sayisi += 1
+
+    def _ac(self):
+        """Mikrofonu aç, görüşme başı kalibrasyonunu yap ve izlemeyi başlat (kilit altında çağrılır)"""
+        if self._kaynak is not None:
+            return self._kaynak
+        self._kaynak = self.microphone.__enter__()
+        parca_suresi = self._kaynak.CHUNK / self._kaynak.SAMPLE_RATE
+        self._enerjiler = deque(maxlen=max(1, int(self.ayarlar['pencere_suresi'] / parca_suresi)))
+
+        for _ in range(max(1, int(self.ayarlar['kalibrasyon_suresi'] / parca_suresi))):
+            self._parca_oku()
+        self._esigi_guncelle(self._taban())
+        self.son_taban = self.referans_taban
+
+        self._durdur.clear()
+        self._izleyici = threading.Thread(target=self._izle, name="GurultuIzleyici", daemon=True)
+        self._izleyici.start()
+        return self._kaynak
+
+    def _izle(self):
+        son_kontrol = time.monotonic()
+        while not self._durdur.is_set():
+            if self._dinleme_bekliyor.is_set():
+                # Dinleme kilidi bekliyor; kilidi hemen tekrar almayalım
+                time.sleep(0.01)
+                continue
+            if not self._kilit.acquire(timeout=0.1):
+                continue
+            try:
+                if self._durdur.is_set() or self._kaynak is None:
+                    return
+                self._parca_oku()
+                if time.monotonic() - son_kontrol >= self.ayarlar['kontrol_araligi']:
+                    son_kontrol = time.monotonic()
+                    self.sapma_kontrol()
+            except Exception as e:
+                print(f"Gürültü izleme durdu: {e}")
+                return
+            finally:
+                self._kilit.release()
+
+    def sapma_kontrol(self) -> bool:
+        """Gürültü tabanı referanstan saptıysa eşiği güncelle; güncellendiyse True döndür"""
+        if not self._enerjiler:
+            return False
+        self.son_taban = self._taban()
+        referans = self.referans_taban or 0.0
+        if abs(self.son_taban - referans) <= self.ayarlar['sapma_orani'] * max(referans, 1.0):
+            return False
+        self._esigi_guncelle(self.son_taban)
+        return True
+
+    @contextmanager
+    def dinleme(self):
+        """Kalibre edilmiş mikrofon kaynağını ver; bu sürede arka plan izlemesi durur"""
+        self._dinleme_bekliyor.set()
+        try:
+            self._kilit.acquire()
+        finally:
+            self._dinleme_bekliyor.clear()
+        try:
+            yield self._ac()
+        finally:
+            self._kilit.release()
+
+    def kapat(self):
+        """İzlemeyi durdur ve mikrofonu kapat; sonraki dinleme yeniden kalibre eder"""
+        self._durdur.set()
+        if self._izleyici is not None:
+            self._izleyici.join(timeout=1.0)
+            self._izleyici = None
+        with self._kilit:
+            if self._kaynak is not None:
+                self.microphone.__exit__(None, None, None)
+                self._kaynak = None
+            self.referans_taban = None
+
+    def istatistikler(self) -> Dict:
+        """Eşik, taban ve kalibrasyon sayısı"""
+        return {
+            "esik": self.recognizer.energy_threshold,
+            "referans_taban": self.referans_taban,
+            "son_taban": self.son_taban,
+            "kalibrasyon_sayisi": self.kalibrasyon_sayisi,
+            "mikrofon_acik": self._kaynak is not None
+        }
@@ -0,0 +1,116 @@
+"""
+Tahmin Önbelleği
+Normalize edilmiş müşteri cümlesi → (etiket, güven, logits) eşlemesini
+sınırlı LRU olarak tutar; isteğe bağlı olarak diske kaydedip geri yükler.
+"""
+
+import atexit
+import json
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+ONBELLEK_SURUMU = 1
+
+
+class TahminOnbellegi:
+    """Sınıflandırma sonuçları için thread-safe LRU önbellek"""
+
+    def __init__(self, kapasite: int = 10000, dosya: Optional[Path] = None, imza: str = ""):
+        self.kapasite = kapasite
+        self.dosya = Path(dosya) if dosya else None
+        # Farklı model / arka uçla üretilmiş kayıtlar yüklenmesin diye
+        self.imza = imza
+
+        self._kayitlar: "OrderedDict[str, Tuple[int, float, List[float]]]" = OrderedDict()
+        self._kilit = threading.Lock()
+        self.isabet = 0
+        self.iska = 0
+        self.cikarilan = 0
+
+        if self.dosya:
+            self.yukle()
+            atexit.register(self.kaydet)
+
+    def __len__(self) -> int:
+        return len(self._kayitlar)
+
+    def getir(self, anahtar: str) -> Optional[Tuple[int, float, List[float]]]:
+        """Kayıt varsa en yeni konuma taşıyıp döndür"""
+        with self._kilit:
+            kayit = self._kayitlar.get(anahtar)
+            if kayit is None:
+                self.iska += 1
+                return None
+            self._kayitlar.move_to_end(anahtar)
+            self.isabet += 1
+            return kayit
+
+    def ekle(self, anahtar: str, etiket: int, guven: float, logits: List[float]):
+        """Kayıt ekle, kapasite aşılırsa en eski kaydı çıkar"""
+        with self._kilit:
+            self._kayitlar[anahtar] = (etiket, guven, logits)
+            self._kayitlar.move_to_end(anahtar)
+            while len(self._kayitlar) > self.kapasite:
+                self._kayitlar.popitem(last=False)
+                self.cikarilan += 1
+
+    def temizle(self):
+        """Tüm kayıtları ve sayaçları sıfırla"""
+        with self._kilit:
+            self._kayitlar.clear()
+            self.isabet = self.iska = self.cikarilan = 0
+
+    def istatistikler(self) -> Dict:
+        """İsabet/ıska sayaçlarını getir"""
+        with self._kilit:
+            toplam = self.isabet + self.iska
+            return {
+                "kayit_sayisi": len(self._kayitlar),
+                "kapasite": self.kapasite,
+                "isabet": self.isabet,
+                "iska": self.iska,
+                "cikarilan": self.cikarilan,
+                "isabet_orani": self.isabet / toplam if toplam else 0.0
+            }
+
+    def kaydet(self, dosya: Optional[Path] = None):
+        """Kayıtları LRU sırasıyla diske yaz"""
+        dosya = Path(dosya) if dosya else self.dosya
+        if not dosya:
+            return
+        with self._kilit:
+            veri = {
+                "surum": ONBELLEK_SURUMU,
+                "imza": self.imza,
+                "kayitlar": [[anahtar, *kayit] for anahtar, kayit in self._kayitlar.items()]
+            }
+        try:
+            dosya.parent.mkdir(parents=True, exist_ok=True)
+            gecici = dosya.with_suffix(dosya.suffix + ".tmp")
+            with open(gecici, "w", encoding="utf-8") as f:
+                json.dump(veri, f, ensure_ascii=False)
+            os.replace(gecici, dosya)
+        except Exception as e:
+            print(f"Tahmin önbelleği kaydedilirken hata: {e}")
+
+    def yukle(self, dosya: Optional[Path] = None) -> int:
+        """Diskteki kayıtları yükle; yüklenen kayıt sayısını döndür"""
+        dosya = Path(dosya) if dosya else self.dosya
+        if not dosya or not dosya.exists():
+            return 0
+        try:
+            with open(dosya, "r", encoding="utf-8") as f:
+                veri = json.load(f)
+        except Exception as e:
+            print(f"Tahmin önbelleği yüklenirken hata: {e}")
+            return 0
+        if veri.get("surum") != ONBELLEK_SURUMU or veri.get("imza") != self.imza:
+            return 0
+
+        with self._kilit:
+            for anahtar, etiket, guven, logits in veri.get("kayitlar", [])[-self.kapasite:]:
+                self._kayitlar[anahtar] = (etiket, guven, logits)
+        return len(self._kayitlar)
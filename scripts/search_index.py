@@ -0,0 +1,157 @@
+"""
+Görüşme Arama İndeksi
+Müşteri adı, telefon, kategori ve mesaj metinleri üzerinde Türkçe'ye duyarlı
+ters indeks (token → görüşme id → ağırlık). Görüşmeler değiştikçe artımlı
+güncellenir; sorgular önek eşleşmesiyle ve puana göre sıralı döner.
+"""
+
+import re
+from bisect import bisect_left, insort
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Alan ağırlıkları: ad / telefon / kategori eşleşmesi mesaj eşleşmesinden önce gelir
+ALAN_AGIRLIKLARI = {"musteri_adi": 3, "telefon": 3, "kategori": 2, "mesaj": 1}
+
+_TOKEN_DESENI = re.compile(r"\w+")
+
+
+def turkce_kucult(metin: str) -> str:
+    """Türkçe kurallarıyla küçük harfe çevir (İ → i, I → ı)"""
+    metin = str(metin).replace("İ", "i").replace("I", "ı").lower()
+    # str.lower() 'İ' için i + birleşik nokta (U+0307) üretir; başka yerden gelen metinde de temizle
+    return metin.replace("\u0307", "")
+
+
+def tokenlara_ayir(metin: Optional[str]) -> List[str]:
+    """Metni küçültülmüş kelime tokenlarına ayır"""
+    if not metin:
+        return []
+    return _TOKEN_DESENI.findall(turkce_kucult(metin))
+
+
+def telefon_tokenlari(telefon: Optional[str]) -> List[str]:
+    """Telefonun rakam soneklerini döndür; önek sorgusu böylece numaranın her parçasını bulur"""
+    rakamlar = ''.join(filter(str.isdigit, str(telefon or "")))
+    return [rakamlar[i:] for i in range(len(rakamlar))]
+
+
+class AramaIndeksi:
+    """Önek sorgulu, sıralı sonuç döndüren ters indeks"""
+
+    def __init__(self):
+        self._kayitlar: Dict[str, Dict[str, int]] = {}
+        # Önek sorguları için sıralı token listesi (bisect)
+        self._sirali_tokenler: List[str] = []
+        # Silme / yeniden indeksleme için belge → (alan token ağırlıkları, mesaj token ağırlıkları)
+        self._belgeler: Dict[str, Tuple[Counter, Counter]] = {}
+
+    def __len__(self) -> int:
+        return len(self._belgeler)
+
+    def _ekle(self, belge_id: str, agirliklar: Counter):
+        for token, agirlik in agirliklar.items():
+            kayit = self._kayitlar.get(token)
+            if kayit is None:
+                kayit = self._kayitlar[token] = {}
+                insort(self._sirali_tokenler, token)
+            kayit[belge_id] = kayit.get(belge_id, 0) + agirlik
+
+    def _cikar(self, belge_id: str, agirliklar: Counter):
+        for token, agirlik in agirliklar.items():
+            kayit = self._kayitlar.get(token)
+            if kayit is None or belge_id not in kayit:
+                continue
+            kayit[belge_id] -= agirlik
+            if kayit[belge_id] <= 0:
+                del kayit[belge_id]
+            if not kayit:
+                del self._kayitlar[token]
+                konum = bisect_left(self._sirali_tokenler, token)
+                del self._sirali_tokenler[konum]
+
+    @staticmethod
+    def _alan_agirliklari(gorusme: Dict) -> Counter:
+        agirliklar = Counter()
+        for token in tokenlara_ayir(gorusme.get("musteri_adi")):
+            agirliklar[token] += ALAN_AGIRLIKLARI["musteri_adi"]
+        for token in telefon_tokenlari(gorusme.get("telefon")):
+            agirliklar[token] += ALAN_AGIRLIKLARI["telefon"]
+        for token in tokenlara_ayir(gorusme.get("kategori")):
+            agirliklar[token] += ALAN_AGIRLIKLARI["kategori"]
+        return agirliklar
+
+    def gorusme_ekle(self, gorusme: Dict):
+        """Görüşmeyi tüm alanları ve mesajlarıyla indeksle"""
+        belge_id = gorusme["id"]
+        self.gorusme_cikar(belge_id)
+        alanlar = self._alan_agirliklari(gorusme)
+        mesajlar = Counter()
+        for mesaj in gorusme.get("mesajlar", []):
+            for token in tokenlara_ayir(mesaj.get("mesaj")):
+                mesajlar[token] += ALAN_AGIRLIKLARI["mesaj"]
+        self._belgeler[belge_id] = (alanlar, mesajlar)
+        self._ekle(belge_id, alanlar)
+        self._ekle(belge_id, mesajlar)
+
+    def gorusme_cikar(self, belge_id: str):
+        """Görüşmeyi indeksten çıkar"""
+        belge = self._belgeler.pop(belge_id, None)
+        if belge is None:
+            return
+        for agirliklar in belge:
+            self._cikar(belge_id, agirliklar)
+
+    def alanlari_guncelle(self, gorusme: Dict):
+        """Ad / telefon / kategori değiştiğinde yalnızca bu alanları yeniden indeksle"""
+        belge = self._belgeler.get(gorusme["id"])
+        if belge is None:
+            self.gorusme_ekle(gorusme)
+            return
+        eski_alanlar, mesajlar = belge
+        self._cikar(gorusme["id"], eski_alanlar)
+        yeni_alanlar = self._alan_agirliklari(gorusme)
+        self._belgeler[gorusme["id"]] = (yeni_alanlar, mesajlar)
+        self._ekle(gorusme["id"], yeni_alanlar)
+
+    def mesaj_ekle(self, belge_id: str, mesaj: str):
+        """Yeni mesajın tokenlarını indekse ekle"""
+        belge = self._belgeler.get(belge_id)
+        if belge is None:
+            return
+        eklenen = Counter()
+        for token in tokenlara_ayir(mesaj):
+            eklenen[token] += ALAN_AGIRLIKLARI["mesaj"]
+        belge[1].update(eklenen)
+        self._ekle(belge_id, eklenen)
+
+    def _onek_eslesmeleri(self, onek: str) -> Iterable[str]:
+        konum = bisect_left(self._sirali_tokenler, onek)
+        while konum < len(self._sirali_tokenler) and self._sirali_tokenler[konum].startswith(onek):
+            yield self._sirali_tokenler[konum]
+            konum += 1
+
+    def ara(self, sorgu: str) -> List[Tuple[str, float]]:
+        """Tüm sorgu terimlerini (önek olarak) içeren belgeleri puana göre sıralı döndür"""
+        terimler = tokenlara_ayir(sorgu)
+        if not terimler:
+            return []
+
+        puanlar: Optional[Dict[str, float]] = None
+        for terim in terimler:
+            terim_puanlari: Dict[str, float] = {}
+            for token in self._onek_eslesmeleri(terim):
+                # Tam eşleşme önek eşleşmesinden daha değerli
+                carpan = 1.0 if token == terim else 0.5
+                for belge_id, agirlik in self._kayitlar[token].items():
+                    terim_puanlari[belge_id] = terim_puanlari.get(belge_id, 0) + agirlik * carpan
+            if puanlar is None:
+                puanlar = terim_puanlari
+            else:
+                # Her terim eşleşmeli (VE)
+                puanlar = {belge_id: puan + terim_puanlari[belge_id]
+                           for belge_id, puan in puanlar.items() if belge_id in terim_puanlari}
+            if not puanlar:
+                return []
+
+        return sorted(puanlar.items(), key=lambda x: x[1], reverse=True)
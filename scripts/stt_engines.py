@@ -0,0 +1,233 @@
+"""
+Ses Tanıma Motorları
+Kaydedilmiş konuşmayı (speech_recognition.AudioData) metne çeviren motorlar
+ve ses profilindeki `ses_tanima_servisi` ile seçim yapan kayıt defteri.
+Google her konuşma sırası için ağ isteği atar; Vosk ve Sphinx yerel
+modelle çalışır, gecikmesi ağdan bağımsız ve öngörülebilirdir.
+
+Motorlar speech_recognition'ın hata sözleşmesini izler: anlaşılamayan ses
+için sr.UnknownValueError, servis / model hatası için sr.RequestError.
+
+Kullanım:
+    python stt_engines.py motorlar
+    python stt_engines.py tani <dosya.wav> [motor]
+    python stt_engines.py olcum <dosya.wav ...> [--motor motor ...]
+"""
+
+import json
+import statistics
+import sys
+import threading
+import time
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import speech_recognition as sr
+
+try:
+    from config import SPEECH_RECOGNITION_CONFIG
+except ImportError:
+    SPEECH_RECOGNITION_CONFIG = {
+        'language': 'tr-TR',
+        'vosk_model_dizini': Path(__file__).resolve().parent.parent / "models" / "vosk-model-small-tr-0.3"
+    }
+
+
+class SesTanici(ABC):
+    """Ses tanıma motoru arayüzü"""
+    ad = ""
+    # Ağ gerektirmeyen motorlar görüşme sırasında internet gecikmesinden etkilenmez
+    yerel = False
+
+    @abstractmethod
+    def tani(self, audio: "sr.AudioData", dil: str = "tr-TR") -> str:
+        """Konuşmayı metne çevir; anlaşılamazsa sr.UnknownValueError, servis hatasında sr.RequestError"""
+
+
+class GoogleTanici(SesTanici):
+    """Google Speech Recognition (çevrimiçi)"""
+    ad = "google"
+
+    def __init__(self):
+        self._recognizer = sr.Recognizer()
+
+    def tani(self, audio, dil="tr-TR"):
+        return self._recognizer.recognize_google(audio, language=dil)
+
+
+class SphinxTanici(SesTanici):
+    """CMU PocketSphinx (çevrimdışı; dil için pocketsphinx modeli kurulu olmalı)"""
+    ad = "sphinx"
+    yerel = True
+
+    def __init__(self):
+        import pocketsphinx  # noqa: F401 - kurulu değilse seçim aşamasında fark edilsin
+        self._recognizer = sr.Recognizer()
+
+    def tani(self, audio, dil="tr-TR"):
+        return self._recognizer.recognize_sphinx(audio, language=dil)
+
+
+class VoskTanici(SesTanici):
+    """Vosk / Kaldi (çevrimdışı)
+
+    Model bir kez yüklenip tüm görüşmelerce paylaşılır; her tanıma kendi
+    KaldiRecognizer nesnesini kullandığı için eşzamanlı çağrılar güvenlidir.
+    """
+    ad = "vosk"
+    yerel = True
+    ornekleme_hizi = 16000
+
+    def __init__(self, model_dizini: Optional[Path] = None):
+        import vosk
+        model_dizini = Path(model_dizini or SPEECH_RECOGNITION_CONFIG['vosk_model_dizini'])
+        if not model_dizini.exists():
+            raise FileNotFoundError(f"Vosk modeli bulunamadı: {model_dizini}. "
+                                    f"https://alphacephei.com/vosk/models adresinden Türkçe modeli indirin.")
+        vosk.SetLogLevel(-1)
+        self._vosk = vosk
+        self._model = vosk.Model(str(model_dizini))
+
+    def tani(self, audio, dil="tr-TR"):
+        tanici = self._vosk.KaldiRecognizer(self._model, self.ornekleme_hizi)
+        try:
+            tanici.AcceptWaveform(audio.get_raw_data(convert_rate=self.ornekleme_hizi, convert_width=2))
+            metin = json.loads(tanici.FinalResult()).get("text", "").strip()
+        except Exception as e:
+            raise sr.RequestError(f"Vosk tanıma hatası: {e}")
+        if not metin:
+            raise sr.UnknownValueError()
+        return metin
+
+
+TANICILAR = {
+    "google": GoogleTanici,
+    "vosk": VoskTanici,
+    "sphinx": SphinxTanici,
+}
+VARSAYILAN_TANICI = "google"
+
+_ornekler: Dict[str, SesTanici] = {}
+_ornek_kilidi = threading.Lock()
+
+
+def tanici_kaydet(ad: str, sinif):
+    """Yeni bir ses tanıma motorunu `ses_tanima_servisi` adıyla kaydet"""
+    TANICILAR[ad] = sinif
+    with _ornek_kilidi:
+        _ornekler.pop(ad, None)
+
+
+def tanici_getir(servis: Optional[str] = None) -> SesTanici:
+    """`ses_tanima_servisi` için motoru getir; motor bilinmiyor ya da kurulu değilse Google'a düş"""
+    servis = servis or VARSAYILAN_TANICI
+    with _ornek_kilidi:
+        motor = _ornekler.get(servis)
+        if motor is not None:
+            return motor
+        sinif = TANICILAR.get(servis)
+        if sinif is None:
+            print(f"Uyarı: '{servis}' ses tanıma motoru tanımlı değil. Google kullanılacak.")
+        else:
+            try:
+                motor = _ornekler[servis] = sinif()
+                return motor
+            except Exception as e:
+                print(f"Uyarı: '{servis}' ses tanıma motoru başlatılamadı ({e}). Google kullanılacak.")
+        if servis == VARSAYILAN_TANICI:
+            raise RuntimeError("Varsayılan ses tanıma motoru (Google) başlatılamadı.")
+    # Sonraki çağrılar aynı uyarıyı tekrarlamasın
+    motor = tanici_getir(VARSAYILAN_TANICI)
+    with _ornek_kilidi:
+        _ornekler[servis] = motor
+    return motor
+
+
+def wav_oku(dosya: Path) -> "sr.AudioData":
+    """WAV / AIFF / FLAC dosyasını tanımaya hazır ses verisi olarak oku"""
+    with sr.AudioFile(str(dosya)) as kaynak:
+        return sr.Recognizer().record(kaynak)
+
+
+def gecikme_karsilastir(dosyalar: List[Path], motorlar: Optional[List[str]] = None,
+                        dil: str = SPEECH_RECOGNITION_CONFIG['language']) -> Dict[str, Dict]:
+    """Motorların aynı kayıtlar üzerindeki tanıma gecikmesini (ms) ve çıktılarını karşılaştır"""
+    kayitlar = [(Path(dosya).name, wav_oku(dosya)) for dosya in dosyalar]
+    sonuclar = {}
+    for ad in motorlar or list(TANICILAR):
+        try:
+            motor = TANICILAR[ad]()
+        except Exception as e:
+            sonuclar[ad] = {"hata": str(e)}
+            continue
+
+        sureler = []
+        metinler = {}
+        for dosya_adi, audio in kayitlar:
+            baslangic = time.perf_counter()
+            try:
+                metinler[dosya_adi] = motor.tani(audio, dil)
+            except sr.UnknownValueError:
+                metinler[dosya_adi] = None
+            except sr.RequestError as e:
+                metinler[dosya_adi] = f"HATA: {e}"
+            sureler.append((time.perf_counter() - baslangic) * 1000)
+
+        sureler.sort()
+        sonuclar[ad] = {
+            "yerel": motor.yerel,
+            "ornek_sayisi": len(sureler),
+            "ortalama_ms": statistics.fmean(sureler) if sureler else 0.0,
+            "p50_ms": sureler[len(sureler) // 2] if sureler else 0.0,
+            "p95_ms": sureler[min(len(sureler) - 1, int(len(sureler) * 0.95))] if sureler else 0.0,
+            "metinler": metinler
+        }
+    return sonuclar
+
+
+def main():
+    """Ana fonksiyon"""
+    if len(sys.argv) < 2:
+        print(__doc__)
+        return
+
+    komut = sys.argv[1].lower()
+    if komut == "motorlar":
+        for ad, sinif in TANICILAR.items():
+            print(f"  {ad}: {sinif.__doc__.splitlines()[0]}")
+    elif komut == "tani":
+        if len(sys.argv) < 3:
+            print("❌ WAV dosyası belirtilmedi!")
+            return
+        motor = tanici_getir(sys.argv[3] if len(sys.argv) > 3 else None)
+        try:
+            print(f"🗣️ {motor.tani(wav_oku(Path(sys.argv[2])), SPEECH_RECOGNITION_CONFIG['language'])}")
+        except sr.UnknownValueError:
+            print("❌ Ses anlaşılamadı")
+        except sr.RequestError as e:
+            print(f"❌ {motor.ad} ses tanıma hatası: {e}")
+    elif komut == "olcum":
+        argumanlar = sys.argv[2:]
+        motorlar = None
+        if "--motor" in argumanlar:
+            ayrac = argumanlar.index("--motor")
+            argumanlar, motorlar = argumanlar[:ayrac], argumanlar[ayrac + 1:]
+        if not argumanlar:
+            print("❌ WAV dosyası belirtilmedi!")
+            return
+        for ad, sonuc in gecikme_karsilastir([Path(a) for a in argumanlar], motorlar).items():
+            if "hata" in sonuc:
+                print(f"❌ {ad}: {sonuc['hata']}")
+                continue
+            print(f"⏱️ {ad:7s} ort={sonuc['ortalama_ms']:.0f} ms  p50={sonuc['p50_ms']:.0f} ms  "
+                  f"p95={sonuc['p95_ms']:.0f} ms  ({'yerel' if sonuc['yerel'] else 'ağ'})")
+            for dosya_adi, metin in sonuc["metinler"].items():
+                print(f"     {dosya_adi}: {metin}")
+    else:
+        print(f"❌ Bilinmeyen komut: {komut}")
+        print(__doc__)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,362 @@
+"""
+Seslendirme Önbelleği
+Sentezlenmiş ses verisini (metin, dil, ses profili) içeriğinden üretilen
+anahtarla saklar. Sık kullanılan kayıtlar bellekte, tümü diskte tutulur; her
+iki katman da bayt sınırlı LRU'dur. Temsilcinin sabit istemleri başlangıçta
+arka planda sentezlenir, böylece görüşme sırasında ağ beklemeden çalınır.
+
+Kullanım:
+    python tts_cache.py isit [ses_profili]
+    python tts_cache.py istemler
+    python tts_cache.py temizle
+"""
+
+import ast
+import hashlib
+import json
+import os
+import sys
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+try:
+    from config import TTS_ONBELLEGI_CONFIG
+except ImportError:
+    TTS_ONBELLEGI_CONFIG = {
+        'dizin': Path(__file__).resolve().parent.parent / "data" / "tts_onbellegi",
+        'bellek_mb': 32,
+        'disk_mb': 256,
+        'pcm_mb': 64,
+        'on_isitma': True,
+        'on_isitma_isci_sayisi': 4
+    }
+
+from tts_engines import sentezle
+
+# Sentezlenen sesi değiştiren profil ayarları; ses seviyesi oynatmada uygulandığı için anahtara girmez
+SENTEZ_AYARLARI = ("ses_tipi", "hiz", "pitch", "ses_kalitesi")
+
+MB = 1024 * 1024
+
+
+class SesOnbellegi:
+    """Bellek + disk katmanlı, bayt sınırlı, thread-safe ses verisi (mp3 / wav) önbelleği
+
+    Oynatma için çözülmüş ses (ham PCM) ayrı bir bayt sınırlı LRU katmanında
+    tutulur; tekrar eden istemler ne sentezlenir ne de yeniden çözülür.
+    """
+
+    def __init__(self, dizin: Optional[Path] = None, bellek_sinir_mb: float = TTS_ONBELLEGI_CONFIG['bellek_mb'],
+                 disk_sinir_mb: float = TTS_ONBELLEGI_CONFIG['disk_mb'],
+                 pcm_sinir_mb: float = TTS_ONBELLEGI_CONFIG['pcm_mb']):
+        self.dizin = Path(dizin) if dizin else None
+        self.bellek_siniri = int(bellek_sinir_mb * MB)
+        self.disk_siniri = int(disk_sinir_mb * MB)
+        self.pcm_siniri = int(pcm_sinir_mb * MB)
+
+        self._bellek: "OrderedDict[str, bytes]" = OrderedDict()
+        self._bellek_boyutu = 0
+        # Diskteki dosyaların boyutları, en eski erişilen başta
+        self._disk: "OrderedDict[str, int]" = OrderedDict()
+        self._disk_boyutu = 0
+        # Çözülmüş sesler ve PCM bayt boyutları
+        self._pcm: "OrderedDict[str, Tuple[Any, int]]" = OrderedDict()
+        self._pcm_boyutu = 0
+        self._kilit = threading.Lock()
+        # Aynı metin için eşzamanlı sentez isteklerini tek sentezde birleştirmek için
+        self._uretimdekiler: Dict[str, threading.Event] = {}
+        self.pcm_isabet = 0
+        self.bellek_isabet = 0
+        self.disk_isabet = 0
+        self.iska = 0
+        self.cikarilan = 0
+
+        if self.dizin and self.dizin.exists():
+            self._diski_tara()
+
+    def __len__(self) -> int:
+        return len(self._disk) if self.dizin else len(self._bellek)
+
+    @staticmethod
+    def anahtar(metin: str, ses_ayarlari: Dict) -> str:
+        """Metin, dil ve ses profilinden içerik adresli anahtar üret"""
+        bilesenler = [metin, ses_ayarlari.get("dil", "tr")] + [ses_ayarlari.get(ayar) for ayar in SENTEZ_AYARLARI]
+        return hashlib.sha256(json.dumps(bilesenler, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+    def _dosya(self, anahtar: str) -> Path:
+        return self.dizin / f"{anahtar}.ses"
+
+    def _diski_tara(self):
+        dosyalar = []
+        for dosya in self.dizin.glob("*.ses"):
+            try:
+                bilgi = dosya.stat()
+            except OSError:
+                continue
+            dosyalar.append((bilgi.st_mtime, dosya.stem, bilgi.st_size))
+        with self._kilit:
+            for _, anahtar, boyut in sorted(dosyalar):
+                self._disk[anahtar] = boyut
+                self._disk_boyutu += boyut
+            self._disk_sinirla()
+
+    def _bellege_ekle(self, anahtar: str, veri: bytes):
+        eski = self._bellek.pop(anahtar, None)
+        if eski is not None:
+            self._bellek_boyutu -= len(eski)
+        if len(veri) > self.bellek_siniri:
+            return
+        self._bellek[anahtar] = veri
+        self._bellek_boyutu += len(veri)
+        while self._bellek_boyutu > self.bellek_siniri:
+            _, cikan = self._bellek.popitem(last=False)
+            self._bellek_boyutu -= len(cikan)
+
+    def _disk_sinirla(self):
+        while self._disk_boyutu > self.disk_siniri and self._disk:
+            anahtar, boyut = self._disk.popitem(last=False)
+            self._disk_boyutu -= boyut
+            self.cikarilan += 1
+            try:
+                os.remove(self._dosya(anahtar))
+            except OSError:
+                pass
+
+    def getir(self, anahtar: str) -> Optional[bytes]:
+        """Kayıt varsa önce bellekten, yoksa diskten getir"""
+        with self._kilit:
+            veri = self._bellek.get(anahtar)
+            if veri is not None:
+                self._bellek.move_to_end(anahtar)
+                if anahtar in self._disk:
+                    self._disk.move_to_end(anahtar)
+                self.bellek_isabet += 1
+                return veri
+            diskte = anahtar in self._disk
+        if diskte:
+            try:
+                veri = self._dosya(anahtar).read_bytes()
+                os.utime(self._dosya(anahtar))
+            except OSError:
+                veri = None
+        with self._kilit:
+            if veri is None:
+                # Dosya dışarıdan silinmiş olabilir
+                boyut = self._disk.pop(anahtar, None) if diskte else None
+                if boyut is not None:
+                    self._disk_boyutu -= boyut
+                self.iska += 1
+                return None
+            if anahtar in self._disk:
+                self._disk.move_to_end(anahtar)
+            self._bellege_ekle(anahtar, veri)
+            self.disk_isabet += 1
+            return veri
+
+    def ekle(self, anahtar: str, veri: bytes):
+        """Kaydı belleğe ve (dizin tanımlıysa) diske yaz; sınır aşılırsa en eskileri çıkar"""
+        if self.dizin and len(veri) <= self.disk_siniri:
+            try:
+                self.dizin.mkdir(parents=True, exist_ok=True)
+                gecici = self._dosya(anahtar).with_suffix(f".{threading.get_ident()}.tmp")
+                gecici.write_bytes(veri)
+                os.replace(gecici, self._dosya(anahtar))
+            except OSError as e:
+                print(f"Ses önbelleği diske yazılamadı: {e}")
+            else:
+                with self._kilit:
+                    self._disk_boyutu += len(veri) - self._disk.pop(anahtar, 0)
+                    self._disk[anahtar] = len(veri)
+                    self._disk_sinirla()
+        with self._kilit:
+            self._bellege_ekle(anahtar, veri)
+
+    def ses_verisi(self, metin: str, ses_ayarlari: Dict,
+                   sentezleyici: Callable[[str, Dict], bytes] = sentezle) -> bytes:
+        """Metnin ses verisini önbellekten getir; yoksa profilin motoruyla sentezleyip önbelleğe ekle"""
+        anahtar = self.anahtar(metin, ses_ayarlari)
+        while True:
+            veri = self.getir(anahtar)
+            if veri is not None:
+                return veri
+            with self._kilit:
+                bekleyen = self._uretimdekiler.get(anahtar)
+                if bekleyen is None:
+                    self._uretimdekiler[anahtar] = threading.Event()
+                    break
+            # Aynı metni başka bir iş parçacığı sentezliyor; bitince önbellekten oku (hata verdiyse kendimiz deneriz)
+            bekleyen.wait()
+        try:
+            veri = sentezleyici(metin, ses_ayarlari)
+            self.ekle(anahtar, veri)
+            return veri
+        finally:
+            with self._kilit:
+                olay = self._uretimdekiler.pop(anahtar)
+            olay.set()
+
+    def cozulmus_ses(self, metin: str, ses_ayarlari: Dict, cozucu: Callable[[bytes], Any],
+                     sentezleyici: Callable[[str, Dict], bytes] = sentezle) -> Any:
+        """Metnin çalınmaya hazır (çözülmüş) sesini getir; yoksa ses verisini alıp `cozucu` ile çöz"""
+        anahtar = self.anahtar(metin, ses_ayarlari)
+        with self._kilit:
+            kayit = self._pcm.get(anahtar)
+            if kayit is not None:
+                self._pcm.move_to_end(anahtar)
+                self.pcm_isabet += 1
+                return kayit[0]
+
+        veri = self.ses_verisi(metin, ses_ayarlari, sentezleyici)
+        ses = cozucu(veri)
+        boyut = len(getattr(ses, "raw_data", b"")) or len(veri)
+        if boyut <= self.pcm_siniri:
+            with self._kilit:
+                eski = self._pcm.pop(anahtar, None)
+                if eski is not None:
+                    self._pcm_boyutu -= eski[1]
+                self._pcm[anahtar] = (ses, boyut)
+                self._pcm_boyutu += boyut
+                while self._pcm_boyutu > self.pcm_siniri:
+                    _, (_, cikan) = self._pcm.popitem(last=False)
+                    self._pcm_boyutu -= cikan
+        return ses
+
+    def on_isit(self, metinler: Iterable[str], ses_ayarlari: Dict,
+                sentezleyici: Callable[[str, Dict], bytes] = sentezle,
+                isci_sayisi: int = TTS_ONBELLEGI_CONFIG['on_isitma_isci_sayisi'],
+                hazirlayici: Optional[Callable[[str], Any]] = None) -> int:
+        """Metinleri önceden sentezle; önbellekte bulunan metin sayısını döndür
+
+        `hazirlayici` verilirse her metin onunla hazırlanır (ör. sentez + PCM'e çözme).
+        """
+        def isit(metin):
+            try:
+                if hazirlayici is not None:
+                    hazirlayici(metin)
+                else:
+                    self.ses_verisi(metin, ses_ayarlari, sentezleyici)
+                return True
+            except Exception as e:
+                print(f"Ön ısıtma sentezi başarısız ({metin[:30]}...): {e}")
+                return False
+
+        with ThreadPoolExecutor(max_workers=isci_sayisi, thread_name_prefix="tts-isitma") as havuz:
+            return sum(havuz.map(isit, list(dict.fromkeys(metinler))))
+
+    def temizle(self):
+        """Bellek ve disk kayıtlarını sil, sayaçları sıfırla"""
+        with self._kilit:
+            anahtarlar = list(self._disk)
+            self._pcm.clear()
+            self._bellek.clear()
+            self._disk.clear()
+            self._pcm_boyutu = self._bellek_boyutu = self._disk_boyutu = 0
+            self.pcm_isabet = self.bellek_isabet = self.disk_isabet = self.iska = self.cikarilan = 0
+        for anahtar in anahtarlar:
+            try:
+                os.remove(self._dosya(anahtar))
+            except OSError:
+                pass
+
+    def istatistikler(self) -> Dict:
+        """İsabet/ıska sayaçları ve katman doluluğu"""
+        with self._kilit:
+            toplam = self.bellek_isabet + self.disk_isabet + self.iska
+            return {
+                "pcm_kayit": len(self._pcm),
+                "pcm_mb": self._pcm_boyutu / MB,
+                "pcm_isabet": self.pcm_isabet,
+                "bellek_kayit": len(self._bellek),
+                "bellek_mb": self._bellek_boyutu / MB,
+                "disk_kayit": len(self._disk),
+                "disk_mb": self._disk_boyutu / MB,
+                "bellek_isabet": self.bellek_isabet,
+                "disk_isabet": self.disk_isabet,
+                "iska": self.iska,
+                "cikarilan": self.cikarilan,
+                "isabet_orani": (self.bellek_isabet + self.disk_isabet) / toplam if toplam else 0.0
+            }
+
+
+def sabit_istemler() -> List[str]:
+    """Görüşme akışında sabit metinle seslendirilen istemleri topla
+
+    voice_call_center.py içindeki `seslendir("...")` çağrıları ve yönlendirme
+    tablosunun netleştirme istemleri okunur; f-string gibi değişken metinler atlanır.
+    """
+    kaynak = Path(__file__).resolve().parent / "voice_call_center.py"
+    istemler = []
+    for dugum in ast.walk(ast.parse(kaynak.read_text(encoding="utf-8"))):
+        if (isinstance(dugum, ast.Call) and isinstance(dugum.func, ast.Attribute)
+                and dugum.func.attr == "seslendir" and dugum.args
+                and isinstance(dugum.args[0], ast.Constant) and isinstance(dugum.args[0].value, str)):
+            istemler.append(dugum.args[0].value)
+
+    from intent_router import BELIRSIZ_TALEP_ISTEMI, YONLENDIRME_TABLOSU
+    istemler.append(BELIRSIZ_TALEP_ISTEMI)
+    istemler.extend(tanim["anlasilamadi"] for tanim in YONLENDIRME_TABLOSU.values()
+                    if isinstance(tanim, dict) and tanim.get("anlasilamadi"))
+    return list(dict.fromkeys(istemler))
+
+
+_isitilan_profiller = set()
+_isitma_kilidi = threading.Lock()
+
+
+def on_isitmayi_baslat(ses_ayarlari: Dict, hazirlayici: Optional[Callable[[str], Any]] = None
+                       ) -> Optional[threading.Thread]:
+    """Sabit istemleri arka planda sentezlemeye başla (her ses profili için bir kez)"""
+    if not TTS_ONBELLEGI_CONFIG.get('on_isitma', True):
+        return None
+    profil = ses_onbellegi.anahtar("", ses_ayarlari)
+    with _isitma_kilidi:
+        if profil in _isitilan_profiller:
+            return None
+        _isitilan_profiller.add(profil)
+    ayarlar = dict(ses_ayarlari)
+    is_parcacigi = threading.Thread(target=lambda: ses_onbellegi.on_isit(sabit_istemler(), ayarlar,
+                                                                         hazirlayici=hazirlayici),
+                                    name="TTSOnIsitma", daemon=True)
+    is_parcacigi.start()
+    return is_parcacigi
+
+
+# Global instance
+ses_onbellegi = SesOnbellegi(
+    dizin=TTS_ONBELLEGI_CONFIG['dizin'],
+    bellek_sinir_mb=TTS_ONBELLEGI_CONFIG['bellek_mb'],
+    disk_sinir_mb=TTS_ONBELLEGI_CONFIG['disk_mb'],
+    pcm_sinir_mb=TTS_ONBELLEGI_CONFIG['pcm_mb']
+)
+
+
+def main():
+    """Ana fonksiyon"""
+    if len(sys.argv) < 2:
+        print(__doc__)
+        return
+
+    komut = sys.argv[1].lower()
+    if komut == "istemler":
+        for istem in sabit_istemler():
+            print(f"  • {istem}")
+    elif komut == "isit":
+        from voice_config import ses_yoneticisi
+        profil = sys.argv[2] if len(sys.argv) > 2 else "varsayilan"
+        istemler = sabit_istemler()
+        hazir = ses_onbellegi.on_isit(istemler, ses_yoneticisi.profil_yukle(profil))
+        print(f"✅ {hazir}/{len(istemler)} istem önbellekte")
+        print(f"📊 {ses_onbellegi.istatistikler()}")
+    elif komut == "temizle":
+        ses_onbellegi.temizle()
+        print("✅ Ses önbelleği temizlendi")
+    else:
+        print(f"❌ Bilinmeyen komut: {komut}")
+        print(__doc__)
+
+
+if __name__ == "__main__":
+    main()
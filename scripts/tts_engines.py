@@ -0,0 +1,228 @@
+"""
+Seslendirme Motorları
+Metni ses verisine çeviren motorlar ve ses profilindeki `ses_tipi` ile seçim
+yapan kayıt defteri. gTTS her cümle için Google'a istek atar; pyttsx3 ise
+işletim sisteminin yerel sentezleyicisini (Linux'ta eSpeak, Windows'ta SAPI5,
+macOS'ta NSSpeechSynthesizer) kullanır, ağ gecikmesine bağlı değildir.
+
+Kullanım:
+    python tts_engines.py motorlar
+    python tts_engines.py olcum [tekrar] [motor ...]
+"""
+
+import io
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional
+
+
+def ses_bicimi(veri: bytes) -> str:
+    """Ses verisinin biçimini başlığından belirle (wav / mp3)"""
+    return "wav" if veri[:4] == b"RIFF" else "mp3"
+
+
+class SesSentezleyici(ABC):
+    """Seslendirme motoru arayüzü"""
+    ad = ""
+    # Ağ gerektirmeyen motorlar görüşme sırasında internet gecikmesinden etkilenmez
+    yerel = False
+
+    @abstractmethod
+    def sentezle(self, metin: str, ses_ayarlari: Dict) -> bytes:
+        """Metni profil ayarlarıyla sentezleyip ses dosyası verisi (mp3 / wav) olarak döndür"""
+
+
+class GttsSentezleyici(SesSentezleyici):
+    """Google Text-to-Speech (çevrimiçi, MP3)"""
+    ad = "gtts"
+
+    def __init__(self):
+        from gtts import gTTS
+        self._gtts = gTTS
+
+    def sentezle(self, metin: str, ses_ayarlari: Dict) -> bytes:
+        tampon = io.BytesIO()
+        self._gtts(text=metin, lang=ses_ayarlari.get("dil", "tr"), slow=False).write_to_fp(tampon)
+        return tampon.getvalue()
+
+
+class Pyttsx3Sentezleyici(SesSentezleyici):
+    """İşletim sisteminin yerel sentezleyicisi (çevrimdışı, WAV)
+
+    pyttsx3 motoru iş parçacığı güvenli olmadığından tüm sentezler tek motor
+    üzerinden sırayla yapılır.
+    """
+    ad = "pyttsx3"
+    yerel = True
+    # pyttsx3 varsayılan konuşma hızı (kelime/dakika); profildeki 'hiz' bununla çarpılır
+    temel_hiz = 175
+
+    def __init__(self):
+        import pyttsx3
+        self._motor = pyttsx3.init()
+        self._kilit = threading.Lock()
+        self._sesler: Dict[str, Optional[str]] = {}
+
+    def _ses_bul(self, dil: str) -> Optional[str]:
+        """Dile uygun yüklü sesin kimliğini bul"""
+        if dil not in self._sesler:
+            self._sesler[dil] = None
+            for ses in self._motor.getProperty("voices") or []:
+                diller = [d.decode("utf-8", "ignore") if isinstance(d, bytes) else str(d)
+                          for d in (getattr(ses, "languages", None) or [])]
+                etiketler = " ".join(diller + [str(ses.id), str(getattr(ses, "name", ""))]).lower()
+                if dil.lower() in diller or f"{dil.lower()}-" in etiketler or "turkish" in etiketler:
+                    self._sesler[dil] = ses.id
+                    break
+        return self._sesler[dil]
+
+    def sentezle(self, metin: str, ses_ayarlari: Dict) -> bytes:
+        with tempfile.NamedTemporaryFile(delete=False, suffix=".wav") as fp:
+            wav_dosyasi = fp.name
+        try:
+            with self._kilit:
+                ses_id = self._ses_bul(ses_ayarlari.get("dil", "tr"))
+                if ses_id:
+                    self._motor.setProperty("voice", ses_id)
+                self._motor.setProperty("rate", int(self.temel_hiz * ses_ayarlari.get("hiz", 1.0)))
+                # pyttsx3 yalnızca dosyaya yazabildiği için çıktı okunup hemen silinir
+                self._motor.save_to_file(metin, wav_dosyasi)
+                self._motor.runAndWait()
+            with open(wav_dosyasi, "rb") as f:
+                return f.read()
+        finally:
+            try:
+                os.remove(wav_dosyasi)
+            except OSError:
+                pass
+
+
+SENTEZLEYICILER = {
+    "gtts": GttsSentezleyici,
+    "pyttsx3": Pyttsx3Sentezleyici,
+}
+VARSAYILAN_SENTEZLEYICI = "gtts"
+
+_ornekler: Dict[str, SesSentezleyici] = {}
+_ornek_kilidi = threading.Lock()
+
+
+def sentezleyici_kaydet(ad: str, sinif):
+    """Yeni bir seslendirme motorunu `ses_tipi` adıyla kaydet"""
+    SENTEZLEYICILER[ad] = sinif
+    with _ornek_kilidi:
+        _ornekler.pop(ad, None)
+
+
+def sentezleyici_getir(ses_tipi: Optional[str] = None) -> SesSentezleyici:
+    """`ses_tipi` için motoru getir; motor bilinmiyor ya da kurulu değilse gTTS'e düş"""
+    ses_tipi = ses_tipi or VARSAYILAN_SENTEZLEYICI
+    with _ornek_kilidi:
+        motor = _ornekler.get(ses_tipi)
+        if motor is not None:
+            return motor
+        sinif = SENTEZLEYICILER.get(ses_tipi)
+        if sinif is None:
+            print(f"Uyarı: '{ses_tipi}' seslendirme motoru tanımlı değil. gTTS kullanılacak.")
+        else:
+            try:
+                motor = _ornekler[ses_tipi] = sinif()
+                return motor
+            except Exception as e:
+                print(f"Uyarı: '{ses_tipi}' seslendirme motoru başlatılamadı ({e}). gTTS kullanılacak.")
+        if ses_tipi == VARSAYILAN_SENTEZLEYICI:
+            raise RuntimeError("Varsayılan seslendirme motoru (gTTS) başlatılamadı.")
+    # Sonraki çağrılar aynı uyarıyı tekrarlamasın
+    motor = sentezleyici_getir(VARSAYILAN_SENTEZLEYICI)
+    with _ornek_kilidi:
+        _ornekler[ses_tipi] = motor
+    return motor
+
+
+def sentezle(metin: str, ses_ayarlari: Dict) -> bytes:
+    """Metni profilin `ses_tipi` motoruyla sentezle"""
+    return sentezleyici_getir(ses_ayarlari.get("ses_tipi")).sentezle(metin, ses_ayarlari)
+
+
+def gecikme_karsilastir(metinler: List[str], motorlar: Optional[List[str]] = None, tekrar: int = 3,
+                        ses_ayarlari: Optional[Dict] = None) -> Dict[str, Dict]:
+    """Motorların sentez gecikmesini (ms) önbelleği atlayarak ölç
+
+    İlk sentez motorun ısınmasını içerdiği için ayrıca raporlanır.
+    """
+    ses_ayarlari = dict(ses_ayarlari or {"dil": "tr", "hiz": 1.0})
+    sonuclar = {}
+    for ad in motorlar or list(SENTEZLEYICILER):
+        try:
+            motor = SENTEZLEYICILER[ad]()
+        except Exception as e:
+            sonuclar[ad] = {"hata": str(e)}
+            continue
+
+        sureler = []
+        ilk_ms = None
+        try:
+            for _ in range(tekrar):
+                for metin in metinler:
+                    baslangic = time.perf_counter()
+                    motor.sentezle(metin, ses_ayarlari)
+                    sure = (time.perf_counter() - baslangic) * 1000
+                    if ilk_ms is None:
+                        ilk_ms = sure
+                    else:
+                        sureler.append(sure)
+        except Exception as e:
+            sonuclar[ad] = {"hata": str(e)}
+            continue
+
+        sureler = sorted(sureler) or [ilk_ms]
+        sonuclar[ad] = {
+            "yerel": motor.yerel,
+            "ornek_sayisi": len(sureler),
+            "ilk_ms": ilk_ms,
+            "ortalama_ms": statistics.fmean(sureler),
+            "p50_ms": sureler[len(sureler) // 2],
+            "p95_ms": sureler[min(len(sureler) - 1, int(len(sureler) * 0.95))],
+            "ms_per_karakter": statistics.fmean(sureler) / statistics.fmean(len(m) for m in metinler)
+        }
+    return sonuclar
+
+
+def main():
+    """Ana fonksiyon"""
+    if len(sys.argv) < 2:
+        print(__doc__)
+        return
+
+    komut = sys.argv[1].lower()
+    if komut == "motorlar":
+        for ad, sinif in SENTEZLEYICILER.items():
+            print(f"  {ad}: {sinif.__doc__.splitlines()[0]}")
+    elif komut == "olcum":
+        from tts_cache import sabit_istemler
+        try:
+            tekrar = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+        except ValueError:
+            print("❌ Tekrar sayısı tam sayı olmalı!")
+            return
+        motorlar = sys.argv[3:] or None
+        metinler = sabit_istemler()
+        for ad, sonuc in gecikme_karsilastir(metinler, motorlar, tekrar).items():
+            if "hata" in sonuc:
+                print(f"❌ {ad}: {sonuc['hata']}")
+                continue
+            print(f"⏱️ {ad:8s} ilk={sonuc['ilk_ms']:.0f} ms  ort={sonuc['ortalama_ms']:.0f} ms  "
+                  f"p50={sonuc['p50_ms']:.0f} ms  p95={sonuc['p95_ms']:.0f} ms  "
+                  f"({sonuc['ms_per_karakter']:.2f} ms/karakter, {'yerel' if sonuc['yerel'] else 'ağ'})")
+    else:
+        print(f"❌ Bilinmeyen komut: {komut}")
+        print(__doc__)
+
+
+if __name__ == "__main__":
+    main()
@@ -70,25 +70,333 @@ except ImportError:
 setup_ffmpeg_paths()
 
 from pydub import AudioSegment
+import io
 import json
+import queue
+import re
+import threading
 import time
 import wave
 import speech_recognition as sr
 from gtts import gTTS
-from transformers import BertTokenizer, BertForSequenceClassification
-import torch
+from transformers import BertTokenizer
 import pyaudio
 from pydub.playback import play
+from intent_classifier import TopluSiniflandirici, metin_normalize
+from prediction_cache import TahminOnbellegi
+from customer_directory import musteri_rehberi
+from inference_backends import calistirici_olustur, model_imzasi
+from call_channels import Kanal
+from intent_router import evet_hayir_coz, yonlendirici
+from bill_analysis import fatura_analizi_yaniti
+from tts_cache import on_isitmayi_baslat, ses_onbellegi
+from tts_engines import ses_bicimi
+from stt_engines import tanici_getir
+from noise_calibration import GurultuKalibratoru
+
+def siniflandirici_olustur():
+    """BERTurk modelini yükleyip paylaşılabilir toplu sınıflandırma servisini oluştur"""
+    try:
+        model_path = BERTURK_CAGRI_MODEL_DIR
+        if not model_path.exists():
+            print(f"Uyarı: Model dizini bulunamadı: {model_path}")
+            print("Lütfen model dosyalarının doğru konumda olduğundan emin olun.")
+            return None
+
+        # Çıkarım arka ucu INFERENCE_CONFIG'den seçilir (torch / onnx / onnx-int8)
+        calistirici = calistirici_olustur(model_dir=model_path)
+        tokenizer = BertTokenizer.from_pretrained(str(model_path))
+        onbellek = TahminOnbellegi(
+            kapasite=TAHMIN_ONBELLEGI_CONFIG['kapasite'],
+            dosya=TAHMIN_ONBELLEGI_CONFIG['dosya'] if TAHMIN_ONBELLEGI_CONFIG['kalici'] else None,
+            imza=model_imzasi(calistirici, model_path)
+        )
+        return TopluSiniflandirici(calistirici, tokenizer, onbellek=onbellek)
+    except Exception as e:
+        print(f"Model yükleme hatası: {e}")
+        return None
+
+
+def tanici_olustur(ses_ayarlari):
+    """Profil ayarlarıyla yapılandırılmış bir tanıyıcı oluştur"""
+    recognizer = sr.Recognizer()
+    recognizer.energy_threshold = ses_ayarlari.get("mikrofon_enerji_esigi", 4000)
+    recognizer.dynamic_energy_threshold = ses_ayarlari.get("ses_tanima_dynamic_energy_threshold", True)
+    recognizer.pause_threshold = ses_ayarlari.get("ses_tanima_pause_threshold", 0.8)
+    recognizer.non_speaking_duration = ses_ayarlari.get("ses_tanima_non_speaking_duration", 0.5)
+    recognizer.phrase_threshold = ses_ayarlari.get("ses_tanima_phrase_threshold", 0.3)
+    return recognizer
+
+
+def cumlelere_bol(metin):
+    """Seslendirilecek metni cümle ve satırlara böl (ondalık sayılardaki noktalar bölünmez)"""
+    parcalar = re.split(r"(?<=[.!?…])\s+|\n+", metin)
+    return [parca.strip() for parca in parcalar if parca.strip()]
+
+
+def _sesi_coz(veri):
+    """Ses verisini (mp3 / wav) geçici dosya olmadan bellekte ham PCM'e çöz"""
+    from pydub import AudioSegment
+    return AudioSegment.from_file(io.BytesIO(veri), format=ses_bicimi(veri))
+
+
+def _ses_hazirla(metin, ses_ayarlari):
+    """Metni profilin oynatıcısına hazırla: pydub için çözülmüş ses, playsound için ses dosyası verisi"""
+    if ses_ayarlari.get("ses_oynatma", "pydub") == "playsound":
+        return ses_onbellegi.ses_verisi(metin, ses_ayarlari)
+    # Aynı metin + profil daha önce çalındıysa çözülmüş hali yeniden kullanılır
+    return ses_onbellegi.cozulmus_ses(metin, ses_ayarlari, _sesi_coz)
+
+
+def ses_isitici(ses_ayarlari):
+    """Ön ısıtmada istemleri oynatmaya hazır hale getiren fonksiyon"""
+    return lambda metin: _ses_hazirla(metin, ses_ayarlari)
+
+
+def _sesi_oynat(ses, ses_ayarlari, ui=None):
+    """_ses_hazirla ile hazırlanan sesi profilin oynatıcısıyla çal"""
+    ses_seviyesi = ses_ayarlari.get("ses_seviyesi", 1.0)
+    ses_oynatma = ses_ayarlari.get("ses_oynatma", "pydub")
+
+    # Ses oynatma
+    try:
+        if ses_oynatma == "pydub":
+            from pydub.playback import play
+            logger.debug("pydub ile ses oynatılıyor...")
+            sound = ses
+            
+            # Ses seviyesi ayarı
+            if ses_seviyesi != 1.0:
+                sound = sound + (20 * (ses_seviyesi - 1.0))  # dB cinsinden ayar
+            
+            play(sound)
+        elif ses_oynatma == "playsound":
+            from playsound import playsound
+            logger.debug("playsound ile ses oynatılıyor...")
+            _dosyadan_oynat(ses, playsound)
+        else:
+            # Varsayılan pydub
+            from pydub.playback import play
+            logger.debug("Varsayılan pydub ile ses oynatılıyor...")
+            play(ses)
+            
+    except Exception as e:
+        log_audio_error(logger, e, "Ses oynatma hatası")
+        print(f"Ses oynatma hatası: {e}")
+        if ui:
+            ui.add_message("Sistem", f"Ses oynatılamadı: {e}", "system")
+
+
+def _dosyadan_oynat(veri, oynatici):
+    """Yalnızca dosya yolu kabul eden oynatıcılar için: sesi geçici dosyaya yazıp çal, sonra sil"""
+    # Geçici dosya oluştur
+    uzanti = ses_bicimi(veri)
+    if ses_yoneticisi:
+        ses_dosyasi = ses_yoneticisi.gecici_dosya_olustur(uzanti)
+    else:
+        import tempfile
+        with tempfile.NamedTemporaryFile(delete=False, suffix=f'.{uzanti}') as fp:
+            ses_dosyasi = fp.name
+    
+    logger.debug(f"Geçici dosya oluşturuldu: {ses_dosyasi}")
+    try:
+        with open(ses_dosyasi, "wb") as f:
+            f.write(veri)
+        oynatici(ses_dosyasi)
+    finally:
+        # Geçici dosyayı temizle
+        if ses_yoneticisi:
+            ses_yoneticisi.gecici_dosya_sil(ses_dosyasi)
+        else:
+            try:
+                os.remove(ses_dosyasi)
+                logger.debug("Geçici dosya silindi")
+            except Exception as e:
+                logger.warning(f"Geçici dosya silinemedi: {e}")
+
+
+_AKIS_SONU = object()
+
+
+def _akisla_seslendir(cumleler, ses_ayarlari, ui=None):
+    """Cümle N çalarken cümle N+1'i sentezleyip çöz; ilk ses için yalnızca ilk cümle beklenir
+
+    Üretici iş parçacığı sentezlenen cümleleri sınırlı bir kuyruğa koyar, çağıran
+    iş parçacığı sırayla çalar. Kuyruk doluysa üretici oynatmanın ilerlemesini bekler.
+    """
+    kuyruk = queue.Queue(maxsize=SESLENDIRME_CONFIG['kuyruk_boyutu'])
+    durdur = threading.Event()
+
+    def koy(oge):
+        while not durdur.is_set():
+            try:
+                kuyruk.put(oge, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def uret():
+        try:
+            for cumle in cumleler:
+                try:
+                    oge = _ses_hazirla(cumle, ses_ayarlari)
+                except Exception as e:
+                    oge = e
+                if not koy(oge):
+                    return
+        finally:
+            koy(_AKIS_SONU)
+
+    baslangic = time.time()
+    threading.Thread(target=uret, name="TTSUretici", daemon=True).start()
+    ilk = True
+    try:
+        while True:
+            oge = kuyruk.get()
+            if oge is _AKIS_SONU:
+                break
+            if isinstance(oge, Exception):
+                # Sentezlenemeyen cümle atlanır, kalan cümleler çalınmaya devam eder
+                log_audio_error(logger, oge, "Cümle seslendirilemedi")
+                if ui:
+                    ui.add_message("Sistem", f"Seslendirilemedi: {oge}", "system")
+                continue
+            if ilk:
+                log_performance(logger, "İlk ses", time.time() - baslangic, f"Cümle sayısı: {len(cumleler)}")
+                ilk = False
+            _sesi_oynat(oge, ses_ayarlari, ui)
+    finally:
+        durdur.set()
+
+
+def sesi_uret_ve_oynat(metin, ses_ayarlari, ui=None):
+    """Metni profil ayarlarına göre sentezleyip çal (bloklayan çağrı)"""
+    start_time = time.time()
+    try:
+        logger.info(f"Seslendirme başlatılıyor: '{metin[:50]}...'")
+        
+        # Ses ayarlarını al
+        dil = ses_ayarlari.get("dil", "tr")
+        hiz = ses_ayarlari.get("hiz", 1.0)
+        ses_seviyesi = ses_ayarlari.get("ses_seviyesi", 1.0)
+        ses_tipi = ses_ayarlari.get("ses_tipi", "gtts")
+        ses_oynatma = ses_ayarlari.get("ses_oynatma", "pydub")
+        
+        logger.debug(f"Ses ayarları: dil={dil}, hız={hiz}, seviye={ses_seviyesi}, tip={ses_tipi}, oynatma={ses_oynatma}")
+        
+        # Çok cümleli yanıtlar cümle cümle sentezlenip çalınır
+        cumleler = cumlelere_bol(metin) if SESLENDIRME_CONFIG['akis_modu'] else [metin]
+        if len(cumleler) > 1:
+            _akisla_seslendir(cumleler, ses_ayarlari, ui)
+        else:
+            # Ses üretimi: aynı metin + profil daha önce sentezlendiyse önbellekten gelir
+            # Motor ses_tipi ile seçilir; tanımsız / kurulu olmayan motorlar için varsayılan gTTS
+            logger.debug(f"{ses_tipi} ile ses üretiliyor (önbellekli)...")
+            _sesi_oynat(_ses_hazirla(metin, ses_ayarlari), ses_ayarlari, ui)
+                    
+    except Exception as e:
+        duration = time.time() - start_time
+        log_audio_error(logger, e, f"Seslendirme hatası - Süre: {duration:.2f}s")
+        print(f'Seslendirilemedi, hata: {e}')
+        if ui:
+            ui.add_message("Sistem", f"Seslendirilemedi: {e}", "system")
+    
+    duration = time.time() - start_time
+    log_performance(logger, "Seslendirme", duration, f"Metin uzunluğu: {len(metin)}")
+
+
+class SesKanali(Kanal):
+    """Mikrofondan dinleyip profilin ses tanıma motoruyla tanıyan, yanıtı profil ayarlarıyla seslendiren kanal"""
+
+    def __init__(self, ses_ayarlari, ui=None):
+        super().__init__()
+        self.ses_ayarlari = ses_ayarlari
+        self.ui = ui
+        self.recognizer = tanici_olustur(ses_ayarlari)
+        self.microphone = sr.Microphone(device_index=ses_ayarlari.get("mikrofon_index", 0))
+        # Motor ses_tanima_servisi ile seçilir (google, vosk, sphinx)
+        self.tanici = tanici_getir(ses_ayarlari.get("ses_tanima_servisi"))
+        # Gürültü eşiği görüşme başında bir kez ölçülür, sonra arka planda izlenir
+        self.kalibrator = None
+        if ses_ayarlari.get("ses_tanima_ambient_noise_adjustment", True):
+            self.kalibrator = GurultuKalibratoru(self.microphone, self.recognizer)
+        # Sabit istemler ilk görüşme başlamadan arka planda sentezlenip çözülür
+        on_isitmayi_baslat(ses_ayarlari, ses_isitici(ses_ayarlari))
+
+    def seslendir(self, metin):
+        sesi_uret_ve_oynat(metin, self.ses_ayarlari, self.ui)
+
+    def dinleme_kaynagi(self):
+        """Dinleme için mikrofon kaynağı (context manager); kalibrasyon açıksa eşik hazır gelir"""
+        return self.kalibrator.dinleme() if self.kalibrator else self.microphone
+
+    def kapat(self):
+        if self.kalibrator:
+            self.kalibrator.kapat()
+
+    def konusma_al(self, deneme=1):
+        # Ses ayarlarını al
+        timeout = self.ses_ayarlari.get("ses_tanima_timeout", 20)
+        phrase_time_limit = self.ses_ayarlari.get("ses_tanima_phrase_time_limit", 10)
+        ambient_noise_adjustment = self.ses_ayarlari.get("ses_tanima_ambient_noise_adjustment", True)
+        dil = self.ses_ayarlari.get("ses_tanima_dili", "tr-TR")
+        
+        logger.debug(f"Ses tanıma ayarları: timeout={timeout}, phrase_limit={phrase_time_limit}, ambient={ambient_noise_adjustment}, dil={dil}")
+        
+        with self.dinleme_kaynagi() as source:
+            logger.debug(f"Mikrofon kaynağı hazır (enerji eşiği: {self.recognizer.energy_threshold:.0f})")
+            logger.debug("Dinleme başlatılıyor...")
+            
+            try:
+                audio = self.recognizer.listen(
+                    source, 
+                    timeout=timeout,
+                    phrase_time_limit=phrase_time_limit
+                )
+                logger.debug("Ses kaydı başarıyla alındı")
+            except sr.WaitTimeoutError:
+                logger.warning(f"Deneme {deneme}: Dinleme zaman aşımı")
+                return None
+            except Exception as e:
+                log_audio_error(logger, e, f"Ses kaydı hatası - Deneme {deneme}")
+                return None
+            
+        try:
+            logger.debug(f"{self.tanici.ad} ile tanıma başlatılıyor...")
+            text = self.tanici.tani(audio, dil)
+            logger.info(f"Metin başarıyla tanındı: '{text[:50]}...'")
+            return text
+        except sr.UnknownValueError:
+            logger.warning(f"Deneme {deneme}: Ses anlaşılamadı")
+            print('Lütfen tekrar deneyin.')
+        except sr.RequestError as e:
+            log_network_error(logger, e, f"{self.tanici.ad} ses tanıma hatası - Deneme {deneme}")
+            print('Lütfen tekrar deneyin.')
+        except Exception as e:
+            log_audio_error(logger, e, f"Beklenmeyen ses tanıma hatası - Deneme {deneme}")
+            print('Lütfen tekrar deneyin.')
+        return None
+
 
 class SesliCagriMerkezi:
-    def __init__(self, ui=None, ses_profili="varsayilan"):
+    def __init__(self, ui=None, ses_profili="varsayilan", siniflandirici=None, ses_ayarlari=None, kanal=None,
+                 gecmis=None):
         self.ui = ui
         
-        # Geçmiş görüşme yöneticisini başlat
+        # Geçmiş görüşme yöneticisini başlat; yük testi gibi çağıranlar ayrı bir yönetici verebilir
+        self.gecmis = gecmis if gecmis is not None else gecmis_yoneticisi
         self.aktif_gorusme_id = None
+        # Oturum yöneticisi görüşmeyi dışarıdan sonlandırmak için kullanır
+        self.sonlandir = threading.Event()
+        # Görüşmeyi yarıda kesen son hata; oturum yöneticisi durumu buna göre raporlar
+        self.son_hata = None
     
         # Ses yöneticisini başlat
-        if ses_yoneticisi:
+        if ses_ayarlari is not None:
+            # Oturuma özel ayarlar: global profil değiştirilmez
+            self.ses_ayarlari = ses_ayarlari
+        elif ses_yoneticisi:
             ses_profili_degistir(ses_profili)
             self.ses_ayarlari = ses_yoneticisi.aktif_profil
         else:
@@ -108,129 +416,27 @@ class SesliCagriMerkezi:
                 "ses_tanima_phrase_threshold": 0.3
             }
         
-        # Mikrofon ayarlarını uygula
-        self.recognizer = sr.Recognizer()
-        self.recognizer.energy_threshold = self.ses_ayarlari.get("mikrofon_enerji_esigi", 4000)
-        self.recognizer.dynamic_energy_threshold = self.ses_ayarlari.get("ses_tanima_dynamic_energy_threshold", True)
-        self.recognizer.pause_threshold = self.ses_ayarlari.get("ses_tanima_pause_threshold", 0.8)
-        self.recognizer.non_speaking_duration = self.ses_ayarlari.get("ses_tanima_non_speaking_duration", 0.5)
-        self.recognizer.phrase_threshold = self.ses_ayarlari.get("ses_tanima_phrase_threshold", 0.3)
-        
-        self.microphone = sr.Microphone(device_index=self.ses_ayarlari.get("mikrofon_index", 0))
+        # Müşteriyle konuşulan kanal; verilmezse mikrofon + hoparlör
+        self.kanal = kanal if kanal is not None else SesKanali(self.ses_ayarlari, ui)
+        if isinstance(self.kanal, SesKanali):
+            self.recognizer = self.kanal.recognizer
+            self.microphone = self.kanal.microphone
+            self.tanici = self.kanal.tanici
         
         # BERTurk modeli ve tokenizer - config'den al
-        try:
-            model_path = BERTURK_CAGRI_MODEL_DIR
-            if not model_path.exists():
-                print(f"Uyarı: Model dizini bulunamadı: {model_path}")
-                print("Lütfen model dosyalarının doğru konumda olduğundan emin olun.")
+        # Paylaşılan bir sınıflandırma servisi verildiyse modeli tekrar yükleme
+        self.kategoriler = KATEGORILER
+        if siniflandirici is None:
+            siniflandirici = siniflandirici_olustur()
+            if siniflandirici is None:
                 return
-                
-            self.model_bert = BertForSequenceClassification.from_pretrained(str(model_path))
-            self.tokenizer = BertTokenizer.from_pretrained(str(model_path))
-            self.model_bert.eval()  # Değerlendirme moduna al
-        except Exception as e:
-            print(f"Model yükleme hatası: {e}")
-            return
+        self.siniflandirici = siniflandirici
+        self.calistirici = siniflandirici.calistirici
+        self.tokenizer = siniflandirici.tokenizer
 
-        # Kategori isimleri ve yanıtları - config'den al
-        self.kategoriler = KATEGORILER
     def yanit_fatura_itiraz(self, kullanici):
-        son_4_ay = kullanici.get("son_4_aylik_kullanim", [])
-        paket = kullanici.get("numaraya_tanimli_paket", {})
-
-        if not son_4_ay or not paket:
-            return "Kullanım ve paket bilgileri eksik."
-
-        # Paket limitleri ve fiyatı dayanıklı okuma
-        paket_fiyat = (
-            paket.get("fiyatı")
-            or paket.get("fiyati")
-            or paket.get("fiyat")
-            or 0
-        )
-        paket_dk_limit = int(paket.get("dakika", 0) or 0)
-        paket_sms_limit = int(paket.get("sms", 0) or 0)
-
-        # 'data_gb' alanı veride MB cinsinden olabildiği gibi (5000=5GB), bazı kayıtlarda GB da olabilir.
-        # Sağlamlık için sezgisel dönüşüm: >=1024 ise MB varsay, aksi halde GB→MB çevir.
-        data_field_value = paket.get("data_gb", 0) or 0
-        try:
-            data_field_value = float(data_field_value)
-        except Exception:
-            data_field_value = 0
-        if data_field_value >= 1024:
-            paket_data_limit_mb = int(data_field_value)
-        else:
-            paket_data_limit_mb = int(data_field_value * 1024)
-
-        kampanya = kullanici.get("aktif_kampanya", {})
-        kampanya_indirim = kampanya.get("indirimYüzdesi") or kampanya.get("indirimYuzdesi") or 0
-
-        analiz_sonucu = []
-        
-        # SADECE SON AY (EN GÜNCEL FATURA) ANALİZİ
-        if not son_4_ay:
-            return "Fatura geçmişi bulunamadı."
-            
-        # En güncel ayı al (son eleman)
-        son_ay = son_4_ay[-1]
-        ay = son_ay.get("ay", "Bilinmiyor")
-        odeme = float(son_ay.get("odeme_tl", 0) or 0)
-
-        kullanilan_dk = int(son_ay.get("konusma_dakika", 0) or 0)
-        kullanilan_sms = int(son_ay.get("sms", 0) or 0)
-        kullanilan_data_mb = int(son_ay.get("data_mb", 0) or 0)
-        yurtdisi_dk = int(
-            son_ay.get("yurt_dişi_dakika")
-            or son_ay.get("yurt_disi_dakika")
-            or 0
-        )
-
-        sebepler = []
-        if paket_dk_limit and kullanilan_dk > paket_dk_limit:
-            sebepler.append(f"dakika aşımı (+{kullanilan_dk - paket_dk_limit} dk)")
-        if paket_sms_limit and kullanilan_sms > paket_sms_limit:
-            sebepler.append(f"SMS aşımı (+{kullanilan_sms - paket_sms_limit} SMS)")
-        if paket_data_limit_mb and kullanilan_data_mb > paket_data_limit_mb:
-            sebepler.append(f"internet aşımı (+{kullanilan_data_mb - paket_data_limit_mb} MB)")
-        if yurtdisi_dk:
-            sebepler.append(f"yurt dışı arama ({yurtdisi_dk} dk)")
-
-        fark = odeme - float(paket_fiyat or 0)
-
-        if fark > 0.01:
-            # ÖNCE PAKET AŞIMI KONTROLÜ
-            if sebepler:
-                analiz_sonucu.append(
-                    f"{ay} ayında {', '.join(sebepler)} nedeniyle yaklaşık +{fark:.2f} TL fazla fatura."
-                )
-            # AŞIM YOKSA ÇİFT FATURA KESİMİ KONTROLÜ
-            elif paket_fiyat and odeme >= 2 * float(paket_fiyat) - 5:  # 5 TL tolerans
-                analiz_sonucu.append(
-                    f"{ay} ayında çift fatura kesimi tespit edildi. Ödenen tutar ({odeme:.2f} TL) ödenecek tutarın ({paket_fiyat} TL) 2 katıdır. Aynı dönemde iki kez faturalandırma yapılmış."
-                )
-            # DİĞER MUHTEMEL SEBEPLER
-            else:
-                muhtemel = []
-                if kampanya_indirim:
-                    muhtemel.append("kampanya/indirim değişikliği")
-                if paket_fiyat and odeme >= 1.8 * float(paket_fiyat):
-                    muhtemel.append("muhtemel çifte kesim")
-                muhtemel.append("ek servis veya mobil ödeme")
-                analiz_sonucu.append(
-                    f"{ay} ayında paket aşımı görünmüyor; yaklaşık +{fark:.2f} TL ek ücret. Muhtemel sebep: {', '.join(muhtemel)}."
-                )
-        else:
-            if sebepler:
-                analiz_sonucu.append(
-                    f"{ay} ayında {', '.join(sebepler)} tespit edildi; fatura tutarında artış görünmüyor."
-                )
-
-        if not analiz_sonucu:
-            analiz_sonucu.append(f"{ay} ayında faturanız normal limitler içinde.")
-
-        return "Fatura analiz sonucu:\n" + "\n".join(analiz_sonucu)
+        # Gece çalışan toplu analizin kaydı varsa yalnızca okunur (bkz. bill_analysis.py)
+        return fatura_analizi_yaniti(kullanici)
     
     def yanit_paket_kalan_hak(self, kullanici):
         kampanya = kullanici.get("numaraya_tanimli_paket", {})
@@ -312,145 +518,37 @@ class SesliCagriMerkezi:
         return phone
 
     def seslendir(self, metin):
-        start_time = time.time()
-        
         # ÖNCE UI'DA YAZDIR
         if self.ui:
             self.ui.add_message("Temsilci", metin, "assistant")
         
         # Geçmiş görüşmeye mesaj ekle
-        if gecmis_yoneticisi and self.aktif_gorusme_id:
+        self._gecmise_mesaj_ekle("Temsilci", metin)
+        self.kanal.seslendir(metin)
+
+    def _gecmise_mesaj_ekle(self, konusan, metin):
+        """Mesajı aktif görüşmeye mevcut kategorisiyle ekle"""
+        if self.gecmis and self.aktif_gorusme_id:
             try:
                 # Mevcut kategoriyi al
-                current_kategori = None
-                for gorusme in gecmis_yoneticisi.gorusmeler["gorusmeler"]:
-                    if gorusme["id"] == self.aktif_gorusme_id:
-                        current_kategori = gorusme.get("kategori")
-                        break
-                gecmis_yoneticisi.mesaj_ekle(self.aktif_gorusme_id, "Temsilci", metin, current_kategori)
+                gorusme = self.gecmis.gorusme_getir(self.aktif_gorusme_id)
+                current_kategori = gorusme.get("kategori") if gorusme else None
+                self.gecmis.mesaj_ekle(self.aktif_gorusme_id, konusan, metin, current_kategori)
             except Exception as e:
                 logger.error(f"Geçmiş görüşmeye mesaj eklenirken hata: {e}")
-        
-        try:
-            logger.info(f"Seslendirme başlatılıyor: '{metin[:50]}...'")
-            
-            # Ses ayarlarını al
-            dil = self.ses_ayarlari.get("dil", "tr")
-            hiz = self.ses_ayarlari.get("hiz", 1.0)
-            ses_seviyesi = self.ses_ayarlari.get("ses_seviyesi", 1.0)
-            ses_tipi = self.ses_ayarlari.get("ses_tipi", "gtts")
-            ses_oynatma = self.ses_ayarlari.get("ses_oynatma", "pydub")
-            
-            logger.debug(f"Ses ayarları: dil={dil}, hız={hiz}, seviye={ses_seviyesi}, tip={ses_tipi}, oynatma={ses_oynatma}")
-            
-            # Geçici dosya oluştur
-            if ses_yoneticisi:
-                mp3_dosyasi = ses_yoneticisi.gecici_dosya_olustur()
-            else:
-                import tempfile
-                with tempfile.NamedTemporaryFile(delete=False, suffix='.mp3') as fp:
-                    mp3_dosyasi = fp.name
-            
-            logger.debug(f"Geçici dosya oluşturuldu: {mp3_dosyasi}")
-            
-            # Ses üretimi
-            if ses_tipi == "gtts":
-                from gtts import gTTS
-                logger.debug("gTTS ile ses üretiliyor...")
-                tts = gTTS(text=metin, lang=dil, slow=False)
-                tts.save(mp3_dosyasi)
-            else:
-                # Diğer ses tipleri için varsayılan gTTS
-                from gtts import gTTS
-                logger.debug("Varsayılan gTTS ile ses üretiliyor...")
-                tts = gTTS(text=metin, lang=dil, slow=False)
-                tts.save(mp3_dosyasi)
-            
-            logger.debug(f"Ses dosyası oluşturuldu: {mp3_dosyasi}")
-            
-            # Ses oynatma
-            try:
-                if ses_oynatma == "pydub":
-                    from pydub import AudioSegment
-                    from pydub.playback import play
-                    logger.debug("pydub ile ses oynatılıyor...")
-                    sound = AudioSegment.from_mp3(mp3_dosyasi)
-                    
-                    # Ses seviyesi ayarı
-                    if ses_seviyesi != 1.0:
-                        sound = sound + (20 * (ses_seviyesi - 1.0))  # dB cinsinden ayar
-                    
-                    play(sound)
-                elif ses_oynatma == "playsound":
-                    from playsound import playsound
-                    logger.debug("playsound ile ses oynatılıyor...")
-                    playsound(mp3_dosyasi)
-                else:
-                    # Varsayılan pydub
-                    from pydub import AudioSegment
-                    from pydub.playback import play
-                    logger.debug("Varsayılan pydub ile ses oynatılıyor...")
-                    sound = AudioSegment.from_mp3(mp3_dosyasi)
-                    play(sound)
-                    
-            except Exception as e:
-                log_audio_error(logger, e, "Ses oynatma hatası")
-                print(f"Ses oynatma hatası: {e}")
-                if self.ui:
-                    self.ui.add_message("Sistem", f"Ses oynatılamadı: {e}", "system")
-            finally:
-                # Geçici dosyayı temizle
-                if ses_yoneticisi:
-                    # Ses yöneticisi geçici dosyaları kendisi yönetir
-                    pass
-                else:
-                    try:
-                        os.remove(mp3_dosyasi)
-                        logger.debug("Geçici dosya silindi")
-                    except Exception as e:
-                        logger.warning(f"Geçici dosya silinemedi: {e}")
-                        
-        except Exception as e:
-            duration = time.time() - start_time
-            log_audio_error(logger, e, f"Seslendirme hatası - Süre: {duration:.2f}s")
-            print(f'Seslendirilemedi, hata: {e}')
-            if self.ui:
-                self.ui.add_message("Sistem", f"Seslendirilemedi: {e}", "system")
-        
-        duration = time.time() - start_time
-        log_performance(logger, "Seslendirme", duration, f"Metin uzunluğu: {len(metin)}")
 
     def kategori_tahmin_et(self, metin):
         """BERTurk modeli ile kategori tahmini yap"""
         # Metni ön işleme: küçük harf, strip, noktalama kaldırma
-        import re
-        metin = metin.lower().strip()
-        metin = re.sub(r'[.,!?;:()\[\]{}"]', '', metin)
-        inputs = self.tokenizer(metin, padding='max_length', truncation=True, max_length=64, return_tensors='pt')
-        with torch.no_grad():
-            outputs = self.model_bert(**inputs)
-            tahmin = torch.argmax(outputs.logits, dim=1).item()
-            prob = torch.softmax(outputs.logits, dim=1)[0]
-            guven = prob[tahmin].item() * 100
+        metin = metin_normalize(metin)
+        tahmin, guven = self.siniflandirici.siniflandir(metin)
         print(f"Tahmin edilen kategori: {tahmin} | Güven: %{guven:.2f} | Metin: {metin}")
         return tahmin, guven
 
     def dinle(self):
-        """Google Speech Recognition ile dinleme yap"""
-        with self.microphone as source:
-            print("Konuşun...")
-            self.recognizer.adjust_for_ambient_noise(source)
-            audio = self.recognizer.listen(source)
-
-        try:
-            metin = self.recognizer.recognize_google(audio, language="tr-TR")
-            return metin
-        except sr.UnknownValueError:
-            print("Ses anlaşılamadı")
-            return None
-        except sr.RequestError as e:
-            print(f"Google Speech Recognition servisi hatası: {str(e)}")
-            return None
+        """Kanaldan tek bir konuşma sırası al (tekrar denemeden)"""
+        print("Konuşun...")
+        return self.kanal.konusma_al()
 
     def mikrofondan_konusma_al(self, tekrar_sayisi=3):
         start_time = time.time()
@@ -460,73 +558,22 @@ class SesliCagriMerkezi:
             self.ui.clear_status()
             self.ui.notify_speak()  # Sadece müşteri konuşma sırası başında bir kez
         
-        # Ses ayarlarını al
-        timeout = self.ses_ayarlari.get("ses_tanima_timeout", 20)
-        phrase_time_limit = self.ses_ayarlari.get("ses_tanima_phrase_time_limit", 10)
-        ambient_noise_adjustment = self.ses_ayarlari.get("ses_tanima_ambient_noise_adjustment", True)
-        dil = self.ses_ayarlari.get("ses_tanima_dili", "tr-TR")
-        
-        logger.debug(f"Ses tanıma ayarları: timeout={timeout}, phrase_limit={phrase_time_limit}, ambient={ambient_noise_adjustment}, dil={dil}")
-        
         for deneme in range(tekrar_sayisi):
             logger.info(f"Ses tanıma denemesi {deneme + 1}/{tekrar_sayisi}")
-            
-            with self.microphone as source:
-                logger.debug("Mikrofon kaynağı açıldı")
-                if ambient_noise_adjustment:
-                    logger.debug("Arka plan gürültüsü ayarlanıyor...")
-                    self.recognizer.adjust_for_ambient_noise(source)
-                logger.debug("Dinleme başlatılıyor...")
-                
-                try:
-                    audio = self.recognizer.listen(
-                        source, 
-                        timeout=timeout,
-                        phrase_time_limit=phrase_time_limit
-                    )
-                    logger.debug("Ses kaydı başarıyla alındı")
-                except sr.WaitTimeoutError:
-                    logger.warning(f"Deneme {deneme + 1}: Dinleme zaman aşımı")
-                    continue
-                except Exception as e:
-                    log_audio_error(logger, e, f"Ses kaydı hatası - Deneme {deneme + 1}")
-                    continue
-                
-            try:
-                logger.debug("Google Speech Recognition ile tanıma başlatılıyor...")
-                text = self.recognizer.recognize_google(audio, language=dil)
-                logger.info(f"Metin başarıyla tanındı: '{text[:50]}...'")
-                
+            text = self.kanal.konusma_al(deneme + 1)
+            if text:
                 # ÖNCE UI'DA YAZDIR
                 if self.ui:
                     self.ui.add_message("Müşteri", text, "customer")
                 
                 # Geçmiş görüşmeye mesaj ekle
-                if gecmis_yoneticisi and self.aktif_gorusme_id:
-                    try:
-                        # Mevcut kategoriyi al
-                        current_kategori = None
-                        for gorusme in gecmis_yoneticisi.gorusmeler["gorusmeler"]:
-                            if gorusme["id"] == self.aktif_gorusme_id:
-                                current_kategori = gorusme.get("kategori")
-                                break
-                        gecmis_yoneticisi.mesaj_ekle(self.aktif_gorusme_id, "Müşteri", text, current_kategori)
-                    except Exception as e:
-                        logger.error(f"Geçmiş görüşmeye müşteri mesajı eklenirken hata: {e}")
+                self._gecmise_mesaj_ekle("Müşteri", text)
                 
                 duration = time.time() - start_time
                 log_performance(logger, "Ses Tanıma", duration, f"Başarılı - Deneme: {deneme + 1}")
                 return text
-                
-            except sr.UnknownValueError:
-                logger.warning(f"Deneme {deneme + 1}: Ses anlaşılamadı")
-                print('Lütfen tekrar deneyin.')
-            except sr.RequestError as e:
-                log_network_error(logger, e, f"Google Speech Recognition hatası - Deneme {deneme + 1}")
-                print('Lütfen tekrar deneyin.')
-            except Exception as e:
-                log_audio_error(logger, e, f"Beklenmeyen ses tanıma hatası - Deneme {deneme + 1}")
-                print('Lütfen tekrar deneyin.')
+            if self.kanal.kapandi:
+                break
         
         duration = time.time() - start_time
         logger.error(f"Ses tanıma başarısız - Tüm denemeler tükendi - Toplam süre: {duration:.2f}s")
@@ -536,24 +583,8 @@ class SesliCagriMerkezi:
     def kullanici_bilgileri(self, telefon):
         """Kullanıcı bilgilerini getir"""
         try:
-            with open(KULLANICI_FATURALAR_FILE, "r", encoding="utf-8") as f:
-                veriler = json.load(f)
-            # Numara normalize: 0 ile başlıyorsa +90 ekle, boşlukları ve tireleri kaldır
-            tel_clean = ''.join(filter(str.isdigit, telefon))
-            if tel_clean.startswith('0'):
-                tel_plus90 = '+90' + tel_clean[1:]
-            elif tel_clean.startswith('90'):
-                tel_plus90 = '+' + tel_clean
-            elif tel_clean.startswith('+90'):
-                tel_plus90 = tel_clean
-            else:
-                tel_plus90 = '+90' + tel_clean[-10:]
-            for kullanici in veriler:
-                vt_tel = ''.join(filter(str.isdigit, kullanici["numara"]))
-                vt_tel_plus90 = '+90' + vt_tel[-10:]
-                if kullanici["numara"] == telefon or kullanici["numara"] == tel_plus90 or vt_tel_plus90 == tel_plus90:
-                    return kullanici
-            return None
+            # Rehber numaraları +90XXXXXXXXXX biçiminde indeksler
+            return musteri_rehberi.bul(telefon)
         except Exception as e:
             print(f"Kullanıcı bilgileri hatası: {str(e)}")
             return None
@@ -583,7 +614,7 @@ class SesliCagriMerkezi:
     def telefon_numarasi_al(self):
         """Kullanıcıdan telefon numarası al"""
         self.seslendir("Telefon numaranızı söyler misiniz?")
-        while True:
+        while not self.kanal.kapandi:
             telefon = self.dinle()
             if telefon and len(telefon.replace(" ", "")) >= 10:
                 # Numarayı temizle ve formatla
@@ -592,37 +623,16 @@ class SesliCagriMerkezi:
                     telefon = telefon[-10:]  # Son 10 haneyi al
                     return f"0{telefon}"
             self.seslendir("Geçerli bir telefon numarası söyleyin")
+        return None
 
     def tespit_et_berturk(self, metin):
-        import torch
-        inputs = self.tokenizer(metin, return_tensors="pt", truncation=True, padding=True)
-        with torch.no_grad():
-            outputs = self.model_bert(**inputs)
-            logits = outputs.logits
-            predicted = torch.argmax(logits, dim=1).item()
+        predicted, _ = self.siniflandirici.siniflandir(metin)
         print(f"DEBUG: Tahmin edilen kategori: {predicted}")
         return predicted
 
     def kullanici_verisi_getir(self, telefon):
-        import json
         try:
-            with open(KULLANICI_FATURALAR_FILE, "r", encoding="utf-8") as f:
-                veriler = json.load(f)
-            for kullanici in veriler:
-                vt_tel = ''.join(filter(str.isdigit, kullanici["numara"]))
-                vt_tel_plus90 = '+90' + vt_tel[-10:]
-                tel_clean = ''.join(filter(str.isdigit, telefon))
-                if tel_clean.startswith('0'):
-                    tel_plus90 = '+90' + tel_clean[1:]
-                elif tel_clean.startswith('90'):
-                    tel_plus90 = '+' + tel_clean
-                elif tel_clean.startswith('+90'):
-                    tel_plus90 = tel_clean
-                else:
-                    tel_plus90 = '+90' + tel_clean[-10:]
-                if kullanici["numara"] == telefon or kullanici["numara"] == tel_plus90 or vt_tel_plus90 == tel_plus90:
-                    return kullanici
-            return None
+            return musteri_rehberi.bul(telefon)
         except Exception as e:
             print(f"DEBUG: Kullanıcı verisi alınamadı, hata: {e}")
             return None
@@ -686,7 +696,85 @@ class SesliCagriMerkezi:
         yanit += f"Önerilen yeni paket: {paket_onerisi}."
         return yanit
 
+    @staticmethod
+    def telefon_temizle(telefon):
+        """Tanınan metinden rakamları al; 10 haneliyse başına 0 ekle"""
+        telefon = ''.join(filter(str.isdigit, telefon or ""))
+        if len(telefon) == 10:
+            telefon = '0' + telefon
+        return telefon
+
+    @staticmethod
+    def evet_hayir(cevap):
+        """Cevap 'evet' ise True, 'hayır' ise False, anlaşılamadıysa None döndür"""
+        return evet_hayir_coz(cevap)
+
+    def _gorusmeyi_baslat(self, telefon, kullanici_verisi):
+        """Geçmişte yeni görüşme kaydı aç ve müşteri verisini UI'ya gönder"""
+        ad = kullanici_verisi.get("ad", "")
+        # Telefon numarasını normalize et
+        normalized_telefon = self.normalize_phone_number(telefon)
+        
+        # Yeni görüşme başlat
+        if self.gecmis:
+            try:
+                self.aktif_gorusme_id = self.gecmis.yeni_gorusme_baslat(normalized_telefon, ad)
+                print(f"Yeni görüşme başlatıldı: {self.aktif_gorusme_id}")
+                if self.ui:
+                    self.ui.add_message("Sistem", f"Yeni görüşme başlatıldı - ID: {self.aktif_gorusme_id[:8]}...", "system")
+            except Exception as e:
+                print(f"Görüşme başlatılırken hata: {e}")
+        
+        # Müşteri verilerini UI'ya gönder
+        if self.ui:
+            try:
+                # Kullanıcı verisine normalize edilmiş telefonu ekle
+                kullanici_verisi_copy = kullanici_verisi.copy()
+                kullanici_verisi_copy["normalized_numara"] = normalized_telefon
+                self.ui.set_musteri_data(kullanici_verisi_copy)
+                self.ui.add_message("Sistem", f"Müşteri tanındı: {ad} ({telefon})", "system")
+            except Exception as e:
+                print(f"UI'ya müşteri verisi gönderilirken hata: {e}")
+
+    def _kategoriyi_kaydet(self, kategori):
+        """Tespit edilen kategoriyi geçmişe ve UI'ya yaz"""
+        if self.gecmis and self.aktif_gorusme_id:
+            try:
+                kategori_adi = self.kategoriler.get(kategori, "Bilinmiyor")
+                self.gecmis.mesaj_ekle(self.aktif_gorusme_id, "Sistem", f"Kategori: {kategori_adi}", kategori_adi)
+                if self.ui:
+                    self.ui.add_message("Sistem", f"Kategori tespit edildi: {kategori_adi}", "system")
+                self.gecmis.kategori_guncelle(self.aktif_gorusme_id, kategori_adi)
+            except Exception as e:
+                print(f"Geçmiş görüşmeye kategori eklenirken hata: {e}")
+
+    def _gorusmeyi_bitir(self, durum="tamamlandi", cozulme_durumu="cozuldu"):
+        """Aktif görüşme kaydını kapat"""
+        if self.gecmis and self.aktif_gorusme_id:
+            try:
+                self.gecmis.gorusme_bitir(self.aktif_gorusme_id, durum=durum, cozulme_durumu=cozulme_durumu)
+                print(f"Görüşme bitirildi: {self.aktif_gorusme_id}")
+            except Exception as e:
+                print(f"Görüşme bitirme hatası: {e}")
+
+    def talep_yaniti(self, kategori, sikayet, kullanici_verisi):
+        """Talebi yönlendirme tablosuna göre yanıtla; (yanıt, çözüldü_mü) döndür
+
+        Çözülmediyse yanıt, talebi netleştirme istemidir; okunduktan sonra talep tekrar alınır.
+        """
+        yonlendirme = yonlendirici.cozumle(kategori, sikayet)
+        if yonlendirme.isleyici is None:
+            return yonlendirme.istem, False
+        yanit = getattr(self, yonlendirme.isleyici)(kullanici_verisi, *yonlendirme.argumanlar)
+        return yanit, self.cozuldu_mu(yanit)
+
+    @staticmethod
+    def cozuldu_mu(yanit):
+        """İşleyici yanıtı talebi karşıladı mı (yoksa netleştirme mi istiyor)"""
+        return "anlaşılamadı" not in yanit
+
     def cagri_merkezi_baslat(self):
+        self.son_hata = None
         try:
             # UI'da çağrı başlat
             if self.ui:
@@ -698,55 +786,42 @@ class SesliCagriMerkezi:
             if not telefon:
                 self.seslendir("Telefon numarası alınamadı. Lütfen tekrar deneyin.")
                 return
-            telefon = ''.join(filter(str.isdigit, telefon))
-            if len(telefon) == 10:
-                telefon = '0' + telefon
+            telefon = self.telefon_temizle(telefon)
             self.seslendir("Bir saniye bekletiyorum...")
             kullanici_verisi = self.kullanici_verisi_getir(telefon)
             while not kullanici_verisi:
+                if self.sonlandirma_istendi_mi():
+                    return
                 self.seslendir("Numaranız sistemde bulunamadı. Lütfen tekrar telefon numaranızı söyleyin.")
-                telefon = self.mikrofondan_konusma_al()
-                telefon = ''.join(filter(str.isdigit, telefon))
-                if len(telefon) == 10:
-                    telefon = '0' + telefon
+                telefon = self.telefon_temizle(self.mikrofondan_konusma_al())
                 self.seslendir("Bir saniye bekletiyorum...")
                 kullanici_verisi = self.kullanici_verisi_getir(telefon)
             ad = kullanici_verisi.get("ad", "")
             self.seslendir(f"Sayın {ad}")
             
-            # Telefon numarasını normalize et
-            normalized_telefon = self.normalize_phone_number(telefon)
-            
-            # Yeni görüşme başlat
-            if gecmis_yoneticisi:
-                try:
-                    self.aktif_gorusme_id = gecmis_yoneticisi.yeni_gorusme_baslat(normalized_telefon, ad)
-                    print(f"Yeni görüşme başlatıldı: {self.aktif_gorusme_id}")
-                    if self.ui:
-                        self.ui.add_message("Sistem", f"Yeni görüşme başlatıldı - ID: {self.aktif_gorusme_id[:8]}...", "system")
-                except Exception as e:
-                    print(f"Görüşme başlatılırken hata: {e}")
-            
-            # Müşteri verilerini UI'ya gönder
-            if self.ui:
-                try:
-                    # Kullanıcı verisine normalize edilmiş telefonu ekle
-                    kullanici_verisi_copy = kullanici_verisi.copy()
-                    kullanici_verisi_copy["normalized_numara"] = normalized_telefon
-                    self.ui.set_musteri_data(kullanici_verisi_copy)
-                    self.ui.add_message("Sistem", f"Müşteri tanındı: {ad} ({telefon})", "system")
-                except Exception as e:
-                    print(f"UI'ya müşteri verisi gönderilirken hata: {e}")
-            
+            self._gorusmeyi_baslat(telefon, kullanici_verisi)
             self.sikayet_ve_destek_akisi(telefon, kullanici_verisi)
         except KeyboardInterrupt:
             self.seslendir("Görüşme sonlandırılıyor. Teşekkür eder İyi günler dileriz.")
         except Exception as e:
+            self.son_hata = e
             print(f"Hata: {str(e)}")
             self.seslendir("Üzgünüm, bir hata oluştu.")
+        finally:
+            self.kanal.kapat()
+
+    def sonlandirma_istendi_mi(self):
+        """Görüşme dışarıdan sonlandırıldıysa ya da müşteri kapattıysa kaydı kapatıp True döndür"""
+        if not self.sonlandir.is_set() and not self.kanal.kapandi:
+            return False
+        self._gorusmeyi_bitir(durum="sonlandirildi", cozulme_durumu="devam_ediyor")
+        self.seslendir("Görüşme sonlandırılıyor. Teşekkür eder İyi günler dileriz.")
+        return True
 
     def sikayet_ve_destek_akisi(self, telefon, kullanici_verisi):
         while True:
+            if self.sonlandirma_istendi_mi():
+                return
             self.seslendir("Size nasıl yardımcı olabilirim?")
             sikayet = self.mikrofondan_konusma_al()
             if not sikayet:
@@ -755,64 +830,10 @@ class SesliCagriMerkezi:
             kategori = self.tespit_et_berturk(sikayet)
             
             # Geçmiş görüşmeye kategori ekle
-            if gecmis_yoneticisi and self.aktif_gorusme_id:
-                try:
-                    kategori_adi = self.kategoriler.get(kategori, "Bilinmiyor")
-                    gecmis_yoneticisi.mesaj_ekle(self.aktif_gorusme_id, "Sistem", f"Kategori: {kategori_adi}", kategori_adi)
-                    if self.ui:
-                        self.ui.add_message("Sistem", f"Kategori tespit edildi: {kategori_adi}", "system")
-                    gecmis_yoneticisi.kategori_guncelle(self.aktif_gorusme_id, kategori_adi)
-                except Exception as e:
-                    print(f"Geçmiş görüşmeye kategori eklenirken hata: {e}")
+            self._kategoriyi_kaydet(kategori)
             
-            if kategori in [0,1,2,3,4,5,6]:
-                if kategori == 0:
-                    yanit = self.yanit_fatura_itiraz(kullanici_verisi)
-                elif kategori == 1:
-                    paket = kullanici_verisi.get("numaraya_tanimli_paket", {})
-                    paket_isim = paket.get("paketİsmi") or "paket adı bulunamadı"
-                    kalanlar = kullanici_verisi.get("kalan_kullanim_haklari", {})
-                    sikayet_lower = sikayet.lower()
-                    if "son ay" in sikayet_lower:
-                        yanit = self.paket_son_ay_cevapla(kullanici_verisi)
-                    elif "son 2 ay" in sikayet_lower or "2 ay" in sikayet_lower:
-                        yanit = self.paket_son_iki_ay_cevapla(kullanici_verisi)
-                    elif "son 3 ay" in sikayet_lower or "3 ay" in sikayet_lower:
-                        yanit = self.paket_son_uc_ay_cevapla(kullanici_verisi)
-                    elif "sms" in sikayet_lower:
-                        yanit = self.kalan_hak_tekil_cevapla(kalanlar, paket_isim, "sms")
-                        if "anlaşılamadı" in yanit:
-                            self.seslendir(yanit)
-                            continue
-                    elif "dakika" in sikayet_lower:
-                        yanit = self.kalan_hak_tekil_cevapla(kalanlar, paket_isim, "dakika")
-                        if "anlaşılamadı" in yanit:
-                            self.seslendir(yanit)
-                            continue
-                    elif "internet" in sikayet_lower:
-                        yanit = self.kalan_hak_tekil_cevapla(kalanlar, paket_isim, "internet")
-                        if "anlaşılamadı" in yanit:
-                            self.seslendir(yanit)
-                            continue
-                    elif "tüm hak" in sikayet_lower or "hepsi" in sikayet_lower or "kalan hak" in sikayet_lower:
-                        yanit = self.yanit_paket_kalan_hak(kullanici_verisi)
-                    else:
-                        yanit = "Paket konusundaki talebiniz anlaşılamadı. Lütfen ne yapmak istediğinizi belirtir misiniz? Paket değiştirmek mi, kalan haklarınızı öğrenmek mi?"
-                        self.seslendir(yanit)
-                        # Tekrar talep al
-                        continue
-                elif kategori == 2:
-                    yanit = self.yanit_borc_odeme(kullanici_verisi)
-                elif kategori == 3:
-                    yanit = self.yanit_iptal_talebi(kullanici_verisi)
-                elif kategori == 4:
-                    yanit = self.yanit_yeni_paket_kampanya(kullanici_verisi)
-                elif kategori == 5:
-                    yanit = self.yanit_teknik_ariza(kullanici_verisi)
-                elif kategori == 6:
-                    yanit = self.yanit_sim_kart_sifre(kullanici_verisi)
-            else:
-                yanit = "Talebiniz anlaşılamadı. Lütfen hangi konuda yardım almak istediğinizi açık bir şekilde belirtir misiniz? Örneğin: fatura itirazı, paket değişikliği, borç sorgulama..."
+            yanit, cozuldu = self.talep_yaniti(kategori, sikayet, kullanici_verisi)
+            if not cozuldu:
                 self.seslendir(yanit)
                 # Tekrar talep al
                 continue
@@ -822,21 +843,19 @@ class SesliCagriMerkezi:
 
             # Evet/Hayır cevabı alana kadar tekrar sor
             while True:
+                if self.sonlandirma_istendi_mi():
+                    return
                 self.seslendir("Farklı bir konuda destek ister misiniz?")
                 cevap = self.mikrofondan_konusma_al()
                 if not cevap:
                     self.seslendir("Cevabınız anlaşılamadı. Lütfen evet veya hayır olarak cevap verin.")
                     continue
-                elif "evet" in cevap.lower():
+                karar = self.evet_hayir(cevap)
+                if karar is True:
                     break  # Döngüden çık, evet seçeneğine devam et
-                elif "hayır" in cevap.lower() or "hayir" in cevap.lower():
+                elif karar is False:
                     # Görüşmeyi bitir
-                    if gecmis_yoneticisi and self.aktif_gorusme_id:
-                        try:
-                            gecmis_yoneticisi.gorusme_bitir(self.aktif_gorusme_id, durum="tamamlandi")
-                            print(f"Görüşme bitirildi: {self.aktif_gorusme_id}")
-                        except Exception as e:
-                            print(f"Görüşme bitirme hatası: {e}")
+                    self._gorusmeyi_bitir()
                     self.seslendir("Görüşme sonlandırılıyor. Teşekkür eder İyi günler dileriz.")
                     return  # Fonksiyondan çık
                 else:
@@ -846,14 +865,11 @@ class SesliCagriMerkezi:
             # Buraya sadece "evet" cevabı ile gelinir
             self.seslendir("Bu numara için mi devam edelim?")
             numara_cevap = self.mikrofondan_konusma_al()
-            if numara_cevap and "evet" in numara_cevap.lower():
+            if self.evet_hayir(numara_cevap) is True:
                 continue  # Aynı numara ile yeni şikayet alınır
             else:
                 self.seslendir("Lütfen yeni telefon numarasını söyleyin.")
-                yeni_telefon = self.mikrofondan_konusma_al()
-                yeni_telefon = ''.join(filter(str.isdigit, yeni_telefon))
-                if len(yeni_telefon) == 10:
-                    yeni_telefon = '0' + yeni_telefon
+                yeni_telefon = self.telefon_temizle(self.mikrofondan_konusma_al())
                 self.seslendir("Bir saniye bekletiyorum...")
                 yeni_kullanici_verisi = self.kullanici_verisi_getir(yeni_telefon)
                 if yeni_kullanici_verisi:
@@ -882,6 +898,12 @@ class SesliCagriMerkezi:
             metin += f"- {ay_veri.get('ay', 'Bilinmiyor')}: {ay_veri.get('konusma_dakika', 0)} dakika, {ay_veri.get('sms', 0)} SMS, {ay_veri.get('data_mb', 0)/1024:.2f} GB internet.\n"
         return metin
     
+    def kalan_hak_cevapla(self, kullanici, hak_tipi):
+        paket = kullanici.get("numaraya_tanimli_paket", {})
+        paket_isim = paket.get("paketİsmi") or "paket adı bulunamadı"
+        kalanlar = kullanici.get("kalan_kullanim_haklari", {})
+        return self.kalan_hak_tekil_cevapla(kalanlar, paket_isim, hak_tipi)
+
     def kalan_hak_tekil_cevapla(self, kalanlar, paket_isim, hak_tipi):
         if hak_tipi == "sms":
             sms = kalanlar.get("kalanSms", 0)
@@ -909,6 +931,5 @@ if __name__ == "__main__":
     from ui_cagri_merkezi import CagriMerkeziUI
     ui = CagriMerkeziUI()
     cagri_merkezi = SesliCagriMerkezi(ui=ui)
-    import threading
     threading.Thread(target=cagri_merkezi.cagri_merkezi_baslat, daemon=True).start()
     ui.run()
@@ -17,7 +17,7 @@ SES_PROFILLERI = {
         "hiz": 1.0,
         "ses_seviyesi": 1.0,
         "pitch": 1.0,
-        "ses_tipi": "gtts",  # gtts, pyttsx3, coqui_tts
+        "ses_tipi": "gtts",  # gtts, pyttsx3 (bkz. tts_engines.SENTEZLEYICILER)
         "ses_kalitesi": "normal",  # normal, yuksek, dusuk
         "ses_uzantisi": "mp3",
         "gecici_dosya": True,
@@ -27,7 +27,7 @@ SES_PROFILLERI = {
         "mikrofon_dinleme_suresi": 20,
         "mikrofon_gecikme": 0.1,
         "ses_tanima_dili": "tr-TR",
-        "ses_tanima_servisi": "google",  # google, sphinx, azure
+        "ses_tanima_servisi": "google",  # google, vosk, sphinx (bkz. stt_engines.TANICILAR)
         "ses_tanima_guven_esigi": 0.7,
         "ses_tanima_timeout": 20,
         "ses_tanima_phrase_time_limit": 10,
@@ -181,6 +181,34 @@ SES_PROFILLERI = {
         "ses_tanima_phrase_threshold": 0.5
     },
     
+    "cevrimdisi": {
+        "ad": "Çevrimdışı",
+        "aciklama": "İnternet bağlantısı olmadan yerel sentezleyici ile",
+        "dil": "tr",
+        "hiz": 1.0,
+        "ses_seviyesi": 1.0,
+        "pitch": 1.0,
+        "ses_tipi": "pyttsx3",
+        "ses_kalitesi": "normal",
+        "ses_uzantisi": "wav",
+        "gecici_dosya": True,
+        "ses_oynatma": "pydub",
+        "mikrofon_index": 0,
+        "mikrofon_enerji_esigi": 4000,
+        "mikrofon_dinleme_suresi": 20,
+        "mikrofon_gecikme": 0.1,
+        "ses_tanima_dili": "tr-TR",
+        "ses_tanima_servisi": "vosk",
+        "ses_tanima_guven_esigi": 0.7,
+        "ses_tanima_timeout": 20,
+        "ses_tanima_phrase_time_limit": 10,
+        "ses_tanima_ambient_noise_adjustment": True,
+        "ses_tanima_dynamic_energy_threshold": True,
+        "ses_tanima_pause_threshold": 0.8,
+        "ses_tanima_non_speaking_duration": 0.5,
+        "ses_tanima_phrase_threshold": 0.3
+    },
+    
     "gurultulu_ortam": {
         "ad": "Gürültülü Ortam",
         "aciklama": "Gürültülü ortamlarda kullanım için",
@@ -289,18 +317,32 @@ class SesYoneticisi:
         else:
             return {}
     
-    def gecici_dosya_olustur(self) -> str:
-        """Geçici ses dosyası oluşturur"""
+    def gecici_dosya_olustur(self, uzanti: Optional[str] = None) -> str:
+        """Geçici ses dosyası oluşturur (uzantı verilmezse profilin uzantısı)"""
+        uzanti = uzanti or self.aktif_profil.get("ses_uzantisi", "mp3")
         if self.aktif_profil.get("gecici_dosya", True):
             temp_file = tempfile.NamedTemporaryFile(
                 delete=False, 
-                suffix=f'.{self.aktif_profil.get("ses_uzantisi", "mp3")}'
+                suffix=f'.{uzanti}'
             )
             self.gecici_dosyalar.append(temp_file.name)
             return temp_file.name
         else:
             # Kalıcı dosya için
-            return f"ses_{len(self.gecici_dosyalar)}.{self.aktif_profil.get('ses_uzantisi', 'mp3')}"
+            return f"ses_{len(self.gecici_dosyalar)}.{uzanti}"
+    
+    def gecici_dosya_sil(self, dosya: str):
+        """İşi biten geçici dosyayı siler ve takip listesinden çıkarır"""
+        try:
+            if os.path.exists(dosya):
+                os.remove(dosya)
+        except Exception as e:
+            print(f"Geçici dosya silinemedi: {e}")
+            return
+        try:
+            self.gecici_dosyalar.remove(dosya)
+        except ValueError:
+            pass
     
     def gecici_dosyalari_temizle(self):
         """Geçici dosyaları temizler"""
@@ -0,0 +1,68 @@
+"""
+Test Ortamı
+Testler scripts/ modüllerini doğrudan içe aktarır. Modüller içe aktarılırken
+global geçmiş yöneticisi ve loglar çalışma dizinine göre göreli yollar
+açtığından oturum geçici bir dizinde çalışır; depo verisi değişmez.
+"""
+
+import os
+import sys
+import tempfile
+from concurrent.futures import Future
+from pathlib import Path
+
+import pytest
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent / "scripts"
+sys.path.insert(0, str(SCRIPTS_DIR))
+os.chdir(tempfile.mkdtemp(prefix="cagri-merkezi-test-"))
+
+
+# data/kullanici_faturalar.json'daki müşteri (TC son iki hanesi 46, sim şifresi 1234)
+MUSTERI_NUMARASI = "05375944025"
+TC_SON_IKI = "46"
+
+# Kategori etiketi, müşteri talebi ve temsilci yanıtında beklenen ifade
+KATEGORI_SENARYOLARI = [
+    (0, "faturam çok yüksek geldi", "Fatura analiz sonucu"),
+    (1, "kalan internet hakkım ne kadar", "kalan internet kullanımınız"),
+    (2, "borcum ne kadar", "olan faturanızın durumu"),
+    (3, "hattımı iptal etmek istiyorum", "İptal talebiniz alınmıştır"),
+    (4, "yeni kampanyalar neler", "Geçiş yapabileceğiniz paketler"),
+    (5, "internetim çalışmıyor", "Teknik arıza kaydınız oluşturuldu"),
+    (6, "sim kart şifremi unuttum", "Sim kart şifreniz: 1234"),
+]
+
+
+def senaryo_adimlari(etiket: int, talep: str):
+    """Numara, talep, (sim kart için TC doğrulaması) ve 'başka konu yok' cevabından oluşan senaryo"""
+    return [MUSTERI_NUMARASI, talep] + ([TC_SON_IKI] if etiket == 6 else []) + ["hayır"]
+
+
+class SabitSiniflandirici:
+    """Model yüklemeden her metne aynı etiketi veren sınıflandırıcı (TopluSiniflandirici arayüzü)"""
+    calistirici = None
+    tokenizer = None
+
+    def __init__(self, etiket: int):
+        self.etiket = etiket
+
+    def siniflandir(self, metin):
+        return self.etiket, 99.0
+
+    def gonder(self, metin) -> Future:
+        future = Future()
+        future.set_result(self.siniflandir(metin))
+        return future
+
+    def kapat(self, bekle: bool = True):
+        pass
+
+
+@pytest.fixture
+def gecmis(tmp_path):
+    """Senkron yazan, geçici dizinde görüşme geçmişi"""
+    from conversation_history import GelismisGecmisGorusmeler
+    yonetici = GelismisGecmisGorusmeler(str(tmp_path / "gecmis.json"), yazma_modu="senkron")
+    yield yonetici
+    yonetici.kapat()
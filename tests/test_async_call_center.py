@@ -0,0 +1,81 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("pyaudio")
+
+import async_call_center as acc
+import call_channels as cc
+from config import KATEGORILER
+from conftest import KATEGORI_SENARYOLARI, MUSTERI_NUMARASI, SabitSiniflandirici, senaryo_adimlari
+
+
+class MetinKaynagi(acc.AsyncSesKaynagi):
+    """MetinKanali'nın müşteri cümlelerini async kaynak olarak veren sarmalayıcı"""
+
+    def __init__(self, kanal: cc.MetinKanali):
+        self.kanal = kanal
+
+    @property
+    def kapandi(self):
+        return self.kanal.kapandi
+
+    async def konusma_al(self):
+        return self.kanal.konusma_al()
+
+
+class MetinCikisi(acc.AsyncSesCikisi):
+    def __init__(self, kanal: cc.MetinKanali):
+        self.kanal = kanal
+
+    async def seslendir(self, metin):
+        self.kanal.seslendir(metin)
+
+
+def gorusme_yurut(etiket, adimlar, gecmis):
+    kanal = cc.MetinKanali(adimlar)
+    merkez = acc.AsyncCagriMerkezi(MetinKaynagi(kanal), MetinCikisi(kanal),
+                                   siniflandirici=SabitSiniflandirici(etiket), gecmis=gecmis)
+    try:
+        asyncio.run(merkez.cagri_merkezi_baslat())
+    finally:
+        acc.havuzlari_kapat()
+    return merkez, kanal
+
+
+@pytest.mark.parametrize("etiket, talep, beklenen", KATEGORI_SENARYOLARI)
+def test_kategori_senaryosu_async_akista(gecmis, etiket, talep, beklenen):
+    merkez, kanal = gorusme_yurut(etiket, senaryo_adimlari(etiket, talep), gecmis)
+    assert merkez.son_hata is None
+    assert any(beklenen in yanit for yanit in kanal.temsilci_yanitlari)
+    assert kanal.temsilci_yanitlari[-1].startswith("Görüşme sonlandırılıyor")
+
+    gorusme = gecmis.son_gorusmeler_getir(1)[0]
+    assert gorusme["kategori"] == KATEGORILER[etiket]
+    assert gorusme["durum"] == "tamamlandi"
+
+
+@pytest.mark.parametrize("tc_son_iki, beklenen", [
+    ("46", "Sim kart şifreniz: 1234"),
+    ("00", "TC kimlik numarası doğrulanamadı. Güvenlik nedeniyle şifre verilemiyor."),
+])
+def test_sim_kart_sifre_async_akista_beklenir(gecmis, tc_son_iki, beklenen):
+    # Kategori 6'nın işleyicisi müşteriyle konuşur; yanıt coroutine olarak kalmamalı
+    merkez, kanal = gorusme_yurut(6, [MUSTERI_NUMARASI, "sim kart şifremi unuttum", tc_son_iki, "hayır"], gecmis)
+    assert merkez.son_hata is None
+    assert beklenen in kanal.temsilci_yanitlari
+
+
+def test_async_ve_senkron_akis_ayni_yanitlari_verir(gecmis):
+    for etiket, talep, _ in KATEGORI_SENARYOLARI:
+        adimlar = senaryo_adimlari(etiket, talep)
+        _, async_kanal = gorusme_yurut(etiket, adimlar, gecmis)
+        senkron_kanal = cc.senaryo_calistir(adimlar, siniflandirici=SabitSiniflandirici(etiket), gecmis=gecmis)
+        assert async_kanal.kayit == senkron_kanal.kayit
+
+
+def test_kapanan_kaynak_gorusmeyi_sonlandirir(gecmis):
+    merkez, kanal = gorusme_yurut(3, [MUSTERI_NUMARASI], gecmis)
+    assert merkez.son_hata is None
+    assert kanal.temsilci_yanitlari[-1].startswith("Görüşme sonlandırılıyor")
+    assert gecmis.son_gorusmeler_getir(1)[0]["durum"] == "sonlandirildi"
@@ -0,0 +1,87 @@
+import pytest
+
+pytest.importorskip("pyaudio")
+
+import call_channels as cc
+from config import KATEGORILER
+from conftest import KATEGORI_SENARYOLARI, MUSTERI_NUMARASI, SabitSiniflandirici, senaryo_adimlari
+
+
+@pytest.mark.parametrize("etiket, talep, beklenen", KATEGORI_SENARYOLARI)
+def test_kategori_senaryosu_metin_kanalinda(gecmis, etiket, talep, beklenen):
+    kanal = cc.senaryo_calistir(senaryo_adimlari(etiket, talep), siniflandirici=SabitSiniflandirici(etiket),
+                                gecmis=gecmis)
+    yanitlar = kanal.temsilci_yanitlari
+    assert any(beklenen in yanit for yanit in yanitlar)
+    assert yanitlar[-1].startswith("Görüşme sonlandırılıyor")
+
+    gorusme = gecmis.son_gorusmeler_getir(1)[0]
+    assert gorusme["kategori"] == KATEGORILER[etiket]
+    assert gorusme["durum"] == "tamamlandi"
+    assert [m["mesaj"] for m in gorusme["mesajlar"] if m["gonderen"] == "Müşteri"] == [
+        metin for konusan, metin in kanal.kayit if konusan == "Müşteri"][1:]
+
+
+def test_anlasilamayan_alt_niyet_netlestirme_ister(gecmis):
+    kanal = cc.senaryo_calistir([MUSTERI_NUMARASI, "paketim"], siniflandirici=SabitSiniflandirici(1), gecmis=gecmis)
+    assert any(yanit.startswith("Paket konusundaki talebiniz anlaşılamadı") for yanit in kanal.temsilci_yanitlari)
+    assert kanal.kapandi
+
+
+def test_yuk_testi_verilen_gecmise_yazar(gecmis):
+    import voice_call_center
+    onceki = voice_call_center.gecmis_yoneticisi.istatistikleri_getir()["toplam_gorusme"]
+    senaryolar = [senaryo_adimlari(etiket, talep) for etiket, talep, _ in KATEGORI_SENARYOLARI[2:4]]
+    sonuc = cc.yuk_testi(senaryolar, tekrar=3, esanli=2, siniflandirici=SabitSiniflandirici(3), gecmis=gecmis)
+
+    assert sonuc["gorusme_sayisi"] == 6
+    assert sonuc["durumlar"] == {"tamamlandi": 6}
+    assert gecmis.istatistikleri_getir()["toplam_gorusme"] == 6
+    assert voice_call_center.gecmis_yoneticisi.istatistikleri_getir()["toplam_gorusme"] == onceki
+
+
+def test_yuk_testi_varsayilan_olarak_gercek_gecmise_yazmaz():
+    import voice_call_center
+    onceki = voice_call_center.gecmis_yoneticisi.istatistikleri_getir()["toplam_gorusme"]
+    sonuc = cc.yuk_testi([senaryo_adimlari(5, "internetim çalışmıyor")], tekrar=2, siniflandirici=SabitSiniflandirici(5))
+    assert sonuc["durumlar"] == {"tamamlandi": 2}
+    assert voice_call_center.gecmis_yoneticisi.istatistikleri_getir()["toplam_gorusme"] == onceki
+
+
+class IlkDenemedeAnlamayanTanici:
+    """Her kaydı ilk okumada anlayamayan, ikincide içindeki metni döndüren tanıyıcı"""
+
+    def __init__(self):
+        self.okunanlar = []
+
+    def tani(self, audio, dil="tr-TR"):
+        import speech_recognition as sr
+        metin = audio.get_raw_data().rstrip(b"\0").decode("utf-8")
+        self.okunanlar.append(metin)
+        if self.okunanlar.count(metin) == 1:
+            raise sr.UnknownValueError()
+        return metin
+
+
+def wav_yaz(yol, metin):
+    import wave
+    veri = metin.encode("utf-8")
+    with wave.open(str(yol), "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(16000)
+        f.writeframes(veri + b"\0" * (len(veri) % 2))
+    return str(yol)
+
+
+def test_wav_kanali_tekrar_denemesinde_ayni_dosyayi_okur(tmp_path):
+    dosyalar = [wav_yaz(tmp_path / "1.wav", "birinci"), wav_yaz(tmp_path / "2.wav", "ikinci")]
+    tanici = IlkDenemedeAnlamayanTanici()
+    kanal = cc.WavKanali(dosyalar, tanici=tanici)
+
+    assert kanal.konusma_al(1) is None
+    assert kanal.konusma_al(2) == "birinci"
+    assert kanal.konusma_al(1) is None
+    assert kanal.konusma_al(2) == "ikinci"
+    assert kanal.konusma_al(1) is None and kanal.kapandi
+    assert tanici.okunanlar == ["birinci", "birinci", "ikinci", "ikinci"]
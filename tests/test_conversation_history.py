@@ -0,0 +1,149 @@
+import json
+import threading
+import time
+
+from conversation_history import GelismisGecmisGorusmeler
+
+
+def ac(tmp_path, **kwargs):
+    kwargs.setdefault("yazma_modu", "senkron")
+    return GelismisGecmisGorusmeler(str(tmp_path / "gecmis.json"), **kwargs)
+
+
+def coktu(gecmis):
+    """Süreç kapatılmadan ölmüş gibi bırak: sıkıştırma yapılmaz, yalnızca diskteki durum kalır"""
+    with gecmis._kilit:
+        gecmis._kapatiliyor = True
+        gecmis._yazici_uyandir.notify()
+    if gecmis._yazici is not None:
+        gecmis._yazici.join()
+    gecmis._gunluk.close()
+
+
+def gunluk_olaylari(gecmis):
+    with open(gecmis.gunluk_dosyasi, encoding="utf-8") as f:
+        return [json.loads(satir) for satir in f if satir.strip()]
+
+
+def durum(gecmis):
+    return {
+        "gorusmeler": gecmis.son_gorusmeler_getir(1000),
+        "musteri_gecmis": gecmis.indeks["musteri_gecmis"],
+        "istatistikler": gecmis.istatistikleri_getir(),
+    }
+
+
+def ornek_gorusmeler(gecmis, adet=5):
+    idler = []
+    for i in range(adet):
+        gorusme_id = gecmis.yeni_gorusme_baslat(f"0537594402{i % 2}", f"Müşteri {i}")
+        gecmis.mesaj_ekle(gorusme_id, "Müşteri", f"faturama itiraz {i}")
+        gecmis.kategori_guncelle(gorusme_id, "Fatura İtirazı")
+        if i % 2:
+            gecmis.gorusme_bitir(gorusme_id)
+        idler.append(gorusme_id)
+    return idler
+
+
+def test_kapatilmadan_kalan_gunluk_acilista_oynatilir(tmp_path):
+    gecmis = ac(tmp_path, sikistirma_esigi=10 ** 6)
+    idler = ornek_gorusmeler(gecmis)
+    gecmis.gorusme_guncelle(idler[0], notlar="geri aranacak")
+    gecmis.gorusme_sil(idler[2])
+    beklenen = json.loads(json.dumps(durum(gecmis)))
+    coktu(gecmis)
+
+    yeniden = ac(tmp_path)
+    assert json.loads(json.dumps(durum(yeniden))) == beklenen
+    assert yeniden.gorusme_getir(idler[2]) is None
+    yeniden.kapat()
+
+
+def test_sikistirma_gunlukte_yalnizca_anlik_goruntuden_yeni_olaylari_birakir(tmp_path):
+    gecmis = ac(tmp_path, sikistirma_esigi=7)
+    ornek_gorusmeler(gecmis, adet=6)
+    beklenen = json.loads(json.dumps(durum(gecmis)))
+    son_olay_no = json.loads(gecmis.indeks_dosyasi.read_text(encoding="utf-8"))["son_olay_no"]
+    assert son_olay_no > 0
+    assert all(olay["no"] > son_olay_no for olay in gunluk_olaylari(gecmis))
+    coktu(gecmis)
+
+    yeniden = ac(tmp_path)
+    assert json.loads(json.dumps(durum(yeniden))) == beklenen
+    yeniden.kapat()
+
+
+def test_gunluk_olay_numarasina_gore_ve_bir_kez_oynatilir(tmp_path):
+    gecmis = ac(tmp_path, sikistirma_esigi=10 ** 6)
+    gorusme_id = gecmis.yeni_gorusme_baslat("05375944025", "Elif")
+    gecmis.sikistir()
+    for i in range(5):
+        gecmis.mesaj_ekle(gorusme_id, "Müşteri", f"mesaj {i}")
+    coktu(gecmis)
+
+    # Başarısız sıkıştırmanın geri yazdığı olaylar daha yenilerinden sonra gelebilir;
+    # anlık görüntüye girmiş bir olay da günlükte tekrar bulunabilir
+    satirlar = gecmis.gunluk_dosyasi.read_text(encoding="utf-8").splitlines()
+    eski = json.dumps({"no": 1, "tur": "mesaj", "id": gorusme_id,
+                       "mesaj": {"gonderen": "Müşteri", "mesaj": "tekrar", "zaman": "2026-01-01T00:00:00"}})
+    gecmis.gunluk_dosyasi.write_text("\n".join(list(reversed(satirlar)) + [eski]) + "\n", encoding="utf-8")
+
+    yeniden = ac(tmp_path)
+    mesajlar = [m["mesaj"] for m in yeniden.gorusme_getir(gorusme_id)["mesajlar"]]
+    assert mesajlar == [f"mesaj {i}" for i in range(5)]
+    yeniden.kapat()
+
+
+class GecikmeliKilit:
+    """`sik` adlı iş parçacığı dosya kilidini geç alır: yakalama ile yazma arasında yarış penceresi açılır"""
+
+    def __init__(self):
+        self._kilit = threading.Lock()
+
+    def __enter__(self):
+        if threading.current_thread().name == "sik":
+            time.sleep(0.3)
+        self._kilit.acquire()
+
+    def __exit__(self, *args):
+        self._kilit.release()
+
+
+def test_sikistirma_sirasinda_gunluge_yazilan_olaylar_korunur(tmp_path):
+    gecmis = ac(tmp_path, yazma_modu="arka_plan", sikistirma_esigi=10 ** 6, yazma_araligi=0.01, kirli_esigi=1)
+    gecmis._dosya_kilidi = GecikmeliKilit()
+    gorusme_id = gecmis.yeni_gorusme_baslat("05375944025", "Elif")
+
+    sikistirici = threading.Thread(target=gecmis.sikistir, name="sik")
+    sikistirici.start()
+    time.sleep(0.05)
+    for i in range(20):
+        gecmis.mesaj_ekle(gorusme_id, "Müşteri", f"mesaj {i}")
+        time.sleep(0.01)
+    sikistirici.join()
+    gecmis.diske_yaz()
+    coktu(gecmis)
+
+    yeniden = ac(tmp_path)
+    assert len(yeniden.gorusme_getir(gorusme_id)["mesajlar"]) == 20
+    yeniden.kapat()
+
+
+def test_eszamanli_sikistirmalar_olay_kaybetmez(tmp_path):
+    gecmis = ac(tmp_path, yazma_modu="arka_plan", sikistirma_esigi=1, yazma_araligi=0.01, kirli_esigi=5)
+    gorusme_id = gecmis.yeni_gorusme_baslat("05375944025", "Elif")
+
+    def mesaj_yaz():
+        for i in range(30):
+            gecmis.mesaj_ekle(gorusme_id, "Müşteri", f"mesaj {i}")
+
+    isler = [threading.Thread(target=gecmis.sikistir) for _ in range(3)] + [threading.Thread(target=mesaj_yaz)]
+    for is_parcacigi in isler:
+        is_parcacigi.start()
+    for is_parcacigi in isler:
+        is_parcacigi.join()
+    gecmis.kapat()
+
+    yeniden = ac(tmp_path)
+    assert len(yeniden.gorusme_getir(gorusme_id)["mesajlar"]) == 30
+    yeniden.kapat()
@@ -0,0 +1,98 @@
+import json
+import uuid
+
+import pytest
+
+from conversation_history import GelismisGecmisGorusmeler
+
+# Tüm aylar yerleşik pencerenin (son aylar) çok gerisinde kalır
+ESKI_AYLAR = [f"2020-{ay:02d}" for ay in range(1, 13)]
+
+
+@pytest.fixture
+def eski_gecmis(tmp_path):
+    """Tek dosyalık eski biçimden taşınan, her ayda 3 görüşme bulunan 12 aylık geçmiş"""
+    gorusmeler = [
+        {"id": str(uuid.uuid4()), "telefon": "05375944025", "musteri_adi": "Ayşe",
+         "baslangic_zamani": f"{ay}-0{gun}T10:00:00", "bitis_zamani": f"{ay}-0{gun}T10:05:00", "sure": 5.0,
+         "durum": "tamamlandi", "cozulme_durumu": "cozuldu", "kategori": "Fatura İtirazı",
+         "kategori_gecmisi": [], "mesajlar": [{"mesaj": f"kelime{ay.replace('-', '')}"}]}
+        for ay in ESKI_AYLAR for gun in range(1, 4)
+    ]
+    dosya = tmp_path / "gecmis.json"
+    dosya.write_text(json.dumps({"gorusmeler": gorusmeler, "musteri_gecmis": {}}), encoding="utf-8")
+
+    def ac(**kwargs):
+        kwargs.setdefault("yazma_modu", "senkron")
+        kwargs.setdefault("yerlesik_ay_sayisi", 1)
+        kwargs.setdefault("onbellek_bolum_sayisi", 2)
+        gecmis = GelismisGecmisGorusmeler(str(dosya), **kwargs)
+        okunan = []
+        oku = gecmis._bolum_oku
+        gecmis._bolum_oku = lambda ay: okunan.append(ay) or oku(ay)
+        acilanlar.append(gecmis)
+        return gecmis, okunan, gorusmeler
+
+    acilanlar = []
+    yield ac
+    for gecmis in acilanlar:
+        gecmis.kapat()
+
+
+def test_bos_arama_limitsiz_yalnizca_bellekteki_aylari_listeler(eski_gecmis):
+    gecmis, okunan, _ = eski_gecmis()
+    yeni = gecmis.yeni_gorusme_baslat("05551112233", "Yeni")
+    assert [g["id"] for g in gecmis.gorusme_ara("")] == [yeni]
+    assert okunan == []
+
+
+def test_bos_arama_limitle_eski_aylari_gerektigi_kadar_yukler(eski_gecmis):
+    gecmis, okunan, _ = eski_gecmis()
+    sonuclar = gecmis.gorusme_ara("", limit=4)
+    assert [g["baslangic_zamani"][:10] for g in sonuclar] == ["2020-12-03", "2020-12-02", "2020-12-01", "2020-11-03"]
+    assert okunan == ["2020-12", "2020-11"]
+
+
+def test_arama_yalnizca_eslesen_bolumu_yukler(eski_gecmis):
+    gecmis, okunan, _ = eski_gecmis(arsiv_indeks_sayisi=len(ESKI_AYLAR))
+    assert len(gecmis.gorusme_ara("kelime202003")) == 3
+    assert "2020-03" in gecmis._bolumler and "2020-04" not in gecmis._bolumler
+
+    # Arşiv indeksleri önbellekte: ikinci aramada yalnızca eşleşen bölüm okunur
+    okunan.clear()
+    assert len(gecmis.gorusme_ara("kelime202005", limit=2)) == 2
+    assert okunan == ["2020-05"]
+    # Arşiv kapalıyken bellekte olmayan ay aranmaz
+    assert gecmis.gorusme_ara("kelime202007", arsiv_dahil=False) == []
+
+
+def test_arsiv_arama_indeksleri_sinirli_lru_da_tutulur(eski_gecmis):
+    gecmis, _, _ = eski_gecmis(arsiv_indeks_sayisi=3)
+    gecmis.gorusme_ara("bulunmayan")
+    assert len(gecmis._arsiv_indeksleri) == 3
+    # En son kullanılanlar (en eski aylar, arama yeniden eskiye ilerler) kalır
+    assert set(gecmis._arsiv_indeksleri) == {"2020-01", "2020-02", "2020-03"}
+
+
+def test_eski_gorusme_tek_bolum_okunarak_bulunur(eski_gecmis):
+    gecmis, okunan, gorusmeler = eski_gecmis()
+    assert gecmis.gorusme_getir("bilinmeyen") is None
+    assert okunan == []
+    hedef = gorusmeler[10]
+    assert gecmis.gorusme_getir(hedef["id"])["id"] == hedef["id"]
+    assert okunan == [hedef["baslangic_zamani"][:7]]
+
+
+def test_ay_eslemesi_indekse_degil_yan_dosyaya_yazilir(eski_gecmis):
+    gecmis, _, gorusmeler = eski_gecmis()
+    silinen, tasinan = gorusmeler[0]["id"], gorusmeler[5]["id"]
+    assert gecmis.gorusme_sil(silinen)
+    assert gecmis.gorusme_guncelle(tasinan, baslangic_zamani="2020-12-15T09:00:00")
+    gecmis.sikistir()
+    gecmis.kapat()
+    assert "gorusme_aylari" not in json.loads(gecmis.indeks_dosyasi.read_text(encoding="utf-8"))
+
+    yeniden, okunan, _ = eski_gecmis()
+    assert yeniden.gorusme_getir(silinen) is None
+    assert yeniden.gorusme_getir(tasinan)["baslangic_zamani"].startswith("2020-12")
+    assert okunan == ["2020-12"]
@@ -0,0 +1,72 @@
+import threading
+
+import numpy as np
+import pytest
+
+from intent_classifier import TopluSiniflandirici
+
+
+class SahteTokenizer:
+    """Her kelimeyi bir token sayan, doldurmayı sıfırla yapan tokenizer"""
+
+    def __call__(self, metinler, truncation=True, max_length=64):
+        ids = [[1] * min(len(metin.split()), max_length) for metin in metinler]
+        return {"input_ids": ids, "attention_mask": [[1] * len(i) for i in ids]}
+
+    def pad(self, kodlanmis, padding=None, max_length=None, return_tensors=None):
+        uzunluk = max_length if padding == "max_length" else max(len(i) for i in kodlanmis["input_ids"])
+        return {ad: np.array([d + [0] * (uzunluk - len(d)) for d in degerler])
+                for ad, degerler in kodlanmis.items()}
+
+
+class KelimeSayisiCalistirici:
+    """Etiket olarak cümlenin kelime sayısını veren arka uç"""
+    tensor_tipi = "np"
+
+    def logits(self, inputs):
+        sayilar = inputs["attention_mask"].sum(axis=1)
+        logits = np.zeros((len(sayilar), 8), dtype=np.float32)
+        logits[np.arange(len(sayilar)), np.minimum(sayilar, 7)] = 10.0
+        return logits
+
+
+@pytest.fixture
+def servis():
+    siniflandirici = TopluSiniflandirici(KelimeSayisiCalistirici(), SahteTokenizer(), max_batch_size=8,
+                                         max_bekleme_ms=5, max_length=16, uzunluk_kovalari=[2, 4, 16])
+    yield siniflandirici
+    siniflandirici.kapat()
+
+
+def test_toplu_sonuclar_istek_sirasina_doner(servis):
+    metinler = ["bir", "iki kelime", "tam dört kelime var", "üç kelime burada"] * 3
+    futurelar = [servis.gonder(metin) for metin in metinler]
+    assert [f.result(timeout=5)[0] for f in futurelar] == [len(m.split()) for m in metinler]
+
+
+def test_kapatildiktan_sonra_istek_reddedilir(servis):
+    servis.kapat()
+    with pytest.raises(RuntimeError):
+        servis.gonder("merhaba")
+
+
+def test_kapatma_sirasinda_kabul_edilen_istekler_sonuclanir():
+    for _ in range(20):
+        servis = TopluSiniflandirici(KelimeSayisiCalistirici(), SahteTokenizer(), max_bekleme_ms=0, max_length=16)
+        kabul_edilen = []
+
+        def gonderici():
+            for _ in range(50):
+                try:
+                    kabul_edilen.append(servis.gonder("merhaba dünya"))
+                except RuntimeError:
+                    return
+
+        isciler = [threading.Thread(target=gonderici) for _ in range(4)]
+        for isci in isciler:
+            isci.start()
+        servis.kapat()
+        for isci in isciler:
+            isci.join()
+        # Durdurma işaretinden önce kuyruğa giren her istek yanıtlanmalı, asılı kalmamalı
+        assert all(f.result(timeout=2)[0] == 2 for f in kabul_edilen)
@@ -0,0 +1,93 @@
+import itertools
+import random
+
+import pytest
+
+from intent_router import (BELIRSIZ_TALEP_ISTEMI, YONLENDIRME_TABLOSU, AnahtarKelimeOtomati, _dogrusal_cozumle,
+                           evet_hayir_coz, yonlendirici)
+
+PAKET_ANLASILAMADI = YONLENDIRME_TABLOSU[1]["anlasilamadi"]
+
+
+def eski_zincir(kategori, sikayet):
+    """Yönlendirme tablosundan önceki sikayet_ve_destek_akisi if/elif zinciri: (işleyici, argümanlar, istem)"""
+    if kategori not in [0, 1, 2, 3, 4, 5, 6]:
+        return None, (), BELIRSIZ_TALEP_ISTEMI
+    if kategori == 1:
+        sikayet_lower = sikayet.lower()
+        if "son ay" in sikayet_lower:
+            return "paket_son_ay_cevapla", (), None
+        elif "son 2 ay" in sikayet_lower or "2 ay" in sikayet_lower:
+            return "paket_son_iki_ay_cevapla", (), None
+        elif "son 3 ay" in sikayet_lower or "3 ay" in sikayet_lower:
+            return "paket_son_uc_ay_cevapla", (), None
+        elif "sms" in sikayet_lower:
+            return "kalan_hak_cevapla", ("sms",), None
+        elif "dakika" in sikayet_lower:
+            return "kalan_hak_cevapla", ("dakika",), None
+        elif "internet" in sikayet_lower:
+            return "kalan_hak_cevapla", ("internet",), None
+        elif "tüm hak" in sikayet_lower or "hepsi" in sikayet_lower or "kalan hak" in sikayet_lower:
+            return "yanit_paket_kalan_hak", (), None
+        return None, (), PAKET_ANLASILAMADI
+    return {
+        0: "yanit_fatura_itiraz",
+        2: "yanit_borc_odeme",
+        3: "yanit_iptal_talebi",
+        4: "yanit_yeni_paket_kampanya",
+        5: "yanit_teknik_ariza",
+        6: "yanit_sim_kart_sifre",
+    }[kategori], (), None
+
+
+def eski_evet_hayir(cevap):
+    if "evet" in cevap.lower():
+        return True
+    if "hayır" in cevap.lower() or "hayir" in cevap.lower():
+        return False
+    return None
+
+
+PARCALAR = ["son ay", "son 2 ay", "2 ay", "son 3 ay", "3 ay", "sms", "SMS", "dakika", "Dakika", "internet",
+            "İnternet", "tüm hak", "hepsi", "kalan hak", "Kalan Hak", "paketim", "ne kadar", "kaldı", "bu ay",
+            "fatura", "son", "ay", "sm", "dakikam", "internetim", "hepsini", "kalan haklarım"]
+
+
+def cumleler(adet=2000, tohum=7):
+    rastgele = random.Random(tohum)
+    yield ""
+    yield from PARCALAR
+    yield from (" ".join(ikili) for ikili in itertools.permutations(PARCALAR[:8], 2))
+    for _ in range(adet):
+        yield " ".join(rastgele.choice(PARCALAR) for _ in range(rastgele.randint(1, 5)))
+
+
+@pytest.mark.parametrize("kategori", [-1, 0, 1, 2, 3, 4, 5, 6, 7, 99])
+def test_yonlendirici_eski_zincirle_ayni_karari_verir(kategori):
+    for cumle in cumleler():
+        if "İ" in cumle:
+            # Eski zincir str.lower() kullanıyordu: "İnternet" → "i̇nternet" eşleşmezdi
+            continue
+        beklenen = eski_zincir(kategori, cumle)
+        assert tuple(yonlendirici.cozumle(kategori, cumle)) == beklenen, cumle
+        assert tuple(_dogrusal_cozumle(YONLENDIRME_TABLOSU, kategori, cumle)) == beklenen, cumle
+
+
+def test_turkce_buyuk_harf_eslesir():
+    assert yonlendirici.cozumle(1, "KALAN İNTERNET").argumanlar == ("internet",)
+
+
+def test_evet_hayir_eski_kuralla_ayni():
+    for cevap in ["evet", "Evet lütfen", "hayır", "HAYIR", "hayir teşekkürler", "evet hayır", "bilmiyorum", ""]:
+        if "I" in cevap:
+            # str.lower() 'I' → 'i' yapardı; Türkçe küçültme 'ı' verir ve "hayır" eşleşir
+            assert evet_hayir_coz(cevap) is False
+            continue
+        assert evet_hayir_coz(cevap) == eski_evet_hayir(cevap), cevap
+
+
+def test_otomat_tum_ortusen_anahtarlari_bulur():
+    otomat = AnahtarKelimeOtomati({"son ay": 0, "2 ay": 1, "ay": 2, "sms": 3})
+    assert otomat.degerler("son 2 ay sms") == {1, 2, 3}
+    assert otomat.degerler("SON AY") == {0, 2}
+    assert otomat.degerler("") == set()
@@ -0,0 +1,67 @@
+from search_index import AramaIndeksi, telefon_tokenlari, tokenlara_ayir, turkce_kucult
+
+
+def gorusme(gorusme_id, ad="Ayşe Yılmaz", telefon="05375944025", kategori="Fatura İtirazı", mesajlar=()):
+    return {"id": gorusme_id, "musteri_adi": ad, "telefon": telefon, "kategori": kategori,
+            "mesajlar": [{"mesaj": m} for m in mesajlar]}
+
+
+def test_turkce_kucultme_ve_tokenlar():
+    assert turkce_kucult("İSMAİL IŞIK") == "ismail ışık"
+    assert tokenlara_ayir("Faturamda İnternet ücreti, yanlış!") == ["faturamda", "internet", "ücreti", "yanlış"]
+    assert telefon_tokenlari("0537 594") == ["0537594", "537594", "37594", "7594", "594", "94", "4"]
+
+
+def test_onek_ve_tum_terimler_eslesmeli():
+    indeks = AramaIndeksi()
+    indeks.gorusme_ekle(gorusme("a", mesajlar=["faturamda internet ücreti yanlış"]))
+    indeks.gorusme_ekle(gorusme("b", ad="Mehmet Kaya", kategori="Teknik Arıza", mesajlar=["internet yok"]))
+    assert {i for i, _ in indeks.ara("internet")} == {"a", "b"}
+    assert [i for i, _ in indeks.ara("fatura internet")] == ["a"]
+    assert [i for i, _ in indeks.ara("İNTERNET mehmet")] == ["b"]
+    assert indeks.ara("bulunmayan") == []
+    assert indeks.ara("  ") == []
+
+
+def test_alan_eslesmesi_mesajdan_once_gelir():
+    indeks = AramaIndeksi()
+    indeks.gorusme_ekle(gorusme("ad", ad="Fatma Demir", kategori="Borç"))
+    indeks.gorusme_ekle(gorusme("mesaj", ad="Ali Veli", kategori="Borç", mesajlar=["fatma hanım aradı"]))
+    assert [i for i, _ in indeks.ara("fatma")] == ["ad", "mesaj"]
+
+
+def test_telefon_parcasi_ile_bulunur():
+    indeks = AramaIndeksi()
+    indeks.gorusme_ekle(gorusme("a", telefon="05375944025"))
+    indeks.gorusme_ekle(gorusme("b", telefon="05551112233"))
+    assert [i for i, _ in indeks.ara("5944")] == ["a"]
+
+
+def test_guncelleme_ve_silme_indeksi_tutarli_birakir():
+    indeks = AramaIndeksi()
+    kayit = gorusme("a", kategori="Fatura İtirazı")
+    indeks.gorusme_ekle(kayit)
+    indeks.mesaj_ekle("a", "modem arızalı")
+    assert [i for i, _ in indeks.ara("modem")] == ["a"]
+
+    kayit["kategori"] = "Teknik Arıza"
+    indeks.alanlari_guncelle(kayit)
+    assert indeks.ara("itirazı") == []
+    assert [i for i, _ in indeks.ara("teknik modem")] == ["a"]
+
+    indeks.gorusme_cikar("a")
+    assert len(indeks) == 0
+    assert indeks.ara("modem") == []
+    assert indeks._sirali_tokenler == []
+
+
+def test_gorusme_ara_indeksi_kullanir(gecmis):
+    ilk = gecmis.yeni_gorusme_baslat("05551234567", "İsmail IŞIK", "Fatura İtirazı")
+    gecmis.mesaj_ekle(ilk, "Müşteri", "Faturamda İnternet ücreti yanlış")
+    ikinci = gecmis.yeni_gorusme_baslat("05375944025", "Elif Tosun")
+    gecmis.mesaj_ekle(ikinci, "Müşteri", "internet çok yavaş")
+
+    assert [g["id"] for g in gecmis.gorusme_ara("ismail ışık")] == [ilk]
+    assert {g["id"] for g in gecmis.gorusme_ara("internet")} == {ilk, ikinci}
+    gecmis.gorusme_sil(ilk)
+    assert [g["id"] for g in gecmis.gorusme_ara("internet")] == [ikinci]